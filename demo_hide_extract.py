@@ -9,8 +9,8 @@ from typing import List, Tuple
 
 # Module imports
 from stegotool.modules.module3_pixel_selector.selector_baseline import select_pixels
-from stegotool.modules.module6_redundancy.rs_wrapper import add_redundancy, recover_redundancy
-from stegotool.modules.module6_redundancy.corruption_simulator import recompress_and_reload
+from stegotool.modules.module6_redundancy.rs_wrapper import add_redundancy, recover_redundancy, rs_available
+from stegotool.modules.module6_redundancy.corruption_simulator import recompress_array
 from stegotool.modules.module6_redundancy.capacity_checker import can_fit_payload
 
 # =============================================================================
@@ -51,28 +51,24 @@ def generate_demo_images_if_needed():
 # Minimal LSB embedding/extraction (from generate_labels_robust.py)
 # =============================================================================
 
-def _bytes_to_bits(b: bytes) -> List[int]:
-    bits = []
-    for byte in b:
-        for i in range(8):
-            bits.append((byte >> (7 - i)) & 1)
-    return bits
+def _bytes_to_bits(b: bytes) -> np.ndarray:
+    """Unpack bytes into a uint8 array of bits, most significant bit first."""
+    return np.unpackbits(np.frombuffer(b, dtype=np.uint8))
 
-def _bits_to_bytes(bits: List[int]) -> bytes:
-    while len(bits) % 8 != 0:
-        bits.append(0)
-    out = bytearray()
-    for i in range(0, len(bits), 8):
-        byte = 0
-        for j in range(8):
-            byte = (byte << 1) | (bits[i + j] & 1)
-        out.append(byte)
-    return bytes(out)
+def _bits_to_bytes(bits) -> bytes:
+    """Pack bits (MSB first) into bytes, zero-padding the last byte."""
+    return np.packbits(np.asarray(bits, dtype=np.uint8)).tobytes()
 
-def embed_bytes_into_pixels(image_pil: Image.Image, payload: bytes, 
-                            coords: List[Tuple[int,int]], lsb_bits: int = 1) -> Image.Image:
-    """Embed payload bits into specified pixel coordinates."""
-    arr = np.array(image_pil, dtype=np.uint8).copy()  # H x W x 3
+def embed_bytes_into_pixels(src_arr: np.ndarray, payload: bytes, 
+                            coords: List[Tuple[int,int]], lsb_bits: int = 1) -> np.ndarray:
+    """
+    Embed payload bits into specified pixel coordinates.
+    
+    ``src_arr`` is an HxWx3 uint8 array (a PIL image also works); it is
+    left untouched and the stego pixels are returned as a new array, so
+    callers convert to an image only when they actually need one.
+    """
+    arr = np.array(src_arr, dtype=np.uint8)  # H x W x 3, always a fresh copy
     h, w, c = arr.shape
     assert c == 3
     
@@ -83,24 +79,30 @@ def embed_bytes_into_pixels(image_pil: Image.Image, payload: bytes,
         raise ValueError(f"Payload too large: {len(payload_bits)} bits vs capacity {capacity_bits}")
     
     # Pad payload bits
-    payload_bits += [0] * (capacity_bits - len(payload_bits))
-    
-    bit_idx = 0
-    for (x, y) in coords:
-        for ch in range(3):
-            for b in range(lsb_bits):
-                bit = int(payload_bits[bit_idx])
-                mask = 1 << b
-                # FIX: Clear the bit at position b, then set it to the payload bit
-                arr[y, x, ch] = np.uint8((int(arr[y, x, ch]) & (255 - mask)) | (bit << b))
-                bit_idx += 1
-    
-    return Image.fromarray(arr)
+    payload_bits = np.pad(payload_bits, (0, capacity_bits - len(payload_bits)))
+    
+    # One row per coordinate, bit b of each channel's group in column b
+    xs, ys = np.asarray(coords, dtype=np.intp).reshape(-1, 2).T
+    bits = payload_bits.reshape(len(coords), 3, lsb_bits)
+    new_lsbs = np.zeros((len(coords), 3), dtype=np.uint8)
+    for b in range(lsb_bits):
+        new_lsbs |= bits[:, :, b] << b
+    keep_mask = np.uint8(~((1 << lsb_bits) - 1) & 0xFF)
+    
+    # Visit pixels in memory order so the gather/scatter walks the image
+    # sequentially instead of jumping around in priority order
+    pixels = arr.reshape(-1, 3)
+    flat_idx = ys * w + xs
+    order = np.argsort(flat_idx)
+    flat_idx = flat_idx[order]
+    pixels[flat_idx] = (pixels[flat_idx] & keep_mask) | new_lsbs[order]
+    
+    return arr
 
 def extract_bytes_from_pixels(image_pil: Image.Image, num_payload_bytes: int, 
                               coords: List[Tuple[int,int]], lsb_bits: int = 1) -> bytes:
-    """Extract payload bits from specified pixel coordinates."""
-    arr = np.array(image_pil)
+    """Extract payload bits from specified pixel coordinates (PIL image or array)."""
+    arr = np.asarray(image_pil)  # read-only, so no copy is needed
     h, w, c = arr.shape
     
     capacity_bits = len(coords) * 3 * lsb_bits
@@ -109,23 +111,31 @@ def extract_bytes_from_pixels(image_pil: Image.Image, num_payload_bytes: int,
     if needed_bits > capacity_bits:
         raise ValueError("Requested more bytes than capacity of coords")
     
-    bits = []
-    bit_idx = 0
-    for (x, y) in coords:
-        for ch in range(3):
-            for b in range(lsb_bits):
-                if bit_idx >= needed_bits:
-                    break
-                val = (int(arr[y, x, ch]) >> b) & 1
-                bits.append(int(val))
-                bit_idx += 1
-            if bit_idx >= needed_bits:
-                break
-        if bit_idx >= needed_bits:
-            break
+    xs, ys = np.asarray(coords, dtype=np.intp).reshape(-1, 2).T
+    
+    # Gather in memory order, then scatter back into coordinate order
+    flat_idx = ys * w + xs
+    order = np.argsort(flat_idx)
+    vals = np.empty((len(coords), 3), dtype=arr.dtype)
+    vals[order] = arr.reshape(-1, c)[flat_idx[order], :3]
+    bits = np.stack([(vals >> b) & 1 for b in range(lsb_bits)], axis=-1).ravel()[:needed_bits]
     
     return _bits_to_bytes(bits)
 
+def rs_cannot_recover(sent: bytes, received: bytes, nsym: int) -> bool:
+    """
+    True when Reed-Solomon decoding is bound to fail, so it can be skipped.
+    
+    Each 255-byte RS codeword corrects at most nsym // 2 byte errors; if
+    any codeword has more corrupted bytes than that, the original payload
+    cannot come back. Only usable where the embedded payload is known.
+    """
+    if not rs_available():
+        return False  # replication fallback has different limits
+    corrupted = np.frombuffer(sent, dtype=np.uint8) != np.frombuffer(received, dtype=np.uint8)
+    codeword_errors = np.add.reduceat(corrupted, np.arange(0, len(corrupted), 255))
+    return bool((codeword_errors > nsym // 2).any())
+
 # =============================================================================
 # Main Demo
 # =============================================================================
@@ -171,29 +181,36 @@ def main():
     
     # Step 4: Embed
     print(f"\n[6] Embedding secret message...")
-    stego_img = embed_bytes_into_pixels(img, ecc_payload, coords, lsb_bits=1)
+    stego_arr = embed_bytes_into_pixels(arr, ecc_payload, coords, lsb_bits=1)
     stego_path = Path("stego_output.png")
-    stego_img.save(stego_path)
+    Image.fromarray(stego_arr).save(stego_path)
     print(f"    Stego image saved: {stego_path}")
     
     # Step 5: Simulate corruption (JPEG recompression)
     print(f"\n[7] Simulating JPEG compression (quality=75)...")
-    corrupted_img = recompress_and_reload(stego_img, quality=75)
+    corrupted_arr = recompress_array(stego_arr, quality=75)
     corrupted_path = Path("stego_corrupted.png")
-    corrupted_img.save(corrupted_path)
+    Image.fromarray(corrupted_arr).save(corrupted_path)
     print(f"    Corrupted image saved: {corrupted_path}")
     
     # Step 6: Extract encoded payload
     print(f"\n[8] Extracting encoded payload from corrupted image...")
-    extracted_ecc = extract_bytes_from_pixels(corrupted_img, len(ecc_payload), coords, lsb_bits=1)
+    extracted_ecc = extract_bytes_from_pixels(corrupted_arr, len(ecc_payload), coords, lsb_bits=1)
     print(f"    Extracted {len(extracted_ecc)} bytes")
     
     # Step 7: Check for bit errors
-    bit_errors = sum(bin(a ^ b).count('1') for a, b in zip(ecc_payload, extracted_ecc))
+    bit_errors = int(np.unpackbits(
+        np.frombuffer(ecc_payload, dtype=np.uint8) ^ np.frombuffer(extracted_ecc, dtype=np.uint8)
+    ).sum())
     print(f"    Bit errors detected: {bit_errors}/{len(ecc_payload)*8}")
     
     # Step 8: Recover with ECC
     print(f"\n[9] Recovering message with Reed-Solomon ECC...")
+    if rs_cannot_recover(ecc_payload, extracted_ecc, nsym):
+        print(f"    ✗ Recovery skipped: more than {nsym // 2} corrupted bytes in a codeword")
+        print("    This can happen if corruption exceeded ECC capability")
+        return
+    
     try:
         recovered_msg = recover_redundancy(extracted_ecc, nsym=nsym)
         print(f"    ✓ Recovery successful!")
@@ -6,14 +6,12 @@ Handles all visual components and user interactions for watermark application.
 """
 
 import logging
-from io import BytesIO
 from typing import Optional
 import streamlit as st
-from PIL import Image
 
 from .watermark import apply_text_watermark, apply_lsb_watermark, apply_alpha_blending_watermark
-from src.ui.reusable_components import show_error, show_success, show_warning, show_info
-from src.db.db_utils import log_activity
+from src.ui.reusable_components import show_error, show_success, show_warning, show_info, encode_png, load_image, load_preview
+from src.db.db_utils import log_activity_async
 
 logger = logging.getLogger(__name__)
 
@@ -126,17 +124,14 @@ def _show_basic_watermark_section():
         
         if image_file:
             try:
-                original_image = Image.open(image_file)
-                st.image(original_image, caption="Selected Image", use_container_width=True)
+                preview, ((width, height), mode, file_format) = load_preview(image_file.getvalue())
+                st.image(preview, caption="Selected Image", use_container_width=True)
                 
                 # Image info
-                width, height = original_image.size
-                file_format = original_image.format or "Unknown"
-                
                 st.markdown(f"""
                     <div class="card card-info" style="margin-top: 0.75rem; padding: 0.75rem; border-radius: 6px;">
                         📐 **{width}×{height}** | 
-                        🎨 **{original_image.mode}** | 
+                        🎨 **{mode}** | 
                         📁 **{file_format}**
                     </div>
                 """, unsafe_allow_html=True)
@@ -526,7 +521,7 @@ def _apply_watermark_workflow(image_file, watermark_text, font_size, position,
         status.text("📷 Loading image...")
         progress.progress(20)
         
-        original_image = Image.open(image_file)
+        original_image = load_image(image_file.getvalue())
         original_mode = original_image.mode
         
         # Step 2: Apply watermark
@@ -563,17 +558,12 @@ def _apply_watermark_workflow(image_file, watermark_text, font_size, position,
             "color": text_color
         }
         
-        progress.progress(100)
-        status.text("✅ Complete!")
-        
-        import time
-        time.sleep(0.5)
         progress.empty()
         status.empty()
         
         # Log activity
         if hasattr(st.session_state, 'user_id') and st.session_state.user_id:
-            log_activity(
+            log_activity_async(
                 user_id=st.session_state.user_id,
                 action="WATERMARK",
                 details=f"Applied watermark: {watermark_text[:30]}"
@@ -603,6 +593,8 @@ def _display_watermark_results(original, watermarked, watermark_text):
         </div>
     """, unsafe_allow_html=True)
     
+    png_bytes = encode_png(watermarked)
+    
     # Before/After comparison
     col1, col2 = st.columns(2)
     
@@ -615,7 +607,7 @@ def _display_watermark_results(original, watermarked, watermark_text):
     with col2:
         st.markdown('<div class="card card-success">', unsafe_allow_html=True)
         st.markdown("### 💧 Watermarked Image")
-        st.image(watermarked, use_container_width=True)
+        st.image(png_bytes, use_container_width=True)
         st.markdown('</div>', unsafe_allow_html=True)
     
     st.divider()
@@ -634,16 +626,12 @@ def _display_watermark_results(original, watermarked, watermark_text):
     # Download button
     st.markdown("### 💾 Download")
     
-    buf = BytesIO()
-    watermarked.save(buf, format="PNG")
-    buf.seek(0)
-    
     col1, col2 = st.columns([2, 1])
     
     with col1:
         st.download_button(
             label="⬇️ Download Watermarked Image",
-            data=buf.getvalue(),
+            data=png_bytes,
             file_name=f"watermarked_{watermark_text.replace(' ', '_')[:20]}.png",
             mime="image/png",
             use_container_width=True,
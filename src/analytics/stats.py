@@ -6,9 +6,8 @@ Connected to PostgreSQL database for real user statistics tracking.
 """
 
 from datetime import datetime, timedelta
+from typing import TYPE_CHECKING
 import plotly.graph_objects as go
-import plotly.express as px
-import pandas as pd
 import numpy as np
 from ..db.db_utils import (
     get_timeline_data,
@@ -21,6 +20,9 @@ from ..db.db_utils import (
     get_db_connection
 )
 
+if TYPE_CHECKING:
+    import pandas as pd
+
 
 # ============================================================================
 #                    USER-SPECIFIC HELPER FUNCTIONS
@@ -78,23 +80,32 @@ def get_user_method_distribution(user_id: int) -> dict:
         return {}
 
 
-def get_user_activity_log(user_id: int, limit: int = 50) -> pd.DataFrame:
+def _activity_log_to_dataframe(activities: list) -> "pd.DataFrame":
+    """Build the activity DataFrame, newest first."""
+    # pandas costs ~0.3s to import; only the activity views need it
+    import pandas as pd
+    
+    if not activities:
+        return pd.DataFrame()
+    
+    df = pd.DataFrame(
+        activities,
+        columns=['ID', 'User ID', 'Action', 'Details', 'Timestamp']
+    )
+    
+    # An explicit format keeps pandas on its fast parser instead of
+    # inferring the layout row by row
+    df['Timestamp'] = pd.to_datetime(df['Timestamp'], format='ISO8601')
+    return df.sort_values('Timestamp', ascending=False)
+
+
+def get_user_activity_log(user_id: int, limit: int = 50) -> "pd.DataFrame":
     """Get activity log as pandas DataFrame for a specific user."""
+    import pandas as pd
+    
     try:
         activities = get_activity_log(user_id=user_id, limit=limit)
-        
-        if not activities:
-            return pd.DataFrame()
-        
-        df = pd.DataFrame(
-            activities,
-            columns=['ID', 'User ID', 'Action', 'Details', 'Timestamp']
-        )
-        
-        df['Timestamp'] = pd.to_datetime(df['Timestamp'])
-        df = df.sort_values('Timestamp', ascending=False)
-        
-        return df
+        return _activity_log_to_dataframe(activities)
         
     except Exception as e:
         print(f"Error getting user activity dataframe: {str(e)}")
@@ -772,26 +783,16 @@ def create_method_comparison_chart() -> go.Figure:
 #                         DATA RETRIEVAL FUNCTIONS
 # ============================================================================
 
-def get_activity_dataframe(user_id: int = None, limit: int = 50) -> pd.DataFrame:
+def get_activity_dataframe(user_id: int = None, limit: int = 50) -> "pd.DataFrame":
     """Get activity log as pandas DataFrame."""
+    import pandas as pd
+    
     try:
         if user_id:
             return get_user_activity_log(user_id, limit=limit)
         else:
             activities = get_activity_log(limit=limit)
-            
-            if not activities:
-                return pd.DataFrame()
-            
-            df = pd.DataFrame(
-                activities,
-                columns=['ID', 'User ID', 'Action', 'Details', 'Timestamp']
-            )
-            
-            df['Timestamp'] = pd.to_datetime(df['Timestamp'])
-            df = df.sort_values('Timestamp', ascending=False)
-            
-            return df
+            return _activity_log_to_dataframe(activities)
         
     except Exception as e:
         print(f"Error getting activity dataframe: {str(e)}")
@@ -6,8 +6,8 @@ Moved from ui_components.py for better code organization.
 """
 
 import streamlit as st
-import pandas as pd
 import logging
+from typing import TYPE_CHECKING
 
 from src.analytics.stats import (
     create_timeline_chart,
@@ -21,13 +21,66 @@ from src.analytics.stats import (
     create_performance_chart,
     get_user_detailed_stats
 )
+from src.db.db_utils import get_activity_version
 from src.ui.reusable_components import (
     show_warning, show_info, render_step
 )
 
+if TYPE_CHECKING:
+    import pandas as pd
+
 logger = logging.getLogger(__name__)
 
 
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_activity_dataframe(user_id: int, limit: int = 50, version: int = 0) -> "pd.DataFrame":
+    """
+    Activity log frame, already parsed and sorted; cleared by the Refresh button.
+
+    ``version`` is ``get_activity_version(user_id)``, bumped once logged
+    activity rows commit, so a new encode/decode misses the cache as soon
+    as its row is readable.
+
+    A hidden ``_search`` column holds the lowercased action and details, so
+    filtering is one literal substring scan instead of a regex per column.
+    """
+    activity_df = get_activity_dataframe(user_id=user_id, limit=limit)
+    if not activity_df.empty:
+        activity_df['_search'] = (
+            activity_df['Action'].fillna('') + '\n' + activity_df['Details'].fillna('')
+        ).str.lower()
+    return activity_df
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_detailed_stats(user_id: int, version: int = 0) -> dict:
+    """Summary stats for the overview metrics; keyed like the activity frame."""
+    return get_user_detailed_stats(user_id)
+
+
+# Dashboard figures by name; the method comparison is global, not per user
+_CHART_BUILDERS = {
+    "timeline": create_timeline_chart,
+    "method_pie": create_method_pie_chart,
+    "encode_decode": create_encode_decode_chart,
+    "size_distribution": create_size_distribution_chart,
+    "hourly_heatmap": create_hourly_heatmap,
+    "performance": create_performance_chart,
+    "method_comparison": lambda user_id: create_method_comparison_chart(),
+}
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_chart(name: str, user_id: int, version: int = 0):
+    """
+    One dashboard figure; keyed like the activity frame.
+
+    Every chart runs its own queries, so without this each rerun of the
+    page (e.g. typing in the log search box) re-queried all seven.
+    """
+    return _CHART_BUILDERS[name](user_id=user_id)
+
+
 def show_analytics_section():
     """Display statistics and analytics dashboard with refresh capability."""
     
@@ -45,7 +98,9 @@ def show_analytics_section():
     with col2:
         st.markdown("<br>", unsafe_allow_html=True)
         if st.button("🔄 Refresh", key="analytics_refresh_btn", use_container_width=True):
-            st.cache_data.clear()
+            # Only this dashboard's caches; other users' images and encodes stay
+            for cached in (_cached_activity_dataframe, _cached_detailed_stats, _cached_chart):
+                cached.clear()
             st.rerun()
     
     st.divider()
@@ -63,7 +118,8 @@ def show_analytics_section():
     
     st.markdown("### 📈 Overview")
     
-    stats = get_user_detailed_stats(user_id)
+    version = get_activity_version(user_id)
+    stats = _cached_detailed_stats(user_id, version)
     
     if stats and stats.get('total_operations', 0) > 0:
         _display_summary_metrics(stats)
@@ -131,18 +187,19 @@ def _display_summary_metrics(stats: dict):
 
 def _display_activity_charts(user_id: int):
     """Display activity timeline and method distribution charts."""
+    version = get_activity_version(user_id)
     chart_col1, chart_col2 = st.columns(2)
     
     with chart_col1:
         try:
-            fig_timeline = create_timeline_chart(user_id=user_id)
+            fig_timeline = _cached_chart("timeline", user_id, version)
             st.plotly_chart(fig_timeline, use_container_width=True)
         except Exception as e:
             st.error(f"Error loading timeline chart: {e}")
     
     with chart_col2:
         try:
-            fig_pie = create_method_pie_chart(user_id=user_id)
+            fig_pie = _cached_chart("method_pie", user_id, version)
             st.plotly_chart(fig_pie, use_container_width=True)
         except Exception as e:
             st.error(f"Error loading method distribution: {e}")
@@ -152,14 +209,14 @@ def _display_activity_charts(user_id: int):
     
     with chart_col3:
         try:
-            fig_encode_decode = create_encode_decode_chart(user_id=user_id)
+            fig_encode_decode = _cached_chart("encode_decode", user_id, version)
             st.plotly_chart(fig_encode_decode, use_container_width=True)
         except Exception as e:
             st.error(f"Error loading encode/decode chart: {e}")
     
     with chart_col4:
         try:
-            fig_size = create_size_distribution_chart(user_id=user_id)
+            fig_size = _cached_chart("size_distribution", user_id, version)
             st.plotly_chart(fig_size, use_container_width=True)
         except Exception as e:
             st.error(f"Error loading size distribution: {e}")
@@ -167,18 +224,19 @@ def _display_activity_charts(user_id: int):
 
 def _display_advanced_analytics(user_id: int):
     """Display advanced analytics (heatmap, performance, comparison)."""
+    version = get_activity_version(user_id)
     chart_col5, chart_col6 = st.columns(2)
     
     with chart_col5:
         try:
-            fig_heatmap = create_hourly_heatmap(user_id=user_id)
+            fig_heatmap = _cached_chart("hourly_heatmap", user_id, version)
             st.plotly_chart(fig_heatmap, use_container_width=True)
         except Exception as e:
             st.error(f"Error loading activity heatmap: {e}")
     
     with chart_col6:
         try:
-            fig_perf = create_performance_chart(user_id=user_id)
+            fig_perf = _cached_chart("performance", user_id, version)
             st.plotly_chart(fig_perf, use_container_width=True)
         except Exception as e:
             st.error(f"Error loading performance chart: {e}")
@@ -186,7 +244,7 @@ def _display_advanced_analytics(user_id: int):
     # Method comparison (full width)
     st.markdown("### ⚖️ Method Comparison")
     try:
-        fig_compare = create_method_comparison_chart()
+        fig_compare = _cached_chart("method_comparison", user_id, version)
         st.plotly_chart(fig_compare, use_container_width=True)
     except Exception as e:
         st.error(f"Error loading method comparison: {e}")
@@ -195,7 +253,9 @@ def _display_advanced_analytics(user_id: int):
 def _display_activity_log(user_id: int):
     """Display activity log table with search functionality."""
     try:
-        activity_df = get_activity_dataframe(user_id=user_id, limit=50)
+        activity_df = _cached_activity_dataframe(
+            user_id, limit=50, version=get_activity_version(user_id)
+        )
         
         if not activity_df.empty:
             # Search filter
@@ -206,11 +266,9 @@ def _display_activity_log(user_id: int):
             )
             
             if search_term:
-                mask = (
-                    activity_df['Action'].str.contains(search_term, case=False, na=False) |
-                    activity_df['Details'].str.contains(search_term, case=False, na=False)
-                )
-                filtered_df = activity_df[mask]
+                filtered_df = activity_df[
+                    activity_df['_search'].str.contains(search_term.lower(), regex=False)
+                ]
             else:
                 filtered_df = activity_df
             
@@ -11,13 +11,20 @@ Supports two batch modes:
 
 import os
 import time
+import shutil
+import hashlib
 import logging
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from io import BytesIO
 from pathlib import Path
+from threading import Lock
 from PIL import Image
 from datetime import datetime
 from typing import List, Optional
 
-from ..stego import encode_image, encode_dct, encode_dwt
+from ..stego import encode_image, encode_dct, encode_dwt, decode_image, decode_dct, decode_dwt
+from ..stego.method_detection import sniff_method, read_framed_lsb_message
 from ..encryption.encryption import encrypt_message
 from .packet_handler import packetize_message, get_packet_map
 
@@ -25,11 +32,246 @@ logger = logging.getLogger(__name__)
 
 DATA_OUTPUT_PATH = Path(__file__).parent.parent.parent / 'data' / 'output' / 'encoded'
 
+# Content-addressed copies of earlier outputs, reused on identical re-runs;
+# least recently used files are evicted once the cache exceeds this size
+OUTPUT_CACHE_PATH = DATA_OUTPUT_PATH.parent / 'cache'
+OUTPUT_CACHE_MAX_BYTES = 512 * 1024 * 1024
+# Leftover temp files from interrupted cache writes are pruned after this
+OUTPUT_CACHE_TEMP_MAX_AGE = 3600
+
+# Cache entries some batch is still writing; others encode without the cache
+_cache_writes = set()
+_cache_writes_lock = Lock()
+
+# Background threads writing encoded images to disk, and the most
+# encoded images allowed to wait for them before encoding pauses
+SAVE_WORKERS = 4
+SAVE_QUEUE_SIZE = 16
+
+# Threads running decoder trials in batch_decode_images
+DECODE_WORKERS = min(8, os.cpu_count() or 1)
+
+# PNG zlib level for batch outputs: these files are read back by this tool,
+# so save speed matters more than size (PIL's default is 6)
+PNG_COMPRESS_LEVEL = 1
+
 # Batch mode constants
 MODE_UNIFORM = "uniform"      # MODE_1: Same message in all images
 MODE_PACKETIZED = "packetized"  # MODE_2: Message split across images
 
 
+# Method names -> encoder / decoder
+ENCODERS = {
+    'LSB': encode_image,
+    'DCT': encode_dct,
+    'DWT': encode_dwt
+}
+DECODERS = {
+    'LSB': decode_image,
+    'DCT': decode_dct,
+    'DWT': decode_dwt
+}
+
+# UI labels accepted wherever a method name is
+METHOD_ALIASES = {
+    'Hybrid DCT': 'DCT',
+    'Hybrid DWT': 'DWT'
+}
+
+
+def normalize_method(method: str) -> str:
+    """Map a UI label such as 'Hybrid DCT' to its ENCODERS/DECODERS key."""
+    return METHOD_ALIASES.get(method, method)
+
+
+def _open_upload(source):
+    """Open an upload given as raw bytes or as a path it was spooled to."""
+    if isinstance(source, (bytes, bytearray)):
+        source = BytesIO(source)
+    return Image.open(source)
+
+
+def encode_image_bytes(file_bytes, method: str, message) -> float:
+    """
+    Encode one uploaded image held in memory or spooled to disk.
+    
+    Module-level so it can be submitted to a ProcessPoolExecutor.
+    
+    Args:
+        file_bytes (bytes | str): Raw image file contents, or a path to them
+        method (str): 'LSB', 'DCT' or 'DWT' (UI labels like 'Hybrid DCT' accepted)
+        message (str | bytes): Payload to embed
+    
+    Returns:
+        float: Seconds spent in the encoder
+    
+    Raises:
+        ValueError: If the message does not fit the image
+    """
+    with _open_upload(file_bytes) as img:
+        img.load()
+        start = time.perf_counter()
+        ENCODERS.get(normalize_method(method), encode_image)(img, message)
+        return time.perf_counter() - start
+
+
+def _try_decoder(decoder, img):
+    """Run one decoder trial, returning its message or None."""
+    try:
+        extracted = decoder(img)
+    except Exception:
+        return None
+    if isinstance(extracted, str) and extracted.strip():
+        return extracted
+    return None
+
+
+def decode_image_bytes(file_bytes) -> tuple:
+    """
+    Try each decoder on one uploaded image held in memory or spooled to disk.
+    
+    Images whose LSB framing and payload both check out go straight to
+    the LSB decoder; the others try DCT, DWT and LSB in turn and stop at
+    the first one that finds a message.
+    Module-level so it can be submitted to a ProcessPoolExecutor.
+    
+    Args:
+        file_bytes (bytes | str): Raw image file contents, or a path to them
+    
+    Returns:
+        tuple: (method, message) for the first decoder that finds a
+               non-empty message, or (None, None)
+    """
+    with _open_upload(file_bytes) as img:
+        img.load()
+        extracted = read_framed_lsb_message(img)
+        if extracted:
+            return 'LSB', extracted
+        for method in ['DCT', 'DWT', 'LSB']:
+            extracted = _try_decoder(DECODERS[method], img)
+            if extracted:
+                return method, extracted
+    return None, None
+
+
+def _output_cache_key(file_bytes: bytes, method: str, message, pil_format: str, compress_level: int) -> str:
+    """Content hash identifying one encode and the settings it was saved with."""
+    if not isinstance(message, (bytes, bytearray)):
+        message = str(message).encode('utf-8')
+    digest = hashlib.blake2b(file_bytes, digest_size=16)
+    digest.update(f"{method}\0{pil_format}\0{compress_level}\0".encode('utf-8'))
+    digest.update(message)
+    return digest.hexdigest()
+
+
+def _claim_cache_entry(cache_path):
+    """
+    Decide how to use one cache entry: 'reuse', 'write' or None.
+    
+    An entry another job is still writing is neither read nor written
+    (None), so nobody copies out a half-written file.
+    """
+    with _cache_writes_lock:
+        if cache_path in _cache_writes:
+            return None
+        if cache_path.exists():
+            return 'reuse'
+        _cache_writes.add(cache_path)
+        return 'write'
+
+
+def _release_cache_entry(cache_path):
+    """Mark a claimed cache entry as no longer being written."""
+    with _cache_writes_lock:
+        _cache_writes.discard(cache_path)
+
+
+def _store_cached_output(output_path, cache_path):
+    """Copy a finished output into the cache atomically via a temp file."""
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=cache_path.parent, suffix='.tmp')
+        os.close(fd)
+        try:
+            shutil.copyfile(output_path, tmp_path)
+            os.replace(tmp_path, cache_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    finally:
+        _release_cache_entry(cache_path)
+
+
+def _reuse_cached_output(cache_path, output_path):
+    """Copy a cached output into place and mark it as recently used."""
+    shutil.copyfile(cache_path, output_path)
+    os.utime(cache_path)
+
+
+def _prune_output_cache(max_bytes: int = OUTPUT_CACHE_MAX_BYTES) -> None:
+    """Delete the least recently used cached outputs beyond max_bytes."""
+    try:
+        entries = [(entry.stat(), entry) for entry in OUTPUT_CACHE_PATH.iterdir() if entry.is_file()]
+    except FileNotFoundError:
+        return
+    
+    # Temp files belong to writes in progress unless they are stale
+    now = time.time()
+    stale = [entry for stat, entry in entries
+             if entry.suffix == '.tmp' and now - stat.st_mtime > OUTPUT_CACHE_TEMP_MAX_AGE]
+    for entry in stale:
+        try:
+            entry.unlink()
+        except OSError:
+            pass
+    entries = [(stat, entry) for stat, entry in entries if entry.suffix != '.tmp']
+    
+    total = sum(stat.st_size for stat, _ in entries)
+    for stat, entry in sorted(entries, key=lambda item: item[0].st_mtime):
+        if total <= max_bytes:
+            break
+        try:
+            entry.unlink()
+            total -= stat.st_size
+        except OSError as e:
+            logger.warning(f"Could not evict cached output {entry.name}: {e}")
+
+
+def _read_image(img_path):
+    """Read and fully decode one input image; runs ahead on the read thread."""
+    file_bytes = Path(img_path).read_bytes()
+    img = Image.open(BytesIO(file_bytes))
+    img.load()
+    return file_bytes, img
+
+
+def _save_encoded(encoded_img, output_path, pil_format, cache_path=None, compress_level=PNG_COMPRESS_LEVEL):
+    """
+    Write an encoded image and, optionally, a copy into the output cache.
+    
+    cache_path must have been claimed with _claim_cache_entry; it is
+    released here whether or not the write succeeds.
+    """
+    try:
+        if pil_format == 'PNG':
+            encoded_img.save(output_path, pil_format, compress_level=compress_level, optimize=False)
+        else:
+            encoded_img.save(output_path, pil_format)
+    except BaseException:
+        if cache_path is not None:
+            _release_cache_entry(cache_path)
+        raise
+    if cache_path is not None:
+        _store_cached_output(output_path, cache_path)
+
+
+def _wait_for_save_slot(pending_saves: list) -> None:
+    """Block until fewer than SAVE_QUEUE_SIZE background saves are in flight."""
+    in_flight = [future for future, _ in pending_saves if not future.done()]
+    while len(in_flight) >= SAVE_QUEUE_SIZE:
+        wait(in_flight, return_when=FIRST_COMPLETED)
+        in_flight = [future for future in in_flight if not future.done()]
+
+
 def batch_encode_images(
     image_paths: list,
     secret_message: str,
@@ -37,7 +279,9 @@ def batch_encode_images(
     encrypt_password: str = None,
     encrypt: bool = False,
     batch_id: str = None,
-    batch_mode: str = MODE_UNIFORM
+    batch_mode: str = MODE_UNIFORM,
+    use_cache: bool = True,
+    compress_level: int = PNG_COMPRESS_LEVEL
 ) -> dict:
     """
     Encode secret message into multiple images using selected methods.
@@ -54,6 +298,11 @@ def batch_encode_images(
         encrypt (bool): Whether to encrypt message
         batch_id (str): Unique batch identifier for output folder
         batch_mode (str): 'uniform' or 'packetized'
+        use_cache (bool): Reuse outputs from earlier runs with the same
+                          image, method, message and output settings
+                          (content-addressed). Ignored when encrypting,
+                          since every run produces fresh ciphertext.
+        compress_level (int): zlib level for PNG outputs, 1 (fastest) to 9 (smallest)
     
     Returns:
         dict: {
@@ -93,17 +342,10 @@ def batch_encode_images(
     # Normalize method names (handle "Hybrid DCT" -> "DCT", etc.)
     normalized_methods = []
     if methods is None or 'all' in methods:
-        normalized_methods = ['LSB', 'DCT', 'DWT']
+        normalized_methods = list(ENCODERS)
     else:
-        method_mapping = {
-            'Hybrid DCT': 'DCT',
-            'Hybrid DWT': 'DWT',
-            'DCT': 'DCT',
-            'DWT': 'DWT',
-            'LSB': 'LSB'
-        }
         for m in methods:
-            normalized = method_mapping.get(m, m)
+            normalized = normalize_method(m)
             if normalized not in normalized_methods:
                 normalized_methods.append(normalized)
     
@@ -131,7 +373,10 @@ def batch_encode_images(
     # Prepare message (encrypt if requested) - encrypt BEFORE packetization
     message_to_use = secret_message
     if encrypt and encrypt_password:
+        # Fresh IV per run: the key would never repeat, so don't cache
+        use_cache = False
         try:
+            # Encrypted once per batch: salt and IV are shared by every image
             message_to_use = encrypt_message(secret_message, encrypt_password)
             logger.info("Message encrypted with password")
         except Exception as e:
@@ -162,15 +407,28 @@ def batch_encode_images(
         messages_per_image = [message_to_use] * len(sorted_image_paths)
         logger.info(f"MODE_1: Using same message for all {len(sorted_image_paths)} images")
     
-    # Create output directories
-    for method in methods:
-        method_dir = output_base / method
+    # Create output directories once, before the per-file loop
+    method_dirs = {method: (output_base / method).resolve() for method in methods}
+    for method_dir in method_dirs.values():
         os.makedirs(method_dir, exist_ok=True)
+    if use_cache:
+        os.makedirs(OUTPUT_CACHE_PATH, exist_ok=True)
+    
+    io_pool = ThreadPoolExecutor(max_workers=SAVE_WORKERS)
+    pending_saves = []
+    
+    # The next input is read and decoded while the current one encodes
+    read_pool = ThreadPoolExecutor(max_workers=1)
+    next_read = read_pool.submit(_read_image, sorted_image_paths[0]) if sorted_image_paths else None
     
     # Process each image
     for idx, (img_path, msg_to_embed) in enumerate(zip(sorted_image_paths, messages_per_image)):
+        read_future = next_read
+        if idx + 1 < len(sorted_image_paths):
+            next_read = read_pool.submit(_read_image, sorted_image_paths[idx + 1])
+        
         try:
-            img = Image.open(img_path)
+            file_bytes, img = read_future.result()
             img_path_obj = Path(img_path)
             filename = img_path_obj.stem
             original_extension = img_path_obj.suffix.lower()
@@ -179,24 +437,13 @@ def batch_encode_images(
             
             # Encode with each method
             for method in methods:
-                start_time = time.time()
-                
                 try:
-                    logger.debug(f"  {method}: Starting encoding...")
-                    
-                    if method == 'LSB':
-                        encoded_img = encode_image(img, msg_to_embed)
-                    elif method == 'DCT':
-                        encoded_img = encode_dct(img, msg_to_embed)
-                    elif method == 'DWT':
-                        encoded_img = encode_dwt(img, msg_to_embed)
-                    else:
+                    if method not in ENCODERS:
                         logger.warning(f"  {method}: Unknown method")
                         continue
                     
                     # Save encoded image with appropriate format
-                    output_dir = output_base / method
-                    output_dir.mkdir(parents=True, exist_ok=True)
+                    output_dir = method_dirs[method]
                     
                     # For frequency domain methods (DCT, DWT), use PNG to preserve coefficients
                     if method in ['DCT', 'DWT']:
@@ -214,10 +461,39 @@ def batch_encode_images(
                     else:
                         output_path = output_dir / f"{filename}_{method}{output_extension}"
                     
-                    # Save with appropriate format
-                    encoded_img.save(output_path, pil_format)
+                    cache_path = None
+                    cache_use = None
+                    if use_cache:
+                        cache_path = OUTPUT_CACHE_PATH / (
+                            _output_cache_key(file_bytes, method, msg_to_embed, pil_format, compress_level)
+                            + output_extension
+                        )
+                        cache_use = _claim_cache_entry(cache_path)
+                    
+                    _wait_for_save_slot(pending_saves)
+                    start_time = time.perf_counter()
+                    
+                    if cache_use == 'reuse':
+                        logger.debug(f"  {method}: Reusing cached output {cache_path.name}")
+                        save_future = io_pool.submit(_reuse_cached_output, cache_path, output_path)
+                    else:
+                        logger.debug(f"  {method}: Starting encoding...")
+                        
+                        if cache_use != 'write':
+                            cache_path = None
+                        try:
+                            encoded_img = ENCODERS[method](img, msg_to_embed)
+                        except BaseException:
+                            if cache_path is not None:
+                                _release_cache_entry(cache_path)
+                            raise
+                        
+                        # Save in the background so the next encode overlaps the write
+                        save_future = io_pool.submit(
+                            _save_encoded, encoded_img, output_path, pil_format, cache_path, compress_level
+                        )
                     
-                    elapsed_time = time.time() - start_time
+                    elapsed_time = time.perf_counter() - start_time
                     
                     result_entry = {
                         'filename': filename,
@@ -235,6 +511,7 @@ def batch_encode_images(
                         result_entry['total_packets'] = len(sorted_image_paths)
                     
                     result['results'][method].append(result_entry)
+                    pending_saves.append((save_future, result_entry))
                     
                     logger.info(f"  {method}: Encoded in {elapsed_time:.3f}s - {output_path}")
                     result['total_processed'] += 1
@@ -264,6 +541,20 @@ def batch_encode_images(
                 })
             result['total_failed'] += 1
     
+    # Wait for the writes and surface any that failed
+    for save_future, result_entry in pending_saves:
+        try:
+            save_future.result()
+        except Exception as e:
+            result_entry['status'] = f'Error: {str(e)}'
+            result['total_processed'] -= 1
+            result['total_failed'] += 1
+            logger.error(f"Failed to save {result_entry['output_path']}: {str(e)}")
+    io_pool.shutdown()
+    read_pool.shutdown()
+    if use_cache:
+        _prune_output_cache()
+    
     mode_name = "Uniform" if batch_mode == MODE_UNIFORM else "Packetized"
     result['message'] = f"[{mode_name}] Processed {result['total_processed']} images successfully"
     logger.info(result['message'])
@@ -271,6 +562,38 @@ def batch_encode_images(
     return result
 
 
+def _decode_file(img_path, methods: list) -> tuple:
+    """
+    Try the given decoders on one image file, in order (LSB is moved
+    last unless the image carries LSB framing).
+    
+    Returns:
+        tuple: (message, method, None) for the first decoder that finds a
+               message, (None, None, None) if none does, or
+               (None, None, error) if the file could not be opened
+    """
+    try:
+        img = Image.open(img_path)
+        img.load()
+    except Exception as e:
+        return None, None, e
+    
+    # Without LSB framing an LSB "message" is noise, so try it last
+    if 'LSB' in methods and sniff_method(img) != 'LSB':
+        methods = [m for m in methods if m != 'LSB'] + ['LSB']
+    
+    for method in methods:
+        if method not in DECODERS:
+            continue
+        try:
+            decoded = DECODERS[method](img)
+            if decoded:
+                return decoded, method, None
+        except Exception:
+            continue
+    return None, None, None
+
+
 def batch_decode_images(
     image_paths: list,
     methods: list = None,
@@ -292,13 +615,14 @@ def batch_decode_images(
     Returns:
         dict: Decoding results with auto-detected mode handling
     """
-    from ..stego import decode_image, decode_dct, decode_dwt
     from ..encryption.encryption import decrypt_message
     from .packet_handler import extract_packet_data, reconstruct_message, is_packetized_message
     
     # Normalize methods
     if methods is None:
-        methods = ['LSB', 'DCT', 'DWT']
+        methods = list(DECODERS)
+    else:
+        methods = [normalize_method(m) for m in methods]
     
     result = {
         'success': True,
@@ -314,34 +638,20 @@ def batch_decode_images(
     sorted_paths = sorted(image_paths, key=lambda x: Path(x).name.lower())
     
     decoded_packets = []  # For MODE_2 reconstruction
+    decrypted = {}        # ciphertext -> plaintext; uniform batches repeat one payload
+    
+    # Run the decoder trials for all files concurrently; results come back
+    # in sorted order for the sequential bookkeeping below
+    workers = max(1, min(DECODE_WORKERS, len(sorted_paths)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        decoded_files = list(pool.map(lambda path: _decode_file(path, methods), sorted_paths))
     
-    for img_path in sorted_paths:
+    for img_path, (decoded_message, used_method, error) in zip(sorted_paths, decoded_files):
         try:
-            img = Image.open(img_path)
+            if error is not None:
+                raise error
             filename = Path(img_path).name
             
-            decoded_message = None
-            used_method = None
-            
-            # Try each method
-            method_funcs = {
-                'LSB': decode_image,
-                'DCT': decode_dct,
-                'DWT': decode_dwt
-            }
-            
-            for method in methods:
-                if method not in method_funcs:
-                    continue
-                try:
-                    decoded = method_funcs[method](img)
-                    if decoded:
-                        decoded_message = decoded
-                        used_method = method
-                        break
-                except Exception:
-                    continue
-            
             if decoded_message:
                 # Check if it's a packet (MODE_2)
                 if is_packetized_message(decoded_message):
@@ -369,10 +679,13 @@ def batch_decode_images(
                     
                     # Decrypt if needed
                     if decrypt and decrypt_password:
-                        try:
-                            decoded_message = decrypt_message(decoded_message, decrypt_password)
-                        except Exception as e:
-                            logger.warning(f"Decryption failed for {filename}: {e}")
+                        if decoded_message not in decrypted:
+                            try:
+                                decrypted[decoded_message] = decrypt_message(decoded_message, decrypt_password)
+                            except Exception as e:
+                                logger.warning(f"Decryption failed for {filename}: {e}")
+                                decrypted[decoded_message] = decoded_message
+                        decoded_message = decrypted[decoded_message]
                     
                     result['results'].append({
                         'filename': filename,
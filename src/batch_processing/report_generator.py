@@ -18,6 +18,10 @@ logger = logging.getLogger(__name__)
 
 DATA_OUTPUT_PATH = Path(__file__).parent.parent.parent / 'data' / 'output' / 'reports'
 
+# Encoded images are already compressed (PNG/JPEG), so download ZIPs store
+# them as-is: deflating them again costs CPU for almost no size gain
+DOWNLOAD_ZIP_COMPRESSION = zipfile.ZIP_STORED
+
 
 def generate_batch_report(batch_result: dict, report_name: str = None) -> dict:
     """
@@ -215,7 +219,7 @@ def create_batch_download_zip(batch_result: dict, method: str = None) -> str:
         temp_dir = tempfile.gettempdir()
         zip_path = Path(temp_dir) / f"batch_encoded_{batch_id}.zip"
         
-        with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
+        with zipfile.ZipFile(zip_path, 'w', DOWNLOAD_ZIP_COMPRESSION) as zipf:
             if method:
                 # Add specific method's images - search for all image formats
                 method_dir = base_output / method
@@ -9,6 +9,7 @@ Handles encoding with all three methods and result compilation.
 import time
 import logging
 from io import BytesIO
+import numpy as np
 from PIL import Image
 
 from src.stego.lsb_steganography import encode_image as lsb_encode
@@ -17,53 +18,98 @@ from src.stego.dwt_steganography import encode_dwt as dwt_encode
 
 logger = logging.getLogger(__name__)
 
+COMPARISON_METHODS = [
+    ("LSB", lsb_encode),
+    ("Hybrid DCT", dct_encode),
+    ("Hybrid DWT", dwt_encode)
+]
+
+
+def encoder_inputs(image):
+    """
+    Convert an image once into the pixel arrays each encoder works on.
+    
+    LSB embeds into the RGB pixels, while DCT and DWT only read the
+    grayscale channel, so the two conversions are shared across methods
+    instead of repeated inside every encoder call.
+    
+    Returns:
+        dict: Encoder input keyed by method name
+    """
+    rgb = image if image.mode == 'RGB' else image.convert('RGB')
+    gray = np.asarray(rgb.convert('L'))
+    return {
+        "LSB": np.asarray(rgb),
+        "Hybrid DCT": gray,
+        "Hybrid DWT": gray
+    }
+
+
+def _timed_encode(encode_func, pixels, message):
+    """Run one encoder, returning the encoded image and its wall time."""
+    start_time = time.perf_counter()
+    encoded_image = encode_func(pixels, message)
+    return encoded_image, time.perf_counter() - start_time
+
+
+def encode_all_methods(image, message, on_done=None):
+    """
+    Encode an image with all three methods, one after another.
+    
+    The methods share the arrays from encoder_inputs() but run in turn, so
+    each reported time is that encoder alone rather than a share of the
+    CPU it was competing for.
+    
+    Args:
+        image: PIL image to encode
+        message: Message to encode
+        on_done: Optional callback, called with the number of methods
+                 finished so far as each one completes
+    
+    Returns:
+        dict: Per-method results in COMPARISON_METHODS order, each either
+              {"success": True, "image", "time"} or {"success": False, "error"}
+    """
+    inputs = encoder_inputs(image)
+    results = {}
+    
+    for done, (name, encode_func) in enumerate(COMPARISON_METHODS, start=1):
+        try:
+            encoded_image, elapsed_time = _timed_encode(encode_func, inputs[name], message)
+            results[name] = {"success": True, "image": encoded_image, "time": elapsed_time}
+        except Exception as e:
+            results[name] = {"success": False, "error": str(e)}
+        if on_done is not None:
+            on_done(done)
+    
+    return results
+
+
 def run_comparison_test(image_file, message):
     """
     Run comparison test on all three steganography methods.
     
     Args:
-        image_file: Uploaded image file
+        image_file: Uploaded image file, or an already decoded PIL image
         message: Message to encode
     
     Returns:
         dict: Results for each method with timing and images
     """
-    original = Image.open(image_file)
-    results = {}
+    image = image_file if isinstance(image_file, Image.Image) else Image.open(image_file)
+    results = encode_all_methods(image, message)
     
-    methods = [
-        ("LSB", lsb_encode),
-        ("Hybrid DCT", dct_encode),
-        ("Hybrid DWT", dwt_encode)
-    ]
-    
-    for method_name, encode_func in methods:
-        try:
-            start_time = time.time()
-            encoded_image = encode_func(original, message)
-            elapsed_time = time.time() - start_time
-            
-            # Calculate size
-            buf = BytesIO()
-            encoded_image.save(buf, format="PNG")
-            size_kb = len(buf.getvalue()) / 1024
-            
-            results[method_name] = {
-                "success": True,
-                "image": encoded_image,
-                "time": elapsed_time,
-                "size_kb": size_kb
-            }
-            
-            logger.info(f"{method_name}: SUCCESS in {elapsed_time:.3f}s ({size_kb:.1f}KB)")
+    for method_name, result in results.items():
+        if not result["success"]:
+            logger.error(f"{method_name}: FAILED - {result['error']}")
+            continue
         
-        except Exception as e:
-            error_msg = str(e)
-            results[method_name] = {
-                "success": False,
-                "error": error_msg
-            }
-            logger.error(f"{method_name}: FAILED - {error_msg}")
+        # Calculate size, at the zlib level the encode page downloads use
+        buf = BytesIO()
+        result["image"].save(buf, format="PNG", compress_level=1)
+        result["size_kb"] = buf.tell() / 1024
+        
+        logger.info(f"{method_name}: SUCCESS in {result['time']:.3f}s ({result['size_kb']:.1f}KB)")
     
     return results
 
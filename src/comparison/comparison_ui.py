@@ -7,8 +7,6 @@ Provides the comparison section interface with tabs for overview, testing, and d
 """
 
 import streamlit as st
-import pandas as pd
-from PIL import Image
 from io import BytesIO
 import time
 import logging
@@ -16,7 +14,7 @@ import logging
 from src.stego.lsb_steganography import encode_image as lsb_encode
 from src.stego.dct_steganography import encode_dct as dct_encode
 from src.stego.dwt_steganography import encode_dwt as dwt_encode
-from src.ui.reusable_components import create_file_uploader, show_error, show_success
+from src.ui.reusable_components import create_file_uploader, show_error, show_success, load_image, load_preview
 from .comparison_logic import run_comparison_test, get_method_details
 
 logger = logging.getLogger(__name__)
@@ -52,6 +50,8 @@ def _show_comparison_overview():
     st.markdown('<div class="card animate-fade-in">', unsafe_allow_html=True)
     
     # Comparison data
+    import pandas as pd
+    
     comparison_data = pd.DataFrame({
         "Feature": ["Speed", "Capacity", "Security", "JPEG Safe", "Best For"],
         "LSB": ["⚡ Very Fast", "📦 High (~180KB)", "🔓 Low", "❌ No", "Quick encoding"],
@@ -96,29 +96,37 @@ def _show_comparison_test_section():
         test_image = create_file_uploader(file_type="images", key="compare_test_img")
         
         if test_image:
-            img = Image.open(test_image)
-            st.image(img, caption="Test Image", use_container_width=True)
+            preview, _ = load_preview(test_image.getvalue())
+            st.image(preview, caption="Test Image", use_container_width=True)
         st.markdown('</div>', unsafe_allow_html=True)
     
     with col2:
         st.markdown('<div class="card">', unsafe_allow_html=True)
-        test_message = st.text_area(
-            "Test Message",
-            value="This is a test message for comparison.",
-            height=100,
-            key="compare_test_msg"
-        )
+        # Editing the message inside a form doesn't rerun the page
+        with st.form("compare_test_form", border=False):
+            test_message = st.text_area(
+                "Test Message",
+                value="This is a test message for comparison.",
+                height=100,
+                key="compare_test_msg"
+            )
+            run_btn = st.form_submit_button(
+                "🔄 Run Comparison",
+                use_container_width=True,
+                type="primary",
+                disabled=not test_image
+            )
         st.markdown('</div>', unsafe_allow_html=True)
     
-    if test_image and test_message:
-        if st.button("🔄 Run Comparison", use_container_width=True, type="primary"):
-            _run_and_display_comparison(test_image, test_message)
+    if run_btn and test_image and test_message:
+        _run_and_display_comparison(test_image, test_message)
 
 
 def _run_and_display_comparison(image_file, message):
     """Run comparison and display results."""
     try:
-        results = run_comparison_test(image_file, message)
+        # Reuse the upload's cached decode instead of parsing the file again
+        results = run_comparison_test(load_image(image_file.getvalue()), message)
         
         # Display results
         st.divider()
@@ -15,6 +15,9 @@ from .db_utils import (
     verify_user,
     log_operation,
     log_activity,
+    log_activity_bulk,
+    log_activity_async,
+    get_activity_version,
 )
 
 __all__ = [
@@ -25,6 +28,9 @@ __all__ = [
     'get_user_id',
     'log_operation',
     'log_activity',
+    'log_activity_bulk',
+    'log_activity_async',
+    'get_activity_version',
     'get_user_stats',
     'get_operation_stats',
     'get_timeline_data',
@@ -7,13 +7,17 @@ operation logging, and activity tracking.
 
 import psycopg2
 from psycopg2 import sql
+from psycopg2.extras import execute_values
+import atexit
 import os
 import logging
 import secrets
 import hmac
+import queue
+import time
 from datetime import datetime, timedelta
 from collections import defaultdict
-from threading import Lock
+from threading import Lock, Thread
 from dotenv import load_dotenv
 from pathlib import Path
 import streamlit as st
@@ -56,6 +60,20 @@ MAX_LOGIN_ATTEMPTS = 5
 _login_attempts = defaultdict(list)
 _rate_limit_lock = Lock()
 
+# Credential rules enforced by add_user; no stored account falls outside them
+MIN_USERNAME_LENGTH = 3
+MAX_USERNAME_LENGTH = 255
+MIN_PASSWORD_LENGTH = 8
+
+# Background activity logging
+LOG_FLUSH_DELAY = 0.2  # seconds to wait for more entries before a bulk insert
+LOG_EXIT_TIMEOUT = 5  # seconds to wait at exit for a batch already being inserted
+_log_queue = queue.Queue()
+_log_worker = None
+_log_worker_lock = Lock()
+_activity_versions = defaultdict(int)
+_activity_versions_lock = Lock()
+
 
 class DatabaseError(Exception):
     """Generic database error that doesn't expose internal details."""
@@ -243,12 +261,12 @@ def add_user(username: str, password: str) -> bool:
         username = username.lower().strip()
         
         # Validate username
-        if not username or len(username) < 3 or len(username) > 255:
+        if not username or len(username) < MIN_USERNAME_LENGTH or len(username) > MAX_USERNAME_LENGTH:
             logger.warning("Invalid username length")
             return False
         
         # Validate password strength
-        if not password or len(password) < 8:
+        if not password or len(password) < MIN_PASSWORD_LENGTH:
             logger.warning("Password too short")
             return False
         
@@ -299,6 +317,13 @@ def verify_user(username: str, password: str) -> dict:
     # Normalize username
     username = username.lower().strip()
     
+    # add_user never stores credentials outside these bounds, so reject
+    # them before touching the database or running the password hash
+    if not MIN_USERNAME_LENGTH <= len(username) <= MAX_USERNAME_LENGTH:
+        return None
+    if not password or len(password) < MIN_PASSWORD_LENGTH:
+        return None
+    
     # Check rate limit
     if not _check_rate_limit(username):
         logger.warning(f"Rate limit exceeded for user: {username}")
@@ -406,6 +431,7 @@ def log_activity(user_id: int, action: str, details: str = None):
         conn.commit()
         cursor.close()
         conn.close()
+        _mark_activity_committed([user_id])
         logger.info(f"Activity logged for user {user_id}")
         
     except DatabaseError:
@@ -415,6 +441,140 @@ def log_activity(user_id: int, action: str, details: str = None):
         raise DatabaseError("Failed to log activity")
 
 
+def log_activity_bulk(entries: list):
+    """
+    Log several user activities with one INSERT in a single transaction.
+    
+    Args:
+        entries (list): (user_id, action, details) tuples
+    
+    Raises:
+        DatabaseError: If logging fails
+    """
+    if not entries:
+        return
+    
+    conn = None
+    cursor = None
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        
+        execute_values(
+            cursor,
+            "INSERT INTO activity_log (user_id, action, details) VALUES %s",
+            entries,
+            page_size=len(entries)
+        )
+        
+        conn.commit()
+        _mark_activity_committed(user_id for user_id, _, _ in entries)
+        logger.info(f"Logged {len(entries)} activities")
+        
+    except DatabaseError:
+        raise
+    except psycopg2.Error as e:
+        logger.error(f"Failed to log activities: {str(e)}")
+        raise DatabaseError("Failed to log activities")
+    finally:
+        if cursor is not None:
+            cursor.close()
+        if conn is not None:
+            conn.close()
+
+
+def _mark_activity_committed(user_ids):
+    """Bump the activity version of every user whose rows just committed."""
+    with _activity_versions_lock:
+        for user_id in set(user_ids):
+            _activity_versions[user_id] += 1
+
+
+def get_activity_version(user_id: int) -> int:
+    """
+    Number of committed activity writes for a user in this process.
+    
+    Cache keys for activity views read this, so they only change once
+    the rows are actually in the database, not when they are queued.
+    
+    Args:
+        user_id (int): User ID
+    
+    Returns:
+        int: Version counter, 0 if nothing was logged yet
+    """
+    with _activity_versions_lock:
+        return _activity_versions.get(user_id, 0)
+
+
+def _insert_log_batch(batch):
+    """Bulk-insert queued activities and mark them done on the queue."""
+    try:
+        log_activity_bulk(batch)
+    except DatabaseError:
+        logger.warning(f"Dropped {len(batch)} queued activity log entries")
+    finally:
+        for _ in batch:
+            _log_queue.task_done()
+
+
+def _drain_log_queue():
+    """Worker loop: collect queued activities and insert them in batches."""
+    while True:
+        batch = [_log_queue.get()]
+        time.sleep(LOG_FLUSH_DELAY)
+        while True:
+            try:
+                batch.append(_log_queue.get_nowait())
+            except queue.Empty:
+                break
+        _insert_log_batch(batch)
+
+
+@atexit.register
+def _flush_log_queue():
+    """
+    Insert whatever is still queued when the server shuts down.
+    
+    A batch the worker already took off the queue is still counted as
+    unfinished until it is inserted, so wait briefly for that one too.
+    """
+    batch = []
+    while True:
+        try:
+            batch.append(_log_queue.get_nowait())
+        except queue.Empty:
+            break
+    if batch:
+        _insert_log_batch(batch)
+    
+    with _log_queue.all_tasks_done:
+        if not _log_queue.all_tasks_done.wait_for(
+            lambda: not _log_queue.unfinished_tasks, timeout=LOG_EXIT_TIMEOUT
+        ):
+            logger.warning("Timed out waiting for in-flight activity log entries")
+
+
+def log_activity_async(user_id: int, action: str, details: str = None):
+    """
+    Queue a user activity to be logged by a background thread.
+    
+    Returns immediately so the caller never waits on the database.
+    Failures are logged rather than raised.
+    
+    Args:
+        user_id (int): User ID
+        action (str): Action description
+        details (str): Additional details
+    """
+    global _log_worker
+    with _log_worker_lock:
+        if _log_worker is None or not _log_worker.is_alive():
+            _log_worker = Thread(target=_drain_log_queue, name="activity-log", daemon=True)
+            _log_worker.start()
+    _log_queue.put((user_id, action, details))
+
+
 def get_user_operations(user_id: int, limit: int = 10) -> list:
     """
     Get user's recent operations.
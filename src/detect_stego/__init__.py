@@ -4,12 +4,13 @@ Steganography Detection Module
 Contains tools for detecting hidden messages in images.
 """
 
-from .ml_detector import analyze_image_for_steganography, StegoDetectorML, get_detector
+from .ml_detector import analyze_image_for_steganography, StegoDetectorML, get_detector, get_model_version
 from .ui_section import show_steg_detector_section
 
 __all__ = [
     'analyze_image_for_steganography',
     'StegoDetectorML',
     'get_detector',
+    'get_model_version',
     'show_steg_detector_section'
 ]
\ No newline at end of file
@@ -5,12 +5,13 @@ Uses Random Forest to detect hidden messages in images.
 Single source of truth for ML detection.
 """
 
+import math
 import numpy as np
 import logging
 import pickle
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.preprocessing import StandardScaler
 from scipy.fftpack import dct
 from PIL import Image
 
@@ -22,18 +23,66 @@ MODEL_DIR.mkdir(exist_ok=True)
 MODEL_PATH = MODEL_DIR / "stego_detector_rf.pkl"
 SCALER_PATH = MODEL_DIR / "stego_detector_scaler.pkl"
 
-# Global detector instance
+# Global detector instance and the model file version it was loaded from;
+# the lock keeps concurrent sessions from loading the model twice
 _detector_instance = None
+_detector_model_mtime = None
+_detector_lock = threading.Lock()
+
+
+def _model_mtime():
+    """Modification time of the saved model, or None if there is none."""
+    try:
+        return MODEL_PATH.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+def get_model_version():
+    """
+    Version of the saved model, for keying results computed with it.
+    
+    Returns:
+        int or None: Model file mtime in nanoseconds, or None if untrained
+    """
+    return _model_mtime()
 
 
 def get_detector():
-    """Get or initialize the detector instance (singleton pattern)."""
-    global _detector_instance
-    if _detector_instance is None:
-        _detector_instance = StegoDetectorML()
-        if not _detector_instance.load_model():
-            logger.warning("Pre-trained model not found. Run: python train_ml_detector.py")
-    return _detector_instance
+    """
+    Get or initialize the detector instance (singleton pattern).
+    
+    The instance is only rebuilt when the model file on disk changes, so
+    a model retrained from the UI or the CLI is picked up without a
+    restart while every other call reuses the loaded forest.
+    """
+    global _detector_instance, _detector_model_mtime
+    with _detector_lock:
+        mtime = _model_mtime()
+        if _detector_instance is None or mtime != _detector_model_mtime:
+            detector = StegoDetectorML()
+            if not detector.load_model():
+                logger.warning("Pre-trained model not found. Run: python train_ml_detector.py")
+            _detector_instance, _detector_model_mtime = detector, mtime
+        return _detector_instance
+
+
+def _bernoulli_entropy(p_one):
+    """Entropy in bits of a 0/1 source with P(1) = p_one."""
+    return -sum(p * math.log2(p + 1e-10) for p in (1 - p_one, p_one) if p > 0)
+
+
+FEATURE_NAMES = [
+    "LSB Entropy",
+    "LSB Ratio",
+    "LSB Autocorr",
+    "ASCII Ratio",
+    "Chi-Square",
+    "DCT Mean",
+    "DCT Variance",
+    "High-Freq Energy",
+    "Histogram Var"
+]
 
 
 def analyze_image_for_steganography(img_array, sensitivity):
@@ -49,100 +98,125 @@ def analyze_image_for_steganography(img_array, sensitivity):
             - detection_score: 0-100, higher = more likely stego
     """
     try:
-        detector = get_detector()
-        
-        # Check if model is actually trained
-        if not detector.is_trained or detector.model is None:
-            return 0, [{
-                "Metric": "Status", 
-                "Value": "⚠️ Model not trained"
-            }, {
-                "Metric": "Action Required",
-                "Value": "Train model first: Go to 'Train Model' tab"
-            }]
-        
-        # Make prediction
-        prediction, confidence = detector.predict(img_array, return_confidence=True)
-        
-        # confidence = stego probability (0-100%)
-        # prediction=0 (clean), prediction=1 (stego)
-        #
-        # The score should directly reflect how likely the image is stego.
-        # confidence already IS the stego probability from the model.
-        # Sensitivity just scales the threshold, not the score itself.
-        
-        # Apply sensitivity as a multiplier:
-        #   sensitivity=1  → very lenient  (score scaled down)
-        #   sensitivity=5  → neutral       (score unchanged)
-        #   sensitivity=10 → very aggressive (score scaled up)
-        sensitivity_factor = sensitivity / 5.0
-        final_score = confidence * sensitivity_factor
-        final_score = np.clip(final_score, 0, 100)
-        
-        # Determine verdict based on score thresholds
-        if final_score >= 70:
-            verdict = "STEGO DETECTED ⚠️"
-        elif final_score >= 40:
-            verdict = "SUSPICIOUS 🟡"
-        else:
-            verdict = "CLEAN IMAGE ✅"
-        
-        analysis_data = [
-            {
-                "Metric": "ML Prediction",
-                "Value": verdict
-            },
-            {
-                "Metric": "Stego Probability",
-                "Value": f"{confidence:.1f}%"
-            },
-            {
-                "Metric": "Detection Score",
-                "Value": f"{final_score:.1f}/100"
-            },
-            {
-                "Metric": "Sensitivity Setting",
-                "Value": f"{sensitivity}/10"
-            }
-        ]
-        
-        # Add feature analysis
-        try:
-            features = detector.extract_features(img_array)
-            features_scaled = detector.scaler.transform(features)[0]
-            
-            feature_names = [
-                "LSB Entropy",
-                "LSB Ratio",
-                "LSB Autocorr",
-                "ASCII Ratio",
-                "Chi-Square",
-                "DCT Mean",
-                "DCT Variance",
-                "High-Freq Energy",
-                "Histogram Var"
-            ]
-            
-            for name, value in zip(feature_names, features_scaled):
-                analysis_data.append({
-                    "Metric": f"Feature: {name}",
-                    "Value": f"{value:.4f}"
-                })
-        except Exception as e:
-            logger.warning(f"Feature analysis failed: {e}")
-        
-        return final_score, analysis_data
-        
+        return apply_sensitivity(compute_detection_metrics(img_array), sensitivity)
     except Exception as e:
         logger.error(f"Detection error: {str(e)}")
         return 0, [{"Metric": "Error", "Value": str(e)}]
 
 
+def compute_detection_metrics(img_array):
+    """
+    Run the expensive, sensitivity-independent part of the analysis.
+    
+    Features are extracted once and feed both the model prediction and
+    the per-feature breakdown.
+    
+    Args:
+        img_array: numpy array of image (RGB)
+    
+    Returns:
+        dict: {"confidence": stego probability 0-100,
+               "features": scaled feature values or None},
+              or None if the model is not trained
+    """
+    detector = get_detector()
+    
+    # Check if model is actually trained
+    if not detector.is_trained or detector.model is None:
+        return None
+    
+    _, confidence, features_scaled = detector.score_features(
+        detector.extract_features(img_array)
+    )
+    
+    return {
+        "confidence": confidence,
+        "features": None if features_scaled is None else features_scaled[0].tolist()
+    }
+
+
+def apply_sensitivity(metrics, sensitivity):
+    """
+    Turn cached detection metrics into a score and report rows.
+    
+    Args:
+        metrics: dict from compute_detection_metrics(), or None
+        sensitivity: Detection sensitivity (1-10)
+    
+    Returns:
+        tuple: (detection_score, analysis_data)
+    """
+    if metrics is None:
+        return 0, [{
+            "Metric": "Status", 
+            "Value": "⚠️ Model not trained"
+        }, {
+            "Metric": "Action Required",
+            "Value": "Train model first: Go to 'Train Model' tab"
+        }]
+    
+    # confidence = stego probability (0-100%)
+    #
+    # The score should directly reflect how likely the image is stego.
+    # confidence already IS the stego probability from the model.
+    # Sensitivity just scales the threshold, not the score itself.
+    confidence = metrics["confidence"]
+    
+    # Apply sensitivity as a multiplier:
+    #   sensitivity=1  → very lenient  (score scaled down)
+    #   sensitivity=5  → neutral       (score unchanged)
+    #   sensitivity=10 → very aggressive (score scaled up)
+    sensitivity_factor = sensitivity / 5.0
+    final_score = confidence * sensitivity_factor
+    final_score = np.clip(final_score, 0, 100)
+    
+    # Determine verdict based on score thresholds
+    if final_score >= 70:
+        verdict = "STEGO DETECTED ⚠️"
+    elif final_score >= 40:
+        verdict = "SUSPICIOUS 🟡"
+    else:
+        verdict = "CLEAN IMAGE ✅"
+    
+    analysis_data = [
+        {
+            "Metric": "ML Prediction",
+            "Value": verdict
+        },
+        {
+            "Metric": "Stego Probability",
+            "Value": f"{confidence:.1f}%"
+        },
+        {
+            "Metric": "Detection Score",
+            "Value": f"{final_score:.1f}/100"
+        },
+        {
+            "Metric": "Sensitivity Setting",
+            "Value": f"{sensitivity}/10"
+        }
+    ]
+    
+    # Add feature analysis
+    if metrics["features"] is not None:
+        for name, value in zip(FEATURE_NAMES, metrics["features"]):
+            analysis_data.append({
+                "Metric": f"Feature: {name}",
+                "Value": f"{value:.4f}"
+            })
+    
+    return final_score, analysis_data
+
+
 class StegoDetectorML:
     """Machine Learning-based steganography detector using Random Forest."""
     
     def __init__(self):
         """Initialize the detector."""
+        # sklearn takes ~1s to import; loading it here instead of at module
+        # level keeps it off the app's cold start until detection is used
+        from sklearn.preprocessing import StandardScaler
+        
         self.model = None
         self.scaler = StandardScaler()
         self.is_trained = False
@@ -164,64 +238,65 @@ class StegoDetectorML:
             # ✅ Normalize image values to 0-255 range
             if img_array.max() <= 1.0:
                 img_array = (img_array * 255).astype(np.uint8)
-            else:
+            elif img_array.dtype != np.uint8:
+                # uint8 pixels are already in range; clipping them would
+                # only make two full copies of the image
                 img_array = np.clip(img_array, 0, 255).astype(np.uint8)
             
+            # One pass over the pixels: every histogram-based feature
+            # (LSB counts, chi-square) is derived from these 256 bins
+            hist = np.bincount(img_array.ravel(), minlength=256)
+            lsb_plane = (img_array & 1).ravel()
+            ones_count = hist[1::2].sum()
+            
+            lsb_ratio = ones_count / len(lsb_plane)
+            
             # Feature 1: LSB Entropy (0-1, higher = more random LSBs)
-            lsb_plane = (img_array & 1).flatten()
-            unique, counts = np.unique(lsb_plane, return_counts=True)
-            probs = counts / len(lsb_plane)
-            lsb_entropy = -np.sum(probs * np.log2(probs + 1e-10))
+            lsb_entropy = _bernoulli_entropy(lsb_ratio)
             # Normalize to 0-1 range
             lsb_entropy = min(lsb_entropy / 1.0, 1.0)
             features.append(lsb_entropy)
             
             # Feature 2: LSB 0/1 Ratio deviation from 0.5
-            ones_count = np.sum(lsb_plane)
-            lsb_ratio = ones_count / len(lsb_plane)
             # Clean images should be ~0.5, deviation indicates possible data
             features.append(abs(lsb_ratio - 0.5))
             
             # Feature 3: LSB Autocorrelation
+            # Pearson correlation of neighbouring LSBs, computed from bit
+            # counts alone since both series are 0/1
             if len(lsb_plane) > 1000:
-                try:
-                    autocorr = np.corrcoef(lsb_plane[:-1], lsb_plane[1:])[0, 1]
-                    if np.isnan(autocorr):
-                        autocorr = 0
-                    features.append(abs(autocorr))
-                except:
-                    features.append(0)
+                n = len(lsb_plane) - 1
+                ones_head = int(ones_count) - int(lsb_plane[-1])
+                ones_tail = int(ones_count) - int(lsb_plane[0])
+                ones_both = np.count_nonzero(lsb_plane[:-1] & lsb_plane[1:])
+                denom = np.sqrt(float(n * ones_head - ones_head ** 2) * float(n * ones_tail - ones_tail ** 2))
+                autocorr = (n * ones_both - ones_head * ones_tail) / denom if denom > 0 else 0
+                features.append(abs(autocorr))
             else:
                 features.append(0)
             
             # Feature 4: ASCII Characters in LSB Extraction
             # ✅ FIX: Only check first 1000 pixels to avoid false positives
-            binary_data = ''
             flat_array = img_array.reshape(-1, 3)
             pixel_sample = min(1000, len(flat_array))  # Sample only 1000 pixels
+            lsb_bits = (flat_array[:pixel_sample] & 1).ravel()
             
-            for pixel in flat_array[:pixel_sample]:
-                for channel in range(3):
-                    binary_data += str(pixel[channel] & 1)
-            
-            ascii_count = 0
-            total_bytes = 0
-            for i in range(0, min(len(binary_data) - 8, 8000), 8):
-                byte_val = int(binary_data[i:i+8], 2)
-                total_bytes += 1
-                # Printable ASCII range
-                if 32 <= byte_val <= 126 or byte_val in [10, 13, 9]:
-                    ascii_count += 1
+            # Pack the LSB stream into bytes in one pass (whole bytes only);
+            # same byte count as the old range(0, min(bits - 8, 8000), 8) scan
+            scan_end = max(0, min(len(lsb_bits) - 8, 8000))
+            total_bytes = (scan_end + 7) // 8
+            byte_vals = np.packbits(lsb_bits[:total_bytes * 8])
+            # Printable ASCII range
+            is_ascii = ((byte_vals >= 32) & (byte_vals <= 126)) | np.isin(byte_vals, (9, 10, 13))
+            ascii_count = np.count_nonzero(is_ascii)
             
             ascii_ratio = ascii_count / total_bytes if total_bytes > 0 else 0
             features.append(ascii_ratio)
             
             # Feature 5: Chi-Square Statistic
-            hist, _ = np.histogram(img_array.flatten(), bins=256, range=(0, 256))
-            chi_sum = 0
-            for i in range(0, 256, 2):
-                expected = (hist[i] + hist[i+1]) / 2 + 0.1
-                chi_sum += ((hist[i] - expected) ** 2 + (hist[i+1] - expected) ** 2) / expected
+            evens, odds = hist[0::2], hist[1::2]
+            expected = (evens + odds) / 2 + 0.1
+            chi_sum = np.sum(((evens - expected) ** 2 + (odds - expected) ** 2) / expected)
             chi_normalized = chi_sum / 128
             # ✅ FIX: Normalize to reasonable range
             chi_normalized = min(chi_normalized / 10.0, 1.0)
@@ -277,6 +352,34 @@ class StegoDetectorML:
             # Return neutral features (0.5) if extraction fails
             return np.full((1, 9), 0.5)
     
+    def score_features(self, features):
+        """
+        Score extracted features with the trained model.
+        
+        Args:
+            features: Feature row from extract_features()
+        
+        Returns:
+            tuple: (prediction, stego confidence 0-100,
+                    scaled features or None if the scaler is not fitted)
+        """
+        # ✅ FIX: Check scaler is fitted
+        try:
+            features_scaled = self.scaler.transform(features)
+        except Exception as e:
+            logger.warning(f"Scaler not fitted: {e}. Using features as-is.")
+            features_scaled = None
+        
+        # One pass over the forest: predict() would recompute the same
+        # probabilities and take their argmax
+        confidence = self.model.predict_proba(
+            features if features_scaled is None else features_scaled
+        )[0]
+        prediction = self.model.classes_[np.argmax(confidence)]
+        
+        # confidence[0] = prob of class 0 (clean), confidence[1] = prob of class 1 (stego)
+        return int(prediction), confidence[1] * 100, features_scaled
+    
     def predict(self, img_array, return_confidence=False):
         """
         Predict if image contains steganography.
@@ -297,25 +400,14 @@ class StegoDetectorML:
                 else:
                     return 0
             
-            features = self.extract_features(img_array)
-            
-            # ✅ FIX: Check scaler is fitted
-            try:
-                features_scaled = self.scaler.transform(features)
-            except Exception as e:
-                logger.warning(f"Scaler not fitted: {e}. Using features as-is.")
-                features_scaled = features
-            
-            prediction = self.model.predict(features_scaled)[0]
-            confidence = self.model.predict_proba(features_scaled)[0]
-            
-            # confidence[0] = prob of class 0 (clean), confidence[1] = prob of class 1 (stego)
-            stego_confidence = confidence[1] * 100
+            prediction, stego_confidence, _ = self.score_features(
+                self.extract_features(img_array)
+            )
             
             if return_confidence:
-                return int(prediction), stego_confidence
+                return prediction, stego_confidence
             else:
-                return int(prediction)
+                return prediction
             
         except Exception as e:
             logger.error(f"Prediction error: {str(e)}")
@@ -413,7 +505,7 @@ class StegoDetectorML:
             logger.error(f"Error getting feature importance: {e}")
             return {}
 
-    def train(self, cover_images, stego_images, validation_split=0.2, n_estimators=200):
+    def train(self, cover_images, stego_images, validation_split=0.2, n_estimators=200, workers=None):
         """
         Train the Random Forest model on cover and stego images.
         
@@ -422,10 +514,13 @@ class StegoDetectorML:
             stego_images: list of numpy arrays (images with hidden data)
             validation_split: fraction of data for validation (0.0-1.0)
             n_estimators: number of trees in the forest
+            workers: threads extracting features (default: executor default)
         
         Returns:
             dict: Training metrics with ALL key variants for compatibility
         """
+        from sklearn.ensemble import RandomForestClassifier
+        from sklearn.preprocessing import StandardScaler
         from sklearn.model_selection import train_test_split
         from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score, confusion_matrix
         
@@ -433,33 +528,39 @@ class StegoDetectorML:
             logger.info(f"Training with {len(cover_images)} cover + {len(stego_images)} stego images")
             
             # Step 1: Extract features from all images
-            X = []
-            y = []
-            
-            logger.info("Extracting features from cover images...")
-            for i, img in enumerate(cover_images):
+            # Worker threads run ahead of the consumer (the numpy kernels
+            # release the GIL); map keeps image order, so rows land in the
+            # preallocated matrix exactly as a sequential pass would write
+            # them. Images whose features fail are skipped and the matrix
+            # trimmed after.
+            X = np.empty((len(cover_images) + len(stego_images), 9))
+            y = np.empty(len(X), dtype=np.int64)
+            n_rows = 0
+            
+            # label 0 = clean, 1 = stego
+            jobs = [(img, 0, "cover", i) for i, img in enumerate(cover_images)]
+            jobs += [(img, 1, "stego", i) for i, img in enumerate(stego_images)]
+            
+            def _features(job):
+                img, _, kind, i = job
                 try:
                     if isinstance(img, Image.Image):
                         img = np.array(img)
-                    features = self.extract_features(img)
-                    X.append(features.flatten())
-                    y.append(0)  # 0 = clean
+                    return self.extract_features(img)
                 except Exception as e:
-                    logger.warning(f"Failed to extract features from cover image {i}: {e}")
-            
-            logger.info("Extracting features from stego images...")
-            for i, img in enumerate(stego_images):
-                try:
-                    if isinstance(img, Image.Image):
-                        img = np.array(img)
-                    features = self.extract_features(img)
-                    X.append(features.flatten())
-                    y.append(1)  # 1 = stego
-                except Exception as e:
-                    logger.warning(f"Failed to extract features from stego image {i}: {e}")
-            
-            X = np.array(X)
-            y = np.array(y)
+                    logger.warning(f"Failed to extract features from {kind} image {i}: {e}")
+                    return None
+            
+            logger.info("Extracting features from cover and stego images...")
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="features") as pool:
+                for (_, label, _, _), features in zip(jobs, pool.map(_features, jobs)):
+                    if features is not None:
+                        X[n_rows] = features
+                        y[n_rows] = label
+                        n_rows += 1
+            
+            X = X[:n_rows]
+            y = y[:n_rows]
             
             logger.info(f"Total samples: {len(X)} (cover: {np.sum(y==0)}, stego: {np.sum(y==1)})")
             
@@ -5,8 +5,13 @@ Generates synthetic training data and trains Random Forest model.
 Creates both cover and stego images for classification.
 """
 
+import os
 import numpy as np
 import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from multiprocessing import shared_memory
 from pathlib import Path
 from PIL import Image
 import sys
@@ -21,6 +26,11 @@ from src.stego.dct_steganography import encode_dct
 from src.stego.dwt_steganography import encode_dwt
 
 logger = logging.getLogger(__name__)
+
+# Spawned workers start clean instead of forking the caller's threads
+# (Streamlit's runner, the log writer), which can deadlock on held locks
+_POOL_CONTEXT = multiprocessing.get_context("spawn")
+
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
@@ -73,11 +83,10 @@ def generate_random_image(size=(256, 256), seed=None):
         # Combination of patterns
         img = np.random.randint(100, 180, (*size, 3), dtype=np.uint8)
         
-        # Add some structured patterns
-        for i in range(size[0]):
-            for j in range(size[1]):
-                if (i + j) % 10 == 0:
-                    img[i, j] = np.clip(img[i, j] + 30, 0, 255)
+        # Add some structured patterns along every 10th anti-diagonal
+        rows, cols = np.indices(size)
+        diagonal = (rows + cols) % 10 == 0
+        img[diagonal] = np.clip(img[diagonal].astype(np.int16) + 30, 0, 255)
     
     return img
 
@@ -100,9 +109,7 @@ def generate_stego_image(cover_img, method='lsb', seed=None):
         
         # Generate random secret message
         msg_len = np.random.randint(50, 500)
-        secret_msg = ''.join(
-            chr(np.random.randint(32, 126)) for _ in range(msg_len)
-        )
+        secret_msg = np.random.randint(32, 126, size=msg_len).astype(np.uint8).tobytes().decode('ascii')
         
         # Convert to PIL Image for embedding
         cover_pil = Image.fromarray(cover_img)
@@ -140,46 +147,117 @@ def generate_stego_image(cover_img, method='lsb', seed=None):
         return None
 
 
-def generate_training_data(n_samples=200, image_size=(256, 256)):
+STEGO_METHODS = ['lsb', 'dct', 'dwt']
+
+
+def _generate_pair(i, image_size):
+    """
+    Build training pair ``i``: a cover image and its stego counterpart.
+    
+    Every random draw is seeded from ``i``, so pairs are independent of
+    each other and of which process builds them.
+    
+    Returns:
+        tuple: (cover_img, stego_img), stego_img None if every method failed
+    """
+    cover_img = generate_random_image(image_size, seed=i)
+    
+    # Generate stego image using random method
+    method = STEGO_METHODS[i % len(STEGO_METHODS)]
+    stego_img = generate_stego_image(cover_img, method=method, seed=i)
+    
+    if stego_img is None:
+        # If stego generation fails, try different method
+        for backup_method in STEGO_METHODS:
+            if backup_method != method:
+                stego_img = generate_stego_image(cover_img, method=backup_method, seed=i+1000)
+                if stego_img is not None:
+                    break
+    
+    return cover_img, stego_img
+
+
+def _generate_pair_into(i, image_size, shm_name, n_samples):
+    """
+    Build training pair ``i`` and write it into the shared dataset buffer.
+    
+    The buffer holds (2, n_samples, height, width, 3) uint8 pixels, covers
+    first, so the images never have to be pickled back to the parent.
+    
+    Returns:
+        bool: Whether a stego image was written. False also when the stego
+        image does not fit the slot (DWT trims odd sizes); pairs are seeded
+        from ``i``, so the caller can rebuild those locally.
+    """
+    shm = shared_memory.SharedMemory(name=shm_name)
+    dataset = np.ndarray((2, n_samples, *image_size, 3), dtype=np.uint8, buffer=shm.buf)
+    try:
+        cover_img, stego_img = _generate_pair(i, image_size)
+        dataset[0, i] = cover_img
+        if stego_img is None or stego_img.shape != cover_img.shape:
+            return False
+        dataset[1, i] = stego_img
+        return True
+    finally:
+        del dataset
+        shm.close()
+
+
+def generate_training_data(n_samples=200, image_size=(256, 256), workers=None):
     """
     Generate balanced dataset of cover and stego images.
     
+    Pairs are built in parallel spawned worker processes that write
+    straight into one shared memory block; results are collected in sample
+    order, so the dataset is identical to a sequential run.
+    
     Args:
         n_samples: int - Total samples to generate (will be split 50/50)
         image_size: tuple - Image dimensions
+        workers: int - Worker processes (default: one per CPU)
     
     Returns:
         tuple: (cover_images, stego_images)
     """
     logger.info(f"Generating {n_samples} training image pairs...")
     
-    cover_images = []
-    stego_images = []
-    
-    methods = ['lsb', 'dct', 'dwt']
+    workers = max(1, min(workers or os.cpu_count() or 1, n_samples))
+    chunksize = max(1, n_samples // (workers * 4))
+    shape = (2, n_samples, *image_size, 3)
     
-    for i in range(n_samples):
-        # Generate cover image
-        cover_img = generate_random_image(image_size, seed=i)
-        cover_images.append(cover_img)
-        
-        # Generate stego image using random method
-        method = methods[i % len(methods)]
-        stego_img = generate_stego_image(cover_img, method=method, seed=i)
+    shm = shared_memory.SharedMemory(create=True, size=max(1, int(np.prod(shape))))
+    try:
+        with ProcessPoolExecutor(max_workers=workers,
+                                 mp_context=_POOL_CONTEXT) as pool:
+            results = []
+            pairs = pool.map(
+                _generate_pair_into, range(n_samples), repeat(image_size),
+                repeat(shm.name), repeat(n_samples), chunksize=chunksize
+            )
+            for i, result in enumerate(pairs):
+                results.append(result)
+                
+                if (i + 1) % 25 == 0:
+                    logger.info(f"Generated {i + 1}/{n_samples} image pairs")
         
-        if stego_img is not None:
-            stego_images.append(stego_img)
+        dataset = np.ndarray(shape, dtype=np.uint8, buffer=shm.buf).copy()
+    finally:
+        # Unlink even if the pool or close() fails, so no segment leaks
+        try:
+            shm.close()
+        finally:
+            shm.unlink()
+    
+    cover_images = list(dataset[0])
+    stego_images = []
+    for i, written in enumerate(results):
+        if written:
+            stego_images.append(dataset[1, i])
         else:
-            # If stego generation fails, try different method
-            for backup_method in methods:
-                if backup_method != method:
-                    stego_img = generate_stego_image(cover_img, method=backup_method, seed=i+1000)
-                    if stego_img is not None:
-                        stego_images.append(stego_img)
-                        break
-        
-        if (i + 1) % 25 == 0:
-            logger.info(f"Generated {i + 1}/{n_samples} image pairs")
+            # Failed or did not fit its slot; rebuilding is deterministic
+            _, stego_img = _generate_pair(i, image_size)
+            if stego_img is not None:
+                stego_images.append(stego_img)
     
     logger.info(f"Successfully generated {len(cover_images)} cover and {len(stego_images)} stego images")
     return cover_images, stego_images
@@ -189,7 +267,7 @@ def generate_training_data(n_samples=200, image_size=(256, 256)):
 #  Model Training
 # ============================================================================
 
-def train_detector(n_samples=200, image_size=(256, 256), save_path=None):
+def train_detector(n_samples=200, image_size=(256, 256), save_path=None, workers=None):
     """
     Train Random Forest steganography detector.
     
@@ -197,6 +275,8 @@ def train_detector(n_samples=200, image_size=(256, 256), save_path=None):
         n_samples: int - Number of training image pairs
         image_size: tuple - Image dimensions
         save_path: str - Path to save model (optional)
+        workers: int - Data generation processes and feature threads
+                 (default: one process per CPU, executor-default threads)
     
     Returns:
         dict: Training metrics
@@ -208,7 +288,7 @@ def train_detector(n_samples=200, image_size=(256, 256), save_path=None):
     try:
         # Generate training data
         logger.info(f"Step 1: Generating synthetic training data...")
-        cover_imgs, stego_imgs = generate_training_data(n_samples, image_size)
+        cover_imgs, stego_imgs = generate_training_data(n_samples, image_size, workers=workers)
         
         if len(cover_imgs) == 0 or len(stego_imgs) == 0:
             error_msg = "Failed to generate training data"
@@ -230,7 +310,7 @@ def train_detector(n_samples=200, image_size=(256, 256), save_path=None):
         logger.info(f"  - Features: 9 statistical features")
         logger.info(f"  - Samples: {len(cover_imgs) + len(stego_imgs)}")
         
-        metrics = detector.train(cover_imgs, stego_imgs, validation_split=0.2)
+        metrics = detector.train(cover_imgs, stego_imgs, validation_split=0.2, workers=workers)
         
         if "error" in metrics:
             logger.error(f"Training failed: {metrics['error']}")
@@ -286,6 +366,7 @@ Examples:
   python train_ml_detector.py                    # Train with 200 samples
   python train_ml_detector.py --samples 500      # Train with 500 samples
   python train_ml_detector.py --samples 100 --size 128  # Custom size
+  python train_ml_detector.py --workers 4        # Limit data generation and features to 4 workers
         """
     )
     
@@ -310,6 +391,13 @@ Examples:
         help='Save path for model (default: src/detect_stego/models/stego_detector_rf.pkl)'
     )
     
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=os.cpu_count(),
+        help='Worker processes for data generation and threads for feature extraction (default: number of CPUs)'
+    )
+    
     parser.add_argument(
         '--verbose',
         action='store_true',
@@ -325,7 +413,8 @@ Examples:
     metrics = train_detector(
         n_samples=args.samples,
         image_size=(args.size, args.size),
-        save_path=args.output
+        save_path=args.output,
+        workers=args.workers
     )
     
     # Print summary
@@ -10,7 +10,6 @@ import logging
 import streamlit as st
 from PIL import Image
 import numpy as np
-import pandas as pd
 
 from src.ui.reusable_components import (
     create_file_uploader,
@@ -22,11 +21,16 @@ from src.ui.reusable_components import (
     create_metric_cards,
     show_processing_spinner,
     render_step,
+    load_rgb_array,
+    load_preview,
     store_processed_image,
     cache_result,
     get_cached_result
 )
-from .ml_detector import analyze_image_for_steganography, StegoDetectorML, get_detector
+from .ml_detector import (
+    apply_sensitivity, compute_detection_metrics,
+    StegoDetectorML, get_detector, get_model_version
+)
 
 logger = logging.getLogger(__name__)
 
@@ -96,9 +100,10 @@ def show_steg_detector_section():
             col1, col2 = st.columns([1, 2])
             
             with col1:
-                image = Image.open(uploaded_file).convert('RGB')
-                st.image(image, caption="Uploaded Image", use_column_width=True)
-                image_info = f"**Size:** {image.size[0]}×{image.size[1]}px"
+                img_array = load_rgb_array(uploaded_file.getvalue())
+                preview, _ = load_preview(uploaded_file.getvalue())
+                st.image(preview, caption="Uploaded Image", use_column_width=True)
+                image_info = f"**Size:** {img_array.shape[1]}×{img_array.shape[0]}px"
                 st.markdown(image_info)
             
             with col2:
@@ -106,7 +111,6 @@ def show_steg_detector_section():
                 
                 # Run analysis
                 with st.spinner("Analyzing image for steganography..."):
-                    img_array = np.array(image)
                     score, data = _run_analysis(img_array, sensitivity)
                 
                 if score is not None:
@@ -344,6 +348,8 @@ def _run_model_training(n_samples, image_sizes, methods, validation_split, custo
                 metrics = train_detector(n_samples=n_samples, save_path=custom_path)
         
         if "error" not in metrics:
+            # Results computed with the previous model are stale now
+            _cached_detection_metrics.clear()
             show_success("✅ Training completed successfully!")
             
             with metrics_container:
@@ -400,11 +406,23 @@ def _run_model_training(n_samples, image_sizes, methods, validation_split, custo
         pass
 
 
+@st.cache_data(max_entries=16, show_spinner=False)
+def _cached_detection_metrics(img_array: np.ndarray, model_version):
+    """
+    Model output for an image; independent of the sensitivity slider.
+    
+    model_version only keys the cache, so a model retrained by another
+    session or the CLI is never answered from stale entries.
+    """
+    return compute_detection_metrics(img_array)
+
+
 def _run_analysis(image: Image.Image, sensitivity: int):
     """Run the steganography detection analysis."""
     try:
-        img_array = np.array(image)
-        score, data = analyze_image_for_steganography(img_array, sensitivity)
+        img_array = np.asarray(image)
+        metrics = _cached_detection_metrics(img_array, get_model_version())
+        score, data = apply_sensitivity(metrics, sensitivity)
         
         return score, data
             
@@ -506,6 +524,8 @@ def _display_results(results: dict):
         feature_data = [d for d in data if "Feature:" in d.get("Metric", "")]
         
         if feature_data:
+            import pandas as pd
+            
             st.dataframe(
                 pd.DataFrame(feature_data),
                 use_container_width=True,
@@ -109,8 +109,6 @@ def encrypt_message(message, password):
             modes.CBC(iv),
             backend=default_backend(),
         )
-        ciphertext = cipher.encryptor().update(padded) + cipher.encryptor().finalize()
-
         # NOTE: encryptor must be used as a single context to avoid state issues
         encryptor = cipher.encryptor()
         ciphertext = encryptor.update(padded) + encryptor.finalize()
@@ -23,6 +23,54 @@ logger = logging.getLogger(__name__)
 # A step of 2 means we quantize coefficients to even/odd multiples of QUANT_STEP
 QUANT_STEP = 25
 
+def grayscale_array(image):
+    """
+    Grayscale float64 pixels of a cover, as the DCT and DWT encoders read it.
+    
+    An ndarray means the same thing here as it does for the LSB encoder:
+    H×W×3 uint8 RGB pixels. An H×W array is taken as grayscale pixels that
+    were already converted, so one conversion can be shared across calls.
+    
+    Args:
+        image (PIL.Image | np.ndarray): Input image or its pixels
+    
+    Returns:
+        numpy array: (H, W) float64 pixels
+    
+    Raises:
+        ValueError: If an array is neither H×W nor H×W×3
+    """
+    if isinstance(image, np.ndarray):
+        if image.ndim == 2:
+            return image.astype(np.float64)
+        if image.ndim != 3 or image.shape[2] != 3:
+            raise ValueError(
+                f"Expected H×W grayscale or H×W×3 RGB pixels, got shape {image.shape}"
+            )
+        image = Image.fromarray(image.astype(np.uint8, copy=False), 'RGB')
+    elif image.mode != 'RGB':
+        image = image.convert('RGB')
+    
+    # Convert to grayscale (Y channel equivalent)
+    return np.array(image.convert('L'), dtype=np.float64)
+
+
+def _embedding_coefficients(img_array):
+    """
+    Coefficient (4, 4) of every 8×8 block of a grayscale array, in one pass.
+    
+    Runs the same orthonormal DCTs as the per-block code over all blocks
+    at once, keeping only row 4 between the two passes, so the values are
+    bit-for-bit what a full 2D DCT of each block gives.
+    
+    Returns:
+        numpy array: (h // 8, w // 8) coefficients, blocks in row-major order
+    """
+    h, w = img_array.shape
+    blocks = img_array[:h // 8 * 8, :w // 8 * 8].reshape(h // 8, 8, w // 8, 8).transpose(0, 2, 1, 3)
+    columns = dct(blocks, axis=-2, norm='ortho')[..., 4, :]
+    return dct(columns, axis=-1, norm='ortho')[..., 4]
+
 
 def encode_dct(image, message):
     """
@@ -37,22 +85,19 @@ def encode_dct(image, message):
     6. Reconstruct image
     
     Args:
-        image (PIL.Image): Input image (recommended: 1024x768 or larger)
+        image (PIL.Image | np.ndarray): Input image (recommended: 1024x768
+            or larger), its H×W×3 RGB pixels, or its grayscale pixels
+            as an H×W array
         message (str): Secret message to encode (UTF-8)
     
     Returns:
         PIL.Image: Encoded image with hidden message
     
     Raises:
-        ValueError: If message is too large for image capacity
+        ValueError: If message is too large for image capacity, or the
+            pixel array has an unsupported shape
     """
-    if image.mode != 'RGB':
-        image = image.convert('RGB')
-    
-    # Convert to grayscale (Y channel equivalent)
-    gray = image.convert('L')
-    img_array = np.array(gray, dtype=np.float64)
-    
+    img_array = grayscale_array(image)
     h, w = img_array.shape
     
     # Message encoding
@@ -77,60 +122,42 @@ def encode_dct(image, message):
             f"Required image size: at least {int(np.sqrt((message_length + 2) * 8)) * 8}x{int(np.sqrt((message_length + 2) * 8)) * 8} pixels"
         )
     
-    # Prepare bit string: 16-bit length prefix + message bits
-    bit_string = format(message_length, '016b')
-    for byte in message_bytes:
-        bit_string += format(byte, '08b')
+    # 16-bit length prefix + message bits, one per block in row-major order
+    bits = np.unpackbits(np.frombuffer(message_length.to_bytes(2, 'big') + message_bytes, dtype=np.uint8))
+    bit_count = len(bits)
     
     logger.info(f"DCT: Encoding {message_length} bytes in {total_blocks} 8x8 blocks")
-    logger.debug(f"DCT: Total bits to embed: {len(bit_string)}, Capacity: {max_bits} bits")
-    
-    bit_index = 0
-    
-    for i in range(num_blocks_h):
-        for j in range(num_blocks_w):
-            if bit_index >= len(bit_string):
-                break
-            
-            # Extract 8×8 block
-            block = img_array[i*8:(i+1)*8, j*8:(j+1)*8].copy()
-            
-            # Apply 2D DCT
-            dct_block = dct(dct(block.T, norm='ortho').T, norm='ortho')
-            
-            # Embed using quantization index modulation (QIM)
-            # This is far more robust than simple parity embedding
-            coeff = dct_block[4, 4]
-            bit = int(bit_string[bit_index])
-            
-            # Quantize: map coefficient to nearest value where
-            # floor(coeff / QUANT_STEP) % 2 == bit
-            quantized = round(coeff / QUANT_STEP) * QUANT_STEP
-            # Check if quantized index has correct parity
-            quant_index = round(coeff / QUANT_STEP)
-            if quant_index % 2 != bit:
-                # Shift to adjacent quantization level with correct parity
-                if coeff > quantized:
-                    quantized += QUANT_STEP
-                else:
-                    quantized -= QUANT_STEP
-            
-            dct_block[4, 4] = float(quantized)
-            
-            # Apply inverse 2D DCT
-            block_reconstructed = idct(idct(dct_block.T, norm='ortho').T, norm='ortho')
-            img_array[i*8:(i+1)*8, j*8:(j+1)*8] = block_reconstructed
-            
-            bit_index += 1
-        
-        if bit_index >= len(bit_string):
-            break
+    logger.debug(f"DCT: Total bits to embed: {bit_count}, Capacity: {max_bits} bits")
+    
+    # Gather the carrying blocks as (n, 8, 8); only the block rows holding
+    # bits are copied out
+    block_rows = -(-bit_count // num_blocks_w)
+    region = img_array[:block_rows * 8, :num_blocks_w * 8]
+    blocks = region.reshape(block_rows, 8, num_blocks_w, 8).swapaxes(1, 2).reshape(-1, 8, 8)
+    
+    # 2D DCT of every block at once: columns, then rows, as the per-block
+    # dct(dct(block.T).T) did, so coefficients match bit for bit
+    dct_blocks = dct(dct(blocks[:bit_count], axis=-2, norm='ortho'), axis=-1, norm='ortho')
+    
+    # Embed using quantization index modulation (QIM): move each (4, 4)
+    # coefficient to the nearest multiple of QUANT_STEP whose index parity
+    # equals the bit
+    coeffs = dct_blocks[:, 4, 4]
+    quant_index = np.round(coeffs / QUANT_STEP)
+    quantized = quant_index * QUANT_STEP
+    wrong_parity = quant_index % 2 != bits
+    quantized[wrong_parity] += np.where(coeffs > quantized, QUANT_STEP, -QUANT_STEP)[wrong_parity]
+    dct_blocks[:, 4, 4] = quantized
+    
+    # Inverse 2D DCT, columns then rows, and write the blocks back
+    blocks[:bit_count] = idct(idct(dct_blocks, axis=-2, norm='ortho'), axis=-1, norm='ortho')
+    region[...] = blocks.reshape(block_rows, num_blocks_w, 8, 8).swapaxes(1, 2).reshape(region.shape)
     
     # Convert back to image
     result = np.clip(img_array, 0, 255).astype(np.uint8)
     encoded_image = Image.fromarray(result, 'L').convert('RGB')
     
-    logger.info(f"DCT: Successfully encoded {bit_index} bits")
+    logger.info(f"DCT: Successfully encoded {bit_count} bits")
     
     return encoded_image
 
@@ -156,49 +183,27 @@ def decode_dct(image):
         h, w = img_array.shape
         num_blocks_h = h // 8
         num_blocks_w = w // 8
-        
-        bits = []
-        message_length = None
-        total_bits_needed = None
+        total_blocks = num_blocks_h * num_blocks_w
         
         logger.debug(f"DCT: Decoding from {num_blocks_h}x{num_blocks_w} blocks")
         
-        for i in range(num_blocks_h):
-            for j in range(num_blocks_w):
-                block = img_array[i*8:(i+1)*8, j*8:(j+1)*8]
-                dct_block = dct(dct(block.T, norm='ortho').T, norm='ortho')
-                
-                # Extract bit using same QIM scheme
-                coeff = dct_block[4, 4]
-                quant_index = round(coeff / QUANT_STEP)
-                bit = quant_index % 2
-                bits.append(str(bit))
-                
-                # Early exit once we know the message length
-                if len(bits) == 16 and message_length is None:
-                    message_length = int(''.join(bits[:16]), 2)
-                    if message_length == 0 or message_length > (num_blocks_h * num_blocks_w) // 8:
-                        logger.warning(f"DCT: Invalid message length: {message_length}")
-                        return ""
-                    total_bits_needed = 16 + (message_length * 8)
-                
-                if total_bits_needed and len(bits) >= total_bits_needed:
-                    break
-            else:
-                continue
-            break
-        
-        if len(bits) < 16:
+        if total_blocks < 16:
             logger.warning("DCT: Not enough bits extracted")
             return ""
         
+        # Extract every block's bit using the same QIM scheme
+        coeffs = _embedding_coefficients(img_array).ravel()
+        bits = (np.round(coeffs / QUANT_STEP) % 2).astype(np.uint8)
+        
         # Extract message length (first 16 bits)
-        if message_length is None:
-            message_length = int(''.join(bits[:16]), 2)
+        message_length = int.from_bytes(np.packbits(bits[:16]).tobytes(), 'big')
+        if message_length == 0 or message_length > total_blocks // 8:
+            logger.warning(f"DCT: Invalid message length: {message_length}")
+            return ""
         
         logger.debug(f"DCT: Extracted message length = {message_length}")
         
-        if message_length == 0 or message_length > 100000:
+        if message_length > 100000:
             logger.warning(f"DCT: Invalid message length: {message_length}")
             return ""
         
@@ -208,10 +213,7 @@ def decode_dct(image):
             return ""
         
         # Convert bits to bytes
-        message_bytes = bytearray()
-        for k in range(message_length):
-            byte_bits = ''.join(bits[16 + k*8 : 16 + (k+1)*8])
-            message_bytes.append(int(byte_bits, 2))
+        message_bytes = np.packbits(bits[16:total_bits_needed]).tobytes()
         
         decoded = message_bytes.decode('utf-8')
         logger.info(f"DCT: Successfully decoded {len(decoded)} characters")
@@ -17,93 +17,88 @@ import numpy as np
 from PIL import Image
 import logging
 
+from .dct_steganography import grayscale_array
+
 logger = logging.getLogger(__name__)
 
 # Quantization step for robust embedding
 QUANT_STEP = 25
 
 
-def _embed_bits_in_subband(subband, bit_string, bit_index):
-    """Embed bits into a wavelet subband using QIM."""
-    for i in range(subband.shape[0]):
-        for j in range(subband.shape[1]):
-            if bit_index >= len(bit_string):
-                return bit_index
-            bit = int(bit_string[bit_index])
-            coeff = subband[i, j]
-            
-            quantized = round(coeff / QUANT_STEP) * QUANT_STEP
-            quant_index = round(coeff / QUANT_STEP)
-            if quant_index % 2 != bit:
-                if coeff > quantized:
-                    quantized += QUANT_STEP
-                else:
-                    quantized -= QUANT_STEP
-            
-            subband[i, j] = float(quantized)
-            bit_index += 1
-        if bit_index >= len(bit_string):
-            return bit_index
-    return bit_index
-
-
-def _extract_bits_from_subband(subband, bits, message_length_ref, total_bits_ref):
+def _embed_bits_in_subband(subband, bits, bit_index):
+    """Embed bits into a wavelet subband using QIM, row by row, in one pass."""
+    n = min(len(bits) - bit_index, subband.size)
+    if n <= 0:
+        return bit_index
+    
+    coeffs = subband.ravel()[:n]
+    quant_index = np.round(coeffs / QUANT_STEP)
+    quantized = quant_index * QUANT_STEP
+    
+    # Coefficients whose level has the wrong parity move one level over,
+    # towards the side the coefficient lies on
+    wrong = (quant_index % 2) != bits[bit_index:bit_index + n]
+    quantized[wrong] += np.where(coeffs[wrong] > quantized[wrong], QUANT_STEP, -QUANT_STEP)
+    
+    subband.flat[:n] = quantized
+    return bit_index + n
+
+
+def _extract_bits_from_subband(subband):
+    """Extract the QIM bits of a wavelet subband, row by row, as a uint8 array."""
+    return (np.round(subband / QUANT_STEP) % 2).astype(np.uint8).ravel()
+
+
+def _cover_array(image):
+    """Grayscale float64 pixels of an image, cropped to even dimensions."""
+    img_array = grayscale_array(image)
+
+    # Ensure dimensions are even
+    h, w = img_array.shape
+    return img_array[:h - h % 2, :w - w % 2]
+
+
+def haar_decompose(image):
     """
-    Extract bits from a wavelet subband using QIM.
-    Returns True if we should stop (got all bits or invalid length).
+    Single-level Haar DWT of a cover image, as encode_dwt computes it.
+
+    The transform depends only on the cover, so callers embedding several
+    messages into one image can compute it once and pass it to encode_dwt.
+
+    Args:
+        image (PIL.Image | np.ndarray): Input image, its H×W×3 RGB
+            pixels, or its grayscale pixels as an H×W array
+
+    Returns:
+        tuple: (cA, (cH, cV, cD)) as returned by pywt.dwt2
     """
-    for i in range(subband.shape[0]):
-        for j in range(subband.shape[1]):
-            coeff = subband[i, j]
-            quant_index = round(coeff / QUANT_STEP)
-            bit = quant_index % 2
-            bits.append(str(bit))
-            
-            # Check if we have 16 bits to read length
-            if len(bits) == 16 and message_length_ref[0] is None:
-                msg_len = int(''.join(bits[:16]), 2)
-                if msg_len == 0 or msg_len > 100000:
-                    message_length_ref[0] = 0
-                    return True  # invalid
-                message_length_ref[0] = msg_len
-                total_bits_ref[0] = 16 + (msg_len * 8)
-            
-            if total_bits_ref[0] and len(bits) >= total_bits_ref[0]:
-                return True  # got all bits
-        
-        if total_bits_ref[0] and len(bits) >= total_bits_ref[0]:
-            return True
-    return False
+    return pywt.dwt2(_cover_array(image), 'haar')
 
 
-def encode_dwt(image, message):
+def encode_dwt(image, message, coeffs=None):
     """
     ACTUAL DWT implementation - embeds in wavelet coefficients.
 
     Args:
-        image (PIL.Image): Input image
+        image (PIL.Image | np.ndarray): Input image, its H×W×3 RGB
+            pixels, or its grayscale pixels as an H×W array
         message (str): Secret message (UTF-8)
+        coeffs (tuple): haar_decompose(image), if already computed; it is
+            left unmodified
 
     Returns:
         PIL.Image: Encoded image with hidden message
 
     Raises:
-        ValueError: If message is too large for image capacity
+        ValueError: If message is too large for image capacity, or the
+            pixel array has an unsupported shape
     """
-    if image.mode != 'RGB':
-        image = image.convert('RGB')
-
-    gray = image.convert('L')
-    img_array = np.array(gray, dtype=np.float64)
-
-    h, w = img_array.shape
-
-    # Ensure dimensions are even
-    if h % 2 != 0:
-        h -= 1
-    if w % 2 != 0:
-        w -= 1
-    img_array = img_array[:h, :w]
+    if coeffs is None:
+        img_array = _cover_array(image)
+        h, w = img_array.shape
+    else:
+        cH = coeffs[1][0]
+        h, w = cH.shape[0] * 2, cH.shape[1] * 2
 
     # Message encoding
     if isinstance(message, (bytes, bytearray)):
@@ -125,30 +120,33 @@ def encode_dwt(image, message):
             f"Required image size: at least {int(np.sqrt(message_length * 8 * 2))}x{int(np.sqrt(message_length * 8 * 2))} pixels"
         )
 
-    # Prepare bit string
-    bit_string = format(message_length, '016b')
-    for byte in message_bytes:
-        bit_string += format(byte, '08b')
+    # Prepare bits: 16-bit length prefix + message bits, one bit per uint8
+    bits = np.unpackbits(np.frombuffer(message_length.to_bytes(2, 'big') + message_bytes, dtype=np.uint8))
 
     logger.info(f"DWT: Encoding {message_length} bytes")
-    logger.debug(f"DWT: Total bits: {len(bit_string)}, Subband capacity: {max_bits} bits")
+    logger.debug(f"DWT: Total bits: {len(bits)}, Subband capacity: {max_bits} bits")
 
     # Apply single-level Haar DWT
-    cA, (cH, cV, cD) = pywt.dwt2(img_array, 'haar')
+    if coeffs is None:
+        cA, (cH, cV, cD) = pywt.dwt2(img_array, 'haar')
+    else:
+        # Embedding writes into the detail bands; keep the caller's intact
+        cA, (cH, cV, cD) = coeffs
+        cH, cV, cD = cH.copy(), cV.copy(), cD.copy()
 
     # Embed bits using QIM in each subband
     bit_index = 0
     
     logger.debug(f"DWT: Embedding in cH ({cH.shape[0]}x{cH.shape[1]})")
-    bit_index = _embed_bits_in_subband(cH, bit_string, bit_index)
+    bit_index = _embed_bits_in_subband(cH, bits, bit_index)
     
-    if bit_index < len(bit_string):
+    if bit_index < len(bits):
         logger.debug(f"DWT: Embedding in cV ({cV.shape[0]}x{cV.shape[1]})")
-        bit_index = _embed_bits_in_subband(cV, bit_string, bit_index)
+        bit_index = _embed_bits_in_subband(cV, bits, bit_index)
     
-    if bit_index < len(bit_string):
+    if bit_index < len(bits):
         logger.debug(f"DWT: Embedding in cD ({cD.shape[0]}x{cD.shape[1]})")
-        bit_index = _embed_bits_in_subband(cD, bit_string, bit_index)
+        bit_index = _embed_bits_in_subband(cD, bits, bit_index)
 
     # Reconstruct image
     reconstructed = pywt.idwt2((cA, (cH, cV, cD)), 'haar')
@@ -172,46 +170,18 @@ def decode_dwt(image):
         str: Decoded message (empty string if extraction fails)
     """
     try:
-        if image.mode != 'RGB':
-            image = image.convert('RGB')
-
-        gray = image.convert('L')
-        img_array = np.array(gray, dtype=np.float64)
-
-        h, w = img_array.shape
-        if h % 2 != 0:
-            h -= 1
-        if w % 2 != 0:
-            w -= 1
-        img_array = img_array[:h, :w]
-
         # Apply single-level Haar DWT
-        cA, (cH, cV, cD) = pywt.dwt2(img_array, 'haar')
-
-        bits = []
-        # Use mutable references so the helper can update them
-        message_length_ref = [None]
-        total_bits_ref = [None]
-
-        # Extract from cH
-        done = _extract_bits_from_subband(cH, bits, message_length_ref, total_bits_ref)
-
-        # Extract from cV if needed
-        if not done and (total_bits_ref[0] is None or len(bits) < total_bits_ref[0]):
-            done = _extract_bits_from_subband(cV, bits, message_length_ref, total_bits_ref)
+        cA, (cH, cV, cD) = haar_decompose(image)
 
-        # Extract from cD if needed
-        if not done and (total_bits_ref[0] is None or len(bits) < total_bits_ref[0]):
-            done = _extract_bits_from_subband(cD, bits, message_length_ref, total_bits_ref)
+        # Bit stream runs through cH, then cV, then cD
+        bits = np.concatenate([_extract_bits_from_subband(band) for band in (cH, cV, cD)])
 
         # Validate
         if len(bits) < 16:
             logger.warning("DWT: Not enough bits extracted")
             return ""
 
-        message_length = message_length_ref[0]
-        if message_length is None:
-            message_length = int(''.join(bits[:16]), 2)
+        message_length = int.from_bytes(np.packbits(bits[:16]).tobytes(), 'big')
         
         logger.debug(f"DWT: Extracted message length = {message_length}")
 
@@ -225,10 +195,7 @@ def decode_dwt(image):
             return ""
 
         # Convert bits to bytes
-        message_bytes = bytearray()
-        for k in range(message_length):
-            byte_bits = ''.join(bits[16 + k*8 : 16 + (k+1)*8])
-            message_bytes.append(int(byte_bits, 2))
+        message_bytes = np.packbits(bits[16:total_bits_needed]).tobytes()
 
         decoded = message_bytes.decode('utf-8')
         logger.info(f"DWT: Successfully decoded {len(decoded)} characters")
@@ -43,7 +43,8 @@ def encode_image(img, secret_text, filter_type="None"):
     Encode secret message into image using LSB steganography.
     
     Args:
-        img (PIL.Image): Input image
+        img (PIL.Image | np.ndarray): Input image, or its pixels as an
+            H×W×3 uint8 RGB array (left unmodified)
         secret_text (str): Message to encode
         filter_type (str): Filter type ('None', 'Blur', 'Sharpen', 'Grayscale')
     
@@ -51,17 +52,30 @@ def encode_image(img, secret_text, filter_type="None"):
         PIL.Image: Encoded image
     
     Raises:
-        ValueError: If message is too large for image
+        ValueError: If message is too large for image, or the pixel array
+            is not H×W×3
     """
-    # Apply optional filter
-    img = apply_filter(img, filter_type)
-    
-    # Convert to RGB if necessary
-    if img.mode != 'RGB':
-        img = img.convert('RGB')
+    if isinstance(img, np.ndarray):
+        # Same meaning as for the DCT/DWT encoders; LSB writes into all
+        # three channels, so it cannot take their H×W grayscale shortcut
+        if img.ndim != 3 or img.shape[2] != 3:
+            raise ValueError(f"LSB needs H×W×3 RGB pixels, got shape {img.shape}")
+        if filter_type != "None":
+            img = Image.fromarray(img, 'RGB')
+    
+    if isinstance(img, np.ndarray):
+        img_array = img
+    else:
+        # Apply optional filter
+        img = apply_filter(img, filter_type)
+        
+        # Convert to RGB if necessary
+        if img.mode != 'RGB':
+            img = img.convert('RGB')
+        
+        img_array = np.asarray(img)
     
     # Calculate capacity
-    img_array = np.array(img)
     max_bytes = img_array.size // 8  # Total bits / 8
     
     # Encode message as UTF-8 bytes
@@ -79,24 +93,21 @@ def encode_image(img, secret_text, filter_type="None"):
             f"got: {message_length} bytes"
         )
     
-    # Flatten image array
+    # Flatten into a writable copy; the source pixels are never modified
     flat = img_array.flatten()
     
-    # Prepare bit string: 16-bit length prefix + message bits
-    bit_string = format(message_length, '016b')  # 16-bit length
-    for byte in secret_bytes:
-        bit_string += format(byte, '08b')
-    
-    # Add terminator (optional, helps with decoding)
-    bit_string += '11111110'
+    # Prepare bits: 16-bit length prefix + message bits + terminator
+    # (optional, helps with decoding), one bit per uint8
+    length_bits = np.frombuffer(format(message_length, '016b').encode('ascii'), dtype=np.uint8) - ord('0')
+    payload_bits = np.unpackbits(np.frombuffer(secret_bytes + b'\xfe', dtype=np.uint8))
+    bits = np.concatenate((length_bits, payload_bits))[:len(flat)]
     
-    # Embed bits into LSBs
-    for i, bit in enumerate(bit_string):
-        if i < len(flat):
-            flat[i] = (flat[i] & 0xFE) | int(bit)  # Replace LSB
+    # Embed bits into LSBs: one branchless mask-and-set over the whole prefix
+    flat[:len(bits)] = (flat[:len(bits)] & 0xFE) | bits
     
-    # Reshape and convert back to image
-    encoded_array = flat.reshape(img_array.shape).astype(np.uint8)
+    # Reshape and convert back to image (already uint8 for image input,
+    # so no second copy is made)
+    encoded_array = flat.reshape(img_array.shape).astype(np.uint8, copy=False)
     encoded_img = Image.fromarray(encoded_array, 'RGB')
     
     return encoded_img
@@ -116,32 +127,27 @@ def decode_image(img):
     if img.mode != 'RGB':
         img = img.convert('RGB')
     
-    # Convert image to array
-    img_array = np.array(img)
-    flat = img_array.flatten()
+    # Read-only view of the pixels; decoding never writes to them
+    img_array = np.asarray(img)
+    flat = img_array.reshape(-1)
     
-    # Extract bits
-    bits = ''.join(str(pixel & 1) for pixel in flat)
-    
-    # Extract message length (first 16 bits)
-    if len(bits) < 16:
+    # Probe the 16-bit length header first so images without a message
+    # are rejected without walking every pixel
+    if flat.size < 16:
         return ''
     
-    message_length = int(bits[:16], 2)
+    header = np.packbits(flat[:16] & 1)
+    message_length = (int(header[0]) << 8) | int(header[1])
     
     # Check if message length is valid
-    if message_length == 0 or message_length > len(bits) // 8:
+    if message_length == 0 or message_length > flat.size // 8:
         return ''
     
-    # Extract message bits
-    message_bits = bits[16 : 16 + (message_length * 8)]
-    
-    # Convert bits to bytes
-    message_bytes = bytearray()
-    for i in range(0, len(message_bits), 8):
-        byte_bits = message_bits[i : i + 8]
-        if len(byte_bits) == 8:
-            message_bytes.append(int(byte_bits, 2))
+    # Extract only the message bits and pack them 8 at a time
+    # (a trailing partial byte is dropped)
+    message_bits = flat[16 : 16 + (message_length * 8)] & 1
+    whole_bits = len(message_bits) - len(message_bits) % 8
+    message_bytes = bytearray(np.packbits(message_bits[:whole_bits]).tobytes())
     
     # Decode from UTF-8
     try:
@@ -16,8 +16,10 @@ def detect_encoding_method(image):
     """
     Auto-detect which steganography method was used.
     
-    Strategy: Try actual decoding with each method (with timeout logic).
-    Return the first method that produces a valid message.
+    Strategy: Images whose LSB framing matches and whose LSB payload
+    decodes to a valid message are dispatched straight to LSB. Otherwise
+    try actual decoding with each method and return the one that
+    produces the most plausible message.
     """
     if image.mode != 'RGB':
         image = image.convert('RGB')
@@ -32,6 +34,11 @@ def detect_encoding_method(image):
     try:
         decoded = lsb_decode(image)
         if _is_valid_message(decoded):
+            # The framing alone can match DCT/DWT output by chance, so
+            # only trust it once the LSB payload itself decodes cleanly.
+            if sniff_method(image) == 'LSB':
+                logger.info("✓ Detected: LSB method (framing)")
+                return 'LSB'
             logger.info("✓ Detected: LSB method")
             results['LSB'] = decoded
     except Exception as e:
@@ -70,6 +77,77 @@ def detect_encoding_method(image):
     return 'LSB'
 
 
+def sniff_method(image):
+    """
+    Cheaply identify an LSB-encoded image from its embedded framing.
+    
+    The LSB encoder writes a 16-bit length header, the message and a
+    0xFE terminator byte. Only the pixels holding those header and
+    terminator bits are read, so this costs a few pixel lookups instead
+    of a full decode. A match is a hint, not proof: DCT/DWT output can
+    carry the same framing by chance.
+    
+    Args:
+        image (PIL.Image): Image to inspect
+    
+    Returns:
+        str | None: 'LSB' if the framing matches, otherwise None
+    """
+    if image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGB')
+    
+    total_bits = image.width * image.height * 3
+    if total_bits < 16:
+        return None
+    
+    message_length = int.from_bytes(np.packbits(_read_lsbs(image, 0, 16)).tobytes(), 'big')
+    terminator_start = 16 + message_length * 8
+    if message_length == 0 or terminator_start + 8 > total_bits:
+        return None
+    
+    terminator = np.packbits(_read_lsbs(image, terminator_start, 8))[0]
+    return 'LSB' if terminator == 0xFE else None
+
+
+def read_framed_lsb_message(image):
+    """
+    Decode an LSB message only if the framing and the payload both check out.
+    
+    The framing alone can match DCT/DWT output by chance, so the decoded
+    payload must also look like a real message.
+    
+    Args:
+        image (PIL.Image): Image to inspect
+    
+    Returns:
+        str | None: The LSB message, or None if the image is not LSB-encoded
+    """
+    if sniff_method(image) != 'LSB':
+        return None
+    
+    from src.stego.lsb_steganography import decode_image as lsb_decode
+    try:
+        decoded = lsb_decode(image)
+    except Exception as e:
+        logger.debug(f"LSB decode failed: {e}")
+        return None
+    return decoded if _is_valid_message(decoded) else None
+
+
+def _read_lsbs(image, start, count):
+    """Read `count` channel LSBs starting at flat RGB index `start`."""
+    width = image.width
+    first_pixel = start // 3
+    last_pixel = (start + count - 1) // 3
+    
+    channels = []
+    for p in range(first_pixel, last_pixel + 1):
+        channels.extend(image.getpixel((p % width, p // width))[:3])
+    
+    offset = start - first_pixel * 3
+    return np.array(channels[offset:offset + count], dtype=np.uint8) & 1
+
+
 def _message_quality_score(text):
     """Score a decoded message by how 'real' it looks."""
     if not text:
@@ -6,12 +6,14 @@ Includes Lottie animations, caching, and session state management.
 """
 
 import streamlit as st
+import numpy as np
 from io import BytesIO
 from PIL import Image
 from datetime import datetime
 import logging
 import requests
 
+from src.batch_processing.batch_encoder import PNG_COMPRESS_LEVEL
 from .config_dict import (
     FORM_LABELS, FILE_UPLOAD_CONFIG, ERROR_MESSAGES, SUCCESS_MESSAGES,
     BUTTON_LABELS, METHODS, METHOD_DETAILS, COLUMN_LAYOUTS, METRIC_LABELS,
@@ -20,6 +22,9 @@ from .config_dict import (
 
 logger = logging.getLogger(__name__)
 
+# Largest thumbnail edge sent to the browser for upload previews
+PREVIEW_MAX_SIZE = (768, 768)
+
 
 # ============================================================================
 #                           LOTTIE ANIMATIONS
@@ -105,6 +110,89 @@ def init_session_state():
             st.session_state[key] = default_value
 
 
+@st.cache_resource(max_entries=16, show_spinner=False)
+def load_image(file_bytes: bytes) -> Image.Image:
+    """
+    Decode an uploaded image once per distinct upload.
+    
+    The decoded image is shared across reruns and sections, so callers
+    must treat it as read-only (convert/copy before modifying).
+    
+    Args:
+        file_bytes: Raw contents of the uploaded file
+    
+    Returns:
+        PIL.Image: Fully loaded image with its original mode and format
+    """
+    image = Image.open(BytesIO(file_bytes))
+    image.load()
+    return image
+
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def load_preview(file_bytes: bytes, max_size=PREVIEW_MAX_SIZE) -> tuple:
+    """
+    Build an on-screen preview of an upload, once per distinct upload.
+    
+    Reruns get back the same PNG bytes, so st.image neither re-decodes
+    the original nor re-encodes a preview. JPEGs are decoded at a reduced
+    DCT scale via draft(); other formats ignore it.
+    
+    Args:
+        file_bytes: Raw contents of the uploaded file
+        max_size: Bounding box for the thumbnail
+    
+    Returns:
+        tuple: (png_bytes, (size, mode, format)) with the original's info
+    """
+    with Image.open(BytesIO(file_bytes)) as image:
+        info = (image.size, image.mode, image.format or "Unknown")
+        image.draft("RGB", max_size)
+        thumb = image.convert("RGBA" if image.mode in ("RGBA", "LA", "PA", "P") else "RGB")
+    thumb.thumbnail(max_size)
+    return encode_png(thumb, BytesIO()), info
+
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def load_rgb_array(file_bytes: bytes) -> np.ndarray:
+    """
+    Decode an uploaded image to an RGB array, once per distinct upload.
+    
+    Args:
+        file_bytes: Raw contents of the uploaded file
+    
+    Returns:
+        np.ndarray: HxWx3 uint8 array
+    """
+    image = Image.open(BytesIO(file_bytes))
+    # convert() copies even when the mode already matches
+    if image.mode != "RGB":
+        image = image.convert("RGB")
+    return np.array(image)
+
+
+def get_png_buffer() -> BytesIO:
+    """Return this session's reusable serialization buffer, emptied."""
+    buf = st.session_state.setdefault("_png_buf", BytesIO())
+    buf.seek(0)
+    buf.truncate()
+    return buf
+
+
+def encode_png(image: Image.Image, buf: BytesIO = None) -> bytes:
+    """
+    Serialize an image to PNG once, for its preview and its download alike.
+    
+    PNG is lossless, so a fast zlib level only trades a little file size
+    for save time. buf defaults to this session's reusable buffer; cached
+    functions pass their own so their result never depends on the session.
+    """
+    if buf is None:
+        buf = get_png_buffer()
+    image.save(buf, format="PNG", compress_level=PNG_COMPRESS_LEVEL)
+    return buf.getvalue()
+
+
 def store_processed_image(key: str, image: Image.Image):
     """Store a processed image in session state."""
     if "processed_images" not in st.session_state:
@@ -148,7 +236,8 @@ def create_text_input(label, placeholder="", password=False, key=None, max_chars
         label=label,
         placeholder=placeholder,
         type=input_type,
-        key=key
+        key=key,
+        max_chars=max_chars
     )
 
 
@@ -303,16 +392,13 @@ def display_image_comparison(original_img, encoded_img, method=""):
                 <div class="image-label">🔐 Encoded Image</div>
             </div>
         """, unsafe_allow_html=True)
-        st.image(encoded_img, use_container_width=True)
+        png_bytes = encode_png(encoded_img)
         
-        # Download button
-        buf = BytesIO()
-        encoded_img.save(buf, format="PNG")
-        buf.seek(0)
+        st.image(png_bytes, use_container_width=True)
         
         st.download_button(
             label="⬇️ Download Encoded Image",
-            data=buf.getvalue(),
+            data=png_bytes,
             file_name=DOWNLOAD_FILENAMES["encoded_image"].format(
                 method=method.replace(' ', '_').lower()
             ),
@@ -533,8 +619,8 @@ def show_activity_search(dataframe):
         
         if search_term and not dataframe.empty:
             filtered_df = dataframe[
-                dataframe['Action'].str.contains(search_term, case=False, na=False) |
-                dataframe['Details'].str.contains(search_term, case=False, na=False)
+                dataframe['Action'].str.contains(search_term, case=False, na=False, regex=False) |
+                dataframe['Details'].str.contains(search_term, case=False, na=False, regex=False)
             ]
             st.dataframe(filtered_df, use_container_width=True)
         elif search_term:
@@ -546,11 +632,18 @@ def create_sections_menu(sections):
     return st.radio("Select Section", options=sections, horizontal=True)
 
 
-def render_step(step_number, title):
-    """Render a step header with number."""
+def render_step(step_number, title, card_class=None):
+    """
+    Render a step header with number.
+    
+    If card_class is given, the card opening tag goes out in the same
+    markdown element, so it costs one frontend element instead of two.
+    """
+    card_html = f'<div class="{card_class}">' if card_class else ""
     st.markdown(f"""
         <div class="step-indicator animate-fade-in">
             <div class="step-number">{step_number}</div>
             <div class="step-title">{title}</div>
         </div>
+        {card_html}
     """, unsafe_allow_html=True)
\ No newline at end of file
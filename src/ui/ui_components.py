@@ -5,34 +5,73 @@ Contains the main section components for the application interface.
 Professional SaaS-style design with consistent styling across all tabs.
 """
 
+import gc
+import hashlib
+import hmac
 import logging
+import multiprocessing
+import os
+import secrets
+import shutil
+import tempfile
 import time
-import pandas as pd
-import numpy as np
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from io import BytesIO
-from PIL import Image
+from itertools import islice
 import streamlit as st
 
 from src.stego.lsb_steganography import encode_image as lsb_encode, decode_image as lsb_decode
 from src.stego.dct_steganography import encode_dct as dct_encode, decode_dct as dct_decode
-from src.stego.dwt_steganography import encode_dwt as dwt_encode, decode_dwt as dwt_decode
+from src.stego.dwt_steganography import encode_dwt as dwt_encode, decode_dwt as dwt_decode, haar_decompose
 from src.encryption.encryption import encrypt_message, decrypt_message
-from src.db.db_utils import log_activity
+from src.stego.method_detection import sniff_method
+from src.batch_processing.batch_encoder import encode_image_bytes, decode_image_bytes
+from src.comparison.comparison_logic import encode_all_methods, COMPARISON_METHODS
+from src.db.db_utils import verify_user, add_user, log_activity_async, MIN_PASSWORD_LENGTH
 from src.Watermarking.ui_section import show_watermarking_section as _show_watermarking_section
 from .reusable_components import (
-    create_text_input, create_text_area, create_file_uploader,
+    create_file_uploader,
     create_method_selector, create_checkbox, show_error, show_success,
     show_warning, show_info, display_image_comparison, display_decoded_message,
     create_primary_button, display_results_summary, show_divider,
     show_method_details, create_comparison_table, show_activity_search,
     create_batch_upload_section, create_batch_options_section,
     display_batch_results, display_detailed_results, render_step,
-    show_lottie_animation, create_metric_cards
+    show_lottie_animation, create_metric_cards, load_image, load_rgb_array, load_preview,
+    encode_png
 )
 from .config_dict import FORM_LABELS, SECTION_HEADERS, TAB_NAMES, ERROR_MESSAGES, SUCCESS_MESSAGES
 
 logger = logging.getLogger(__name__)
 
+# Auth form labels, resolved once at import rather than on every rerun
+USERNAME_LABEL = FORM_LABELS["username"]["label"]
+PASSWORD_LABEL = FORM_LABELS["password"]["label"]
+CONFIRM_PASSWORD_LABEL = FORM_LABELS["confirm_password"]["label"]
+
+# Force a garbage collection after this many batch images
+BATCH_GC_INTERVAL = 16
+# Batch progress widgets refresh every total/BATCH_PROGRESS_UPDATES files,
+# or after BATCH_PROGRESS_INTERVAL seconds without a refresh
+BATCH_PROGRESS_UPDATES = 200
+BATCH_PROGRESS_INTERVAL = 0.1
+# Batch uploads are copied to a temp directory in chunks of this size
+BATCH_SPOOL_CHUNK_SIZE = 1 << 20
+# Batch workers are spawned, not forked: forking the threaded Streamlit
+# server can deadlock a child on a lock another thread held at fork time
+_BATCH_MP_CONTEXT = multiprocessing.get_context("spawn")
+
+# st.fragment needs Streamlit 1.37+; older releases rerun the whole page
+_fragment = getattr(st, "fragment", lambda func: func)
+
+# Optional error-correction UI (module 6), imported once at load time
+try:
+    from stegotool.modules.module6_redundancy import ui_section as ecc_ui
+    ECC_IMPORT_ERROR = None
+except ImportError as e:
+    ecc_ui = None
+    ECC_IMPORT_ERROR = e
+
 # Configure logging
 logging.basicConfig(
     level=logging.DEBUG,
@@ -51,6 +90,27 @@ def is_valid_message(message):
     return len(message.strip()) > 0
 
 
+def _ecc_module():
+    """Return the error-correction UI module, or raise ImportError if unavailable."""
+    if ecc_ui is None:
+        raise ImportError(f"ECC module not available: {ECC_IMPORT_ERROR}")
+    return ecc_ui
+
+
+def _result_key(image_file, *params):
+    """
+    Fingerprint an uploaded image together with the settings applied to it.
+    
+    The settings include the encryption password, so the digest is an HMAC
+    under a random per-session key rather than a bare hash that could be
+    brute-forced offline.
+    """
+    key = st.session_state.setdefault("_result_key_secret", secrets.token_bytes(32))
+    digest = hmac.new(key, image_file.getvalue(), hashlib.sha256)
+    digest.update(repr(params).encode())
+    return digest.hexdigest()
+
+
 def render_card(content, card_type="default", header=None):
     """Render a styled card container."""
     card_class = f"card card-{card_type}" if card_type != "default" else "card"
@@ -130,29 +190,21 @@ def _show_login_form():
     with st.form("login_form"):
         st.markdown("#### Sign in to your account")
         
-        username = create_text_input(
-            label="Username",
-            placeholder="Enter your username"
-        )
-        password = create_text_input(
-            label="Password",
-            placeholder="Enter your password",
-            password=True
-        )
+        username = st.text_input(USERNAME_LABEL, placeholder="Enter your username")
+        password = st.text_input(PASSWORD_LABEL, placeholder="Enter your password", type="password")
         
+        # Typing does not rerun the form, so the password hash runs once
+        # per submitted sign-in; it is never cached across attempts
         if st.form_submit_button("🔓 Sign In", use_container_width=True, type="primary"):
             if username and password:
                 with st.spinner("Signing in..."):
                     try:
-                        from src.db.db_utils import verify_user
                         user_data = verify_user(username, password)
                         
                         if user_data:
                             st.session_state.logged_in = True
                             st.session_state.username = user_data['username']
                             st.session_state.user_id = user_data['user_id']
-                            show_success("Welcome back!")
-                            time.sleep(0.5)
                             st.rerun()
                         else:
                             show_error("Invalid username or password")
@@ -171,19 +223,10 @@ def _show_register_form():
     with st.form("register_form"):
         st.markdown("#### Create a new account")
         
-        username = create_text_input(
-            label="Username",
-            placeholder="Choose a username"
-        )
-        password = create_text_input(
-            label="Password",
-            placeholder="Create a strong password",
-            password=True
-        )
-        confirm_password = create_text_input(
-            label="Confirm Password",
-            placeholder="Confirm your password",
-            password=True
+        username = st.text_input(USERNAME_LABEL, placeholder="Choose a username")
+        password = st.text_input(PASSWORD_LABEL, placeholder="Create a strong password", type="password")
+        confirm_password = st.text_input(
+            CONFIRM_PASSWORD_LABEL, placeholder="Confirm your password", type="password"
         )
         
         if st.form_submit_button("📝 Create Account", use_container_width=True, type="primary"):
@@ -191,12 +234,11 @@ def _show_register_form():
                 show_error("Please fill all fields")
             elif password != confirm_password:
                 show_error("Passwords do not match")
-            elif len(password) < 6:
-                show_error("Password must be at least 6 characters")
+            elif len(password) < MIN_PASSWORD_LENGTH:
+                show_error(f"Password must be at least {MIN_PASSWORD_LENGTH} characters")
             else:
                 with st.spinner("Creating account..."):
                     try:
-                        from src.db.db_utils import add_user
                         add_user(username, password)
                         show_success("Account created! You can now sign in.")
                     except Exception as e:
@@ -209,6 +251,7 @@ def _show_register_form():
 #                           ENCODE SECTION
 # ============================================================================
 
+@_fragment
 def show_encode_section():
     """Display encoding interface with professional styling."""
     
@@ -224,23 +267,20 @@ def show_encode_section():
         
         with col1:
             # Step 1: Upload Image
-            render_step(1, "Upload Your Image")
-            
-            st.markdown('<div class="card animate-fade-in">', unsafe_allow_html=True)
+            render_step(1, "Upload Your Image", card_class="card animate-fade-in")
             
             image_file = create_file_uploader(file_type="images", key="encode_image")
             
             if image_file:
                 try:
-                    original_image = Image.open(image_file)
-                    st.image(original_image, caption="Selected Image", use_container_width=True)
+                    preview, (size, mode, file_format) = load_preview(image_file.getvalue())
+                    st.image(preview, caption="Selected Image", use_container_width=True)
                     
                     # Image info
-                    file_format = original_image.format or "Unknown"
                     st.markdown(f"""
                         <div class="card card-info" style="margin-top: 0.5rem; padding: 0.75rem;">
-                            📐 <strong>{original_image.size[0]}×{original_image.size[1]}</strong> | 
-                            🎨 <strong>{original_image.mode}</strong> | 
+                            📐 <strong>{size[0]}×{size[1]}</strong> | 
+                            🎨 <strong>{mode}</strong> | 
                             📁 <strong>{file_format}</strong>
                         </div>
                     """, unsafe_allow_html=True)
@@ -262,26 +302,33 @@ def show_encode_section():
             st.markdown('</div>', unsafe_allow_html=True)
             
             # Step 2: Enter Message
-            render_step(2, "Enter Your Secret Message")
+            render_step(2, "Enter Your Secret Message", card_class="card animate-fade-in stagger-1")
+            
+            # Typing in a form doesn't rerun the script; only the submit does
+            with st.form("encode_form", border=False):
+                message = st.text_area(
+                    "Secret Message",
+                    placeholder="Type your secret message here...",
+                    height=150,
+                    max_chars=5000,
+                    key="encode_message"
+                )
+                encode_btn = st.form_submit_button(
+                    "🔐 Encode Message",
+                    use_container_width=True,
+                    type="primary",
+                    disabled=not image_file
+                )
             
-            st.markdown('<div class="card animate-fade-in stagger-1">', unsafe_allow_html=True)
-            message = st.text_area(
-                "Secret Message",
-                placeholder="Type your secret message here...",
-                height=150,
-                max_chars=5000,
-                key="encode_message"
-            )
             if message:
                 st.caption(f"📝 {len(message)} characters")
                 
                 # Check capacity warning (if file exists)
                 if image_file:
                     try:
-                        from stegotool.modules.module6_redundancy.ui_section import check_capacity_and_warn
-                        original_image = Image.open(image_file)
+                        original_image = load_image(image_file.getvalue())
                         ecc_config = st.session_state.get('ecc_config', {'use_ecc': False, 'ecc_strength': 32})
-                        check_capacity_and_warn(
+                        _ecc_module().check_capacity_and_warn(
                             original_image.size,
                             message,
                             use_ecc=ecc_config.get('use_ecc', False),
@@ -293,72 +340,13 @@ def show_encode_section():
             st.markdown('</div>', unsafe_allow_html=True)
         
         with col2:
-            # Step 3: Settings
-            render_step(3, "Configure Settings")
-            
-            st.markdown('<div class="card animate-fade-in stagger-2">', unsafe_allow_html=True)
-            
-            method = create_method_selector(key="encode_method")
-            
-            # Method info
-            method_info = {
-                "LSB": ("⚡ Fast", "Spatial domain", "#238636"),
-                "Hybrid DCT": ("🛡️ Secure", "Frequency domain", "#1F6FEB"),
-                "Hybrid DWT": ("🔐 Robust", "Wavelet domain", "#8957E5")
-            }
-            info = method_info.get(method, ("", "", "#8B949E"))
-            st.markdown(f"""
-                <div style="padding: 0.5rem; background: rgba(0,0,0,0.2); border-radius: 6px; border-left: 3px solid {info[2]};">
-                    <strong>{info[0]}</strong> - {info[1]}
-                </div>
-            """, unsafe_allow_html=True)
-            
-            st.markdown('</div>', unsafe_allow_html=True)
-            
-            # Step 4: Encryption
-            render_step(4, "Security Options")
-            
-            st.markdown('<div class="card animate-fade-in stagger-3">', unsafe_allow_html=True)
-            
-            use_encryption = st.checkbox("🔒 Encrypt message (recommended)", key="encode_encrypt")
-            encryption_password = None
-            
-            if use_encryption:
-                encryption_password = st.text_input(
-                    "Encryption Password",
-                    type="password",
-                    placeholder="Create a strong password",
-                    key="encode_encryption_pass"
-                )
-                st.caption("🔐 AES-256 encryption will be applied")
-            
-            st.markdown('</div>', unsafe_allow_html=True)
-            
-            # Step 5: ECC
-            ecc_config = {'use_ecc': False, 'ecc_strength': 32}
-            try:
-                from stegotool.modules.module6_redundancy.ui_section import show_ecc_encode_section
-                ecc_config = show_ecc_encode_section()
-            except (ImportError, Exception) as e:
-                logger.debug(f"ECC section not available: {e}")
-                st.markdown('<div class="card animate-fade-in stagger-4">', unsafe_allow_html=True)
-                st.markdown('<p style="color: #8B949E; font-size: 0.9rem;">ℹ️ Error Correction not available</p>', 
-                            unsafe_allow_html=True)
-                st.markdown('</div>', unsafe_allow_html=True)
-            
-            st.session_state['ecc_config'] = ecc_config
-            
-            # Encode Button
-            st.markdown("<br>", unsafe_allow_html=True)
-            
-            encode_btn = st.button(
-                "🔐 Encode Message",
-                use_container_width=True,
-                type="primary",
-                disabled=not (image_file and message)
-            )
-            
-            if encode_btn:
+            method, use_encryption, encryption_password, ecc_config = _encode_settings_panel()
+        
+        # Runs after both columns so the settings above are already read
+        if encode_btn:
+            if not message:
+                show_warning("Please enter a message to encode.")
+            else:
                 _perform_encoding(
                     image_file, 
                     message, 
@@ -385,9 +373,107 @@ def show_encode_section():
         _show_encode_help()
 
 
+@_fragment
+def _encode_settings_panel():
+    """
+    Method, encryption and ECC settings for the encode tab.
+    
+    A fragment, so changing a setting reruns only this panel instead of
+    the whole page; the values are picked up on the next full run.
+    """
+    # Step 3: Settings
+    render_step(3, "Configure Settings", card_class="card animate-fade-in stagger-2")
+    
+    method = create_method_selector(key="encode_method")
+    
+    # Method info
+    method_info = {
+        "LSB": ("⚡ Fast", "Spatial domain", "#238636"),
+        "Hybrid DCT": ("🛡️ Secure", "Frequency domain", "#1F6FEB"),
+        "Hybrid DWT": ("🔐 Robust", "Wavelet domain", "#8957E5")
+    }
+    info = method_info.get(method, ("", "", "#8B949E"))
+    st.markdown(f"""
+        <div style="padding: 0.5rem; background: rgba(0,0,0,0.2); border-radius: 6px; border-left: 3px solid {info[2]};">
+            <strong>{info[0]}</strong> - {info[1]}
+        </div>
+    """, unsafe_allow_html=True)
+    
+    st.markdown('</div>', unsafe_allow_html=True)
+    
+    # Step 4: Encryption
+    render_step(4, "Security Options", card_class="card animate-fade-in stagger-3")
+    
+    use_encryption = st.checkbox("🔒 Encrypt message (recommended)", key="encode_encrypt")
+    encryption_password = None
+    
+    if use_encryption:
+        encryption_password = st.text_input(
+            "Encryption Password",
+            type="password",
+            placeholder="Create a strong password",
+            key="encode_encryption_pass"
+        )
+        st.caption("🔐 AES-256 encryption will be applied")
+    
+    st.markdown('</div>', unsafe_allow_html=True)
+    
+    # Step 5: ECC
+    ecc_config = {'use_ecc': False, 'ecc_strength': 32}
+    try:
+        ecc_config = _ecc_module().show_ecc_encode_section()
+    except (ImportError, Exception) as e:
+        logger.debug(f"ECC section not available: {e}")
+        st.markdown('<div class="card animate-fade-in stagger-4">', unsafe_allow_html=True)
+        st.markdown('<p style="color: #8B949E; font-size: 0.9rem;">ℹ️ Error Correction not available</p>', 
+                    unsafe_allow_html=True)
+        st.markdown('</div>', unsafe_allow_html=True)
+    
+    st.session_state['ecc_config'] = ecc_config
+    return method, use_encryption, encryption_password, ecc_config
+
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def _cached_haar_decompose(file_bytes: bytes):
+    """
+    Haar DWT of an uploaded cover, shared by every DWT encode into it.
+    
+    Each encryption run uses a fresh salt, so the payload (and with it
+    _cached_encode's key) changes on every press; the cover does not.
+    """
+    return haar_decompose(load_image(file_bytes))
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def _cached_encode(file_bytes: bytes, payload, method: str):
+    """
+    Encoded image and its PNG bytes for an upload, payload and method.
+    
+    Encoding the same payload again, e.g. after switching methods back
+    and forth, reuses the earlier embedding and PNG compression.
+    """
+    original_image = load_image(file_bytes)
+    
+    # Stego functions accept both str and bytes
+    if method == "Hybrid DCT":
+        encoded_image = dct_encode(original_image, payload)
+    elif method == "Hybrid DWT":
+        encoded_image = dwt_encode(original_image, payload, coeffs=_cached_haar_decompose(file_bytes))
+    else:
+        encoded_image = lsb_encode(original_image, payload)
+    
+    return encoded_image, encode_png(encoded_image, BytesIO())
+
+
 def _perform_encoding(image_file, message, method, use_encryption, encryption_password,
                      use_ecc=False, ecc_strength=32):
     """Perform the encoding operation with optional ECC."""
+    result_key = _result_key(image_file, message, method, use_encryption,
+                             encryption_password, use_ecc, ecc_strength)
+    if st.session_state.get("last_encode", {}).get("key") == result_key:
+        show_success("Already encoded with these settings — see the Results tab.")
+        return
+    
     try:
         progress = st.progress(0)
         status = st.empty()
@@ -395,7 +481,7 @@ def _perform_encoding(image_file, message, method, use_encryption, encryption_pa
         status.text("Loading image...")
         progress.progress(10)
         
-        original_image = Image.open(image_file)
+        original_image = load_image(image_file.getvalue())
         file_format = original_image.format
         
         # Check compatibility
@@ -420,9 +506,7 @@ def _perform_encoding(image_file, message, method, use_encryption, encryption_pa
             progress.progress(40)
             
             try:
-                from stegotool.modules.module6_redundancy.ui_section import encode_message_with_ecc
-                
-                message_to_embed = encode_message_with_ecc(
+                message_to_embed = _ecc_module().encode_message_with_ecc(
                     message_to_embed,
                     use_ecc=True,
                     nsym=ecc_strength
@@ -438,15 +522,9 @@ def _perform_encoding(image_file, message, method, use_encryption, encryption_pa
         status.text(f"Encoding with {method}...")
         progress.progress(60)
         
-        # Stego functions now accept both str and bytes
-        if method == "LSB":
-            encoded_image = lsb_encode(original_image, message_to_embed)
-        elif method == "Hybrid DCT":
-            encoded_image = dct_encode(original_image, message_to_embed)
-        elif method == "Hybrid DWT":
-            encoded_image = dwt_encode(original_image, message_to_embed)
-        else:
-            encoded_image = lsb_encode(original_image, message_to_embed)
+        if isinstance(message_to_embed, bytearray):
+            message_to_embed = bytes(message_to_embed)
+        encoded_image, png_bytes = _cached_encode(image_file.getvalue(), message_to_embed, method)
         
         status.text("Finalizing...")
         progress.progress(90)
@@ -459,6 +537,8 @@ def _perform_encoding(image_file, message, method, use_encryption, encryption_pa
         st.session_state.last_encode_ecc = use_ecc
         st.session_state.last_encode_nsym = ecc_strength
         
+        st.session_state.last_encode = {"key": result_key, "png": png_bytes}
+        
         progress.progress(100)
         status.empty()
         progress.empty()
@@ -466,7 +546,7 @@ def _perform_encoding(image_file, message, method, use_encryption, encryption_pa
         # Log activity
         ecc_info = f" (ECC: {ecc_strength} bytes)" if use_ecc else ""
         if hasattr(st.session_state, 'user_id') and st.session_state.user_id:
-            log_activity(st.session_state.user_id, "ENCODE", f"Encoded with {method}{ecc_info}")
+            log_activity_async(st.session_state.user_id, "ENCODE", f"Encoded with {method}{ecc_info}")
         
         show_success(f"Message encoded successfully! (ECC: {'ON' if use_ecc else 'OFF'})")
         
@@ -477,7 +557,6 @@ def _perform_encoding(image_file, message, method, use_encryption, encryption_pa
 
 def _display_encode_results():
     """Display encoding results with detection method info."""
-    encoded = st.session_state.last_encoded_image
     original = st.session_state.get("last_original_image")
     method = st.session_state.get("last_encode_method", "Unknown")
     encrypted = st.session_state.get("last_encode_encrypted", False)
@@ -504,7 +583,8 @@ def _display_encode_results():
     with col2:
         st.markdown('<div class="card card-success">', unsafe_allow_html=True)
         st.markdown("**🔐 Encoded Image**")
-        st.image(encoded, use_container_width=True)
+        # The PNG built for the download; st.image serves bytes as-is
+        st.image(st.session_state.last_encode["png"], use_container_width=True)
         st.markdown('</div>', unsafe_allow_html=True)
     
     # Info metrics
@@ -522,13 +602,9 @@ def _display_encode_results():
     # Download button
     st.divider()
     
-    buf = BytesIO()
-    encoded.save(buf, format="PNG")
-    buf.seek(0)
-    
     st.download_button(
         label="⬇️ Download Encoded Image",
-        data=buf.getvalue(),
+        data=st.session_state.last_encode["png"],
         file_name=f"encoded_{method.lower().replace(' ', '_')}.png",
         mime="image/png",
         use_container_width=True,
@@ -733,6 +809,7 @@ def _show_decode_help():
 #                           DECODE SECTION
 # ============================================================================
 
+@_fragment
 def show_decode_section():
     """Display decoding interface with ECC recovery."""
     
@@ -746,21 +823,18 @@ def show_decode_section():
         col1, col2 = st.columns([1.2, 0.8])
         
         with col1:
-            render_step(1, "Upload Encoded Image")
-            
-            st.markdown('<div class="card animate-fade-in">', unsafe_allow_html=True)
+            render_step(1, "Upload Encoded Image", card_class="card animate-fade-in")
             
             image_file = create_file_uploader(file_type="images", key="decode_image")
             
             if image_file:
                 try:
-                    image = Image.open(image_file)
-                    st.image(image, caption="Uploaded Image", use_container_width=True)
+                    preview, (size, _, file_format) = load_preview(image_file.getvalue())
+                    st.image(preview, caption="Uploaded Image", use_container_width=True)
                     
-                    file_format = image.format or "Unknown"
                     st.markdown(f"""
                         <div class="card card-info" style="margin-top: 0.5rem; padding: 0.75rem;">
-                            📐 <strong>{image.size[0]}×{image.size[1]}</strong> | 
+                            📐 <strong>{size[0]}×{size[1]}</strong> | 
                             📁 <strong>{file_format}</strong>
                         </div>
                     """, unsafe_allow_html=True)
@@ -781,58 +855,7 @@ def show_decode_section():
             st.markdown('</div>', unsafe_allow_html=True)
         
         with col2:
-            # Step 2: Select Decoding Method
-            render_step(2, "Select Decoding Method")
-            
-            st.markdown('<div class="card animate-fade-in stagger-1">', unsafe_allow_html=True)
-            
-            decode_method = st.selectbox(
-                "Decoding Method",
-                ["LSB", "Hybrid DCT", "Hybrid DWT"],
-                key="decode_method_select",
-                help="Choose the same method that was used to encode the image"
-            )
-            
-            # Method info badges
-            method_info = {
-                "LSB": ("⚡ Fast", "Spatial domain — use if encoded with LSB", "#238636"),
-                "Hybrid DCT": ("🛡️ Secure", "Frequency domain — use if encoded with DCT", "#1F6FEB"),
-                "Hybrid DWT": ("🔐 Robust", "Wavelet domain — use if encoded with DWT", "#8957E5")
-            }
-            info = method_info.get(decode_method, ("", "", "#8B949E"))
-            st.markdown(f"""
-                <div style="padding: 0.5rem; background: rgba(0,0,0,0.2); border-radius: 6px; border-left: 3px solid {info[2]};">
-                    <strong>{info[0]}</strong> — {info[1]}
-                </div>
-            """, unsafe_allow_html=True)
-            
-            st.markdown('</div>', unsafe_allow_html=True)
-            
-            # Step 3: Decryption Settings
-            render_step(3, "Decryption Settings")
-            
-            st.markdown('<div class="card animate-fade-in stagger-2">', unsafe_allow_html=True)
-            
-            use_encryption = st.checkbox("🔓 Message is encrypted", key="decode_encrypt")
-            decryption_password = None
-            
-            if use_encryption:
-                decryption_password = st.text_input(
-                    "Decryption Password",
-                    type="password",
-                    placeholder="Enter the encryption password",
-                    key="decode_pass"
-                )
-            
-            st.markdown('</div>', unsafe_allow_html=True)
-            
-            # Step 4: ECC Recovery
-            try:
-                from stegotool.modules.module6_redundancy.ui_section import show_ecc_decode_section
-                ecc_config = show_ecc_decode_section()
-            except ImportError:
-                # Fallback if module not available
-                ecc_config = {'use_ecc_recovery': False, 'ecc_strength': 0}
+            decode_method, use_encryption, decryption_password, ecc_config = _decode_settings_panel()
             
             # Decode button
             st.markdown("<br>", unsafe_allow_html=True)
@@ -870,39 +893,116 @@ def show_decode_section():
         _show_decode_help()
 
 
+@_fragment
+def _decode_settings_panel():
+    """
+    Method, decryption and ECC settings for the decode tab.
+    
+    A fragment, like _encode_settings_panel; the Extract button stays
+    outside it so a decode always runs with the whole page.
+    """
+    # Step 2: Select Decoding Method
+    render_step(2, "Select Decoding Method", card_class="card animate-fade-in stagger-1")
+    
+    decode_method = st.selectbox(
+        "Decoding Method",
+        ["LSB", "Hybrid DCT", "Hybrid DWT"],
+        key="decode_method_select",
+        help="Choose the same method that was used to encode the image"
+    )
+    
+    # Method info badges
+    method_info = {
+        "LSB": ("⚡ Fast", "Spatial domain — use if encoded with LSB", "#238636"),
+        "Hybrid DCT": ("🛡️ Secure", "Frequency domain — use if encoded with DCT", "#1F6FEB"),
+        "Hybrid DWT": ("🔐 Robust", "Wavelet domain — use if encoded with DWT", "#8957E5")
+    }
+    info = method_info.get(decode_method, ("", "", "#8B949E"))
+    st.markdown(f"""
+        <div style="padding: 0.5rem; background: rgba(0,0,0,0.2); border-radius: 6px; border-left: 3px solid {info[2]};">
+            <strong>{info[0]}</strong> — {info[1]}
+        </div>
+    """, unsafe_allow_html=True)
+    
+    st.markdown('</div>', unsafe_allow_html=True)
+    
+    # Step 3: Decryption Settings
+    render_step(3, "Decryption Settings", card_class="card animate-fade-in stagger-2")
+    
+    use_encryption = st.checkbox("🔓 Message is encrypted", key="decode_encrypt")
+    decryption_password = None
+    
+    if use_encryption:
+        decryption_password = st.text_input(
+            "Decryption Password",
+            type="password",
+            placeholder="Enter the encryption password",
+            key="decode_pass"
+        )
+    
+    st.markdown('</div>', unsafe_allow_html=True)
+    
+    # Step 4: ECC Recovery
+    try:
+        ecc_config = _ecc_module().show_ecc_decode_section()
+    except ImportError:
+        # Fallback if module not available
+        ecc_config = {'use_ecc_recovery': False, 'ecc_strength': 0}
+    
+    return decode_method, use_encryption, decryption_password, ecc_config
+
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def _cached_extract(file_bytes: bytes, decode_method: str) -> str:
+    """
+    Raw embedded message for an upload and method, before ECC or decryption.
+    
+    Retrying with another password or ECC setting reuses the extraction.
+    """
+    image = load_image(file_bytes)
+    if image.mode != 'RGB':
+        image = image.convert('RGB')
+    
+    if decode_method == "LSB":
+        return lsb_decode(image)
+    elif decode_method == "Hybrid DCT":
+        return dct_decode(image)
+    elif decode_method == "Hybrid DWT":
+        return dwt_decode(image)
+    return ""
+
+
 def _perform_decoding(image_file, decode_method, use_encryption, decryption_password,
                      use_ecc_recovery=False, ecc_strength=32):
     """Perform decoding with optional ECC recovery."""
+    result_key = _result_key(image_file, decode_method, use_encryption,
+                             decryption_password, use_ecc_recovery, ecc_strength)
+    if st.session_state.get('decode_result', {}).get('key') == result_key:
+        show_success("Already decoded with these settings — see the Results tab.")
+        return
+    
     try:
-        progress = st.progress(0, text="Loading image...")
-        
-        image = Image.open(image_file)
-        if image.mode != 'RGB':
-            image = image.convert('RGB')
-        
-        progress.progress(30, text=f"Decoding with {decode_method}...")
-        
-        decoded_message = ""
+        progress = st.progress(30, text=f"Decoding with {decode_method}...")
         
         # Decode using the selected method
-        if decode_method == "LSB":
-            decoded_message = lsb_decode(image)
-        elif decode_method == "Hybrid DCT":
-            decoded_message = dct_decode(image)
-        elif decode_method == "Hybrid DWT":
-            decoded_message = dwt_decode(image)
+        with st.spinner(f"Decoding with {decode_method}..."):
+            decoded_message = _cached_extract(image_file.getvalue(), decode_method)
         
         progress.progress(70, text="Validating message...")
         
         if not decoded_message or not decoded_message.strip():
             progress.empty()
+            if decode_method != "LSB" and sniff_method(load_image(image_file.getvalue())) == "LSB":
+                tip = "💡 **Tip:** This image carries LSB framing — try the **LSB** method."
+            else:
+                tip = "💡 **Tip:** Try a different method or enable ECC recovery."
             show_error(
                 f"No hidden message found using **{decode_method}** method.\n\n"
                 "**Possible causes:**\n"
                 "- Wrong decoding method selected\n"
                 "- Image was not encoded with this tool\n"
                 "- Image was compressed or modified after encoding\n\n"
-                "💡 **Tip:** Try a different method or enable ECC recovery."
+                f"{tip}"
             )
             return
         
@@ -911,9 +1011,7 @@ def _perform_decoding(image_file, decode_method, use_encryption, decryption_pass
         # Attempt ECC recovery if enabled
         if use_ecc_recovery:
             try:
-                from stegotool.modules.module6_redundancy.ui_section import decode_message_with_ecc_recovery
-                
-                recovered_msg, status = decode_message_with_ecc_recovery(
+                recovered_msg, status = _ecc_module().decode_message_with_ecc_recovery(
                     decoded_message,
                     use_ecc_recovery=True,
                     nsym=ecc_strength,
@@ -959,22 +1057,20 @@ def _perform_decoding(image_file, decode_method, use_encryption, decryption_pass
             'message': decoded_message,
             'method': decode_method,
             'ecc_recovery_used': use_ecc_recovery,
-            'success': True
+            'success': True,
+            'key': result_key
         }
         
         recovery_info = " (with ECC recovery)" if use_ecc_recovery else ""
         show_success(f"✅ Message extracted successfully using **{decode_method}** method{recovery_info}!")
         
         # Log activity
-        try:
-            if st.session_state.get('logged_in') and st.session_state.get('user_id'):
-                log_activity(
-                    st.session_state['user_id'],
-                    "decode",
-                    f"Decoded using {decode_method}{recovery_info}"
-                )
-        except Exception:
-            pass
+        if st.session_state.get('logged_in') and st.session_state.get('user_id'):
+            log_activity_async(
+                st.session_state['user_id'],
+                "decode",
+                f"Decoded using {decode_method}{recovery_info}"
+            )
     
     except Exception as e:
         show_error(f"Decoding failed: {str(e)}")
@@ -998,6 +1094,8 @@ def show_comparison_section():
         # Comparison table
         st.markdown('<div class="card animate-fade-in">', unsafe_allow_html=True)
         
+        import pandas as pd
+        
         comparison_data = pd.DataFrame({
             "Feature": ["Speed", "Capacity", "Security", "JPEG Safe", "Best For"],
             "LSB": ["⚡ Very Fast", "📦 High (~180KB)", "🔓 Low", "❌ No", "Quick encoding"],
@@ -1041,23 +1139,30 @@ def show_comparison_section():
             test_image = create_file_uploader(file_type="images", key="compare_test_img")
             
             if test_image:
-                img = Image.open(test_image)
-                st.image(img, caption="Test Image", use_container_width=True)
+                preview, _ = load_preview(test_image.getvalue())
+                st.image(preview, caption="Test Image", use_container_width=True)
             st.markdown('</div>', unsafe_allow_html=True)
         
         with col2:
             st.markdown('<div class="card">', unsafe_allow_html=True)
-            test_message = st.text_area(
-                "Test Message",
-                value="This is a test message for comparison.",
-                height=100,
-                key="compare_test_msg"
-            )
+            # Editing the message inside a form doesn't rerun the page
+            with st.form("compare_test_form", border=False):
+                test_message = st.text_area(
+                    "Test Message",
+                    value="This is a test message for comparison.",
+                    height=100,
+                    key="compare_test_msg"
+                )
+                run_btn = st.form_submit_button(
+                    "🔄 Run Comparison",
+                    use_container_width=True,
+                    type="primary",
+                    disabled=not test_image
+                )
             st.markdown('</div>', unsafe_allow_html=True)
         
-        if test_image and test_message:
-            if st.button("🔄 Run Comparison", use_container_width=True, type="primary"):
-                _run_comparison_test(test_image, test_message)
+        if run_btn and test_image and test_message:
+            _run_comparison_test(test_image, test_message)
     
     with tab_details:
         _show_comparison_details()
@@ -1067,27 +1172,13 @@ def _run_comparison_test(image_file, message):
     """Run comparison test on all methods."""
     try:
         with st.spinner("Testing all methods..."):
-            original = Image.open(image_file)
-            results = {}
-            
+            original = load_image(image_file.getvalue())
             progress = st.progress(0)
             
-            methods = [
-                ("LSB", lsb_encode),
-                ("Hybrid DCT", dct_encode),
-                ("Hybrid DWT", dwt_encode)
-            ]
-            
-            for i, (name, func) in enumerate(methods):
-                try:
-                    start = time.time()
-                    encoded = func(original, message)
-                    elapsed = time.time() - start
-                    results[name] = {"image": encoded, "time": elapsed, "success": True}
-                except Exception as e:
-                    results[name] = {"error": str(e), "success": False}
-                
-                progress.progress((i + 1) / len(methods))
+            results = encode_all_methods(
+                original, message,
+                on_done=lambda done: progress.progress(done / len(COMPARISON_METHODS))
+            )
             
             progress.empty()
             
@@ -1197,6 +1288,7 @@ def _show_comparison_details():
 #                           STATISTICS SECTION
 # ============================================================================
 
+@_fragment
 def show_statistics_section():
     """Display statistics and analytics dashboard."""
     from src.analytics.ui_section import show_analytics_section
@@ -1208,6 +1300,7 @@ def show_statistics_section():
 #                           BATCH PROCESSING SECTION
 # ============================================================================
 
+@_fragment
 def show_batch_processing_section():
     """Display batch processing with professional styling."""
     
@@ -1274,9 +1367,7 @@ def _show_batch_encode_section():
         st.divider()
         
         # File upload
-        render_step(1, "Upload Images")
-        
-        st.markdown('<div class="card">', unsafe_allow_html=True)
+        render_step(1, "Upload Images", card_class="card")
         upload_type, uploaded_files = create_batch_upload_section()
         
         file_count = 0
@@ -1327,8 +1418,7 @@ def _show_batch_encode_section():
     with tab_results:
         if "batch_encode_results" in st.session_state:
             st.markdown("### Batch Results")
-            results = st.session_state.batch_encode_results
-            st.dataframe(pd.DataFrame(results), use_container_width=True)
+            st.dataframe(st.session_state.batch_encode_results, use_container_width=True)
         else:
             st.info("📊 Results will appear here after batch encoding")
     
@@ -1359,9 +1449,7 @@ def _show_batch_decode_section():
         
         st.divider()
         
-        render_step(1, "Upload Encoded Images")
-        
-        st.markdown('<div class="card">', unsafe_allow_html=True)
+        render_step(1, "Upload Encoded Images", card_class="card")
         upload_type, uploaded_files = create_batch_upload_section()
         
         if uploaded_files:
@@ -1371,9 +1459,7 @@ def _show_batch_decode_section():
                 st.success("✅ ZIP file uploaded")
         st.markdown('</div>', unsafe_allow_html=True)
         
-        render_step(2, "Decryption (Optional)")
-        
-        st.markdown('<div class="card">', unsafe_allow_html=True)
+        render_step(2, "Decryption (Optional)", card_class="card")
         use_encryption = st.checkbox("🔐 Messages are encrypted", key="batch_dec_encrypt")
         decryption_password = None
         if use_encryption:
@@ -1389,7 +1475,7 @@ def _show_batch_decode_section():
     with tab_results:
         if "batch_decode_results" in st.session_state:
             st.markdown("### Decoded Messages")
-            # Display results
+            st.dataframe(st.session_state.batch_decode_results, use_container_width=True)
         else:
             st.info("📩 Decoded messages will appear here")
     
@@ -1408,49 +1494,133 @@ def _show_batch_decode_section():
         """)
 
 
+def _spool_uploads(uploaded_files, directory):
+    """
+    Copy each upload to its own file under ``directory`` and yield the path.
+    
+    Workers then open the image from disk, so an upload's bytes are never
+    duplicated with getvalue() or pickled across to the worker process.
+    """
+    for i, image_file in enumerate(uploaded_files):
+        path = os.path.join(directory, str(i))
+        image_file.seek(0)
+        with open(path, "wb") as f:
+            shutil.copyfileobj(image_file, f, length=BATCH_SPOOL_CHUNK_SIZE)
+        yield path
+
+
+def _run_batch_jobs(func, jobs, total):
+    """
+    Run func(*args) for every job across a pool of worker processes.
+    
+    Workers are spawned, so ``func`` must be a module-level function
+    importable without the UI (e.g. from batch_encoder).
+    
+    ``jobs`` may be a generator; only a few jobs per worker are pulled
+    and submitted at a time, so large batches never hold every upload's
+    bytes in flight at once.
+    
+    Yields (index, result, error) tuples in completion order so the
+    caller can update progress as each image finishes.
+    """
+    workers = max(1, min(total, os.cpu_count() or 1))
+    jobs = enumerate(jobs)
+    with ProcessPoolExecutor(max_workers=workers, mp_context=_BATCH_MP_CONTEXT) as pool:
+        pending = {}
+        completed = 0
+        for i, args in islice(jobs, 2 * workers):
+            pending[pool.submit(func, *args)] = i
+        while pending:
+            future = next(as_completed(pending))
+            i = pending.pop(future)
+            try:
+                yield i, future.result(), None
+            except Exception as e:
+                yield i, None, e
+            completed += 1
+            if completed % BATCH_GC_INTERVAL == 0:
+                gc.collect()
+            for j, args in islice(jobs, 1):
+                pending[pool.submit(func, *args)] = j
+
+
+def _batch_progress(total):
+    """
+    Create the batch progress widgets and return a report(done) callback.
+    
+    The widgets are refreshed every total // BATCH_PROGRESS_UPDATES files,
+    whenever BATCH_PROGRESS_INTERVAL seconds have passed since the last
+    refresh, and on the final file.
+    """
+    progress = st.progress(0)
+    status_text = st.empty()
+    update_every = max(1, total // BATCH_PROGRESS_UPDATES)
+    last_update = time.monotonic()
+    
+    def report(done):
+        nonlocal last_update
+        now = time.monotonic()
+        if done % update_every == 0 or now - last_update > BATCH_PROGRESS_INTERVAL or done == total:
+            progress.progress(done / total)
+            status_text.text(f"Processed {done}/{total}")
+            last_update = now
+    
+    return report
+
+
+def _log_batch_activity(action, details):
+    """
+    Log one activity row per processed batch file.
+    
+    Rows are queued together after the batch finishes, so the background
+    log worker writes them all in one bulk insert.
+    """
+    user_id = st.session_state.get('user_id')
+    if not user_id or not details:
+        return
+    for detail in details:
+        log_activity_async(user_id, action, detail)
+
+
 def _perform_basic_batch_encode(uploaded_files, message, method, use_encryption, encryption_password):
     """Perform basic batch encoding (same message in all images)."""
     try:
-        results = []
-        progress = st.progress(0)
+        total = len(uploaded_files)
+        statuses = [None] * total
+        times = [None] * total
+        report_progress = _batch_progress(total)
+        
+        # Same message for every image, so encrypt (and run the KDF) once.
+        # Every image therefore carries the same ciphertext, salt and IV:
+        # they are shared across the batch, not fresh per file
+        message_to_embed = message
+        if use_encryption and encryption_password:
+            message_to_embed = encrypt_message(message, encryption_password)
         
-        for i, image_file in enumerate(uploaded_files):
-            status_text = f"Processing {i+1}/{len(uploaded_files)}..."
-            st.write(status_text)
+        with tempfile.TemporaryDirectory() as spool_dir:
+            jobs = ((path, method, message_to_embed) for path in _spool_uploads(uploaded_files, spool_dir))
             
-            try:
-                original_image = Image.open(image_file)
-                message_to_embed = message
-                
-                if use_encryption and encryption_password:
-                    message_to_embed = encrypt_message(message, encryption_password)
-                
-                if method == "LSB":
-                    encoded_image = lsb_encode(original_image, message_to_embed)
-                elif method == "Hybrid DCT":
-                    encoded_image = dct_encode(original_image, message_to_embed)
-                elif method == "Hybrid DWT":
-                    encoded_image = dwt_encode(original_image, message_to_embed)
-                else:
-                    encoded_image = lsb_encode(original_image, message_to_embed)
-                
-                results.append({
-                    "filename": image_file.name,
-                    "status": "✅ Success",
-                    "method": method
-                })
+            for done, (i, elapsed, error) in enumerate(_run_batch_jobs(encode_image_bytes, jobs, total), start=1):
+                statuses[i] = "✅ Success" if error is None else f"❌ Error: {str(error)[:30]}"
+                if error is None:
+                    times[i] = round(elapsed, 3)
                 
-            except Exception as e:
-                results.append({
-                    "filename": image_file.name,
-                    "status": f"❌ Error: {str(e)[:30]}",
-                    "method": method
-                })
-            
-            progress.progress((i + 1) / len(uploaded_files))
+                report_progress(done)
         
-        st.session_state.batch_encode_results = results
-        show_success(f"Batch encoding complete! {len([r for r in results if '✅' in r['status']])}/{len(uploaded_files)} successful")
+        import pandas as pd
+        
+        st.session_state.batch_encode_results = pd.DataFrame({
+            "filename": [image_file.name for image_file in uploaded_files],
+            "status": statuses,
+            "method": method,
+            "encoding_time": times
+        })
+        successful = sum(status.startswith("✅") for status in statuses)
+        _log_batch_activity("ENCODE", [
+            f"Batch encoded {image_file.name} with {method}"
+            for image_file, status in zip(uploaded_files, statuses) if status.startswith("✅")
+        ])
+        show_success(f"Batch encoding complete! {successful}/{len(uploaded_files)} successful")
         
     except Exception as e:
         show_error(f"Batch encoding failed: {str(e)}")
@@ -1460,9 +1630,6 @@ def _perform_advanced_batch_encode(uploaded_files, upload_type, message, method,
                                     use_encryption, encryption_password, file_count):
     """Perform advanced batch encoding (message split across images)."""
     try:
-        results = []
-        progress = st.progress(0)
-        
         message_to_split = message
         if use_encryption and encryption_password:
             message_to_split = encrypt_message(message, encryption_password)
@@ -1474,41 +1641,40 @@ def _perform_advanced_batch_encode(uploaded_files, upload_type, message, method,
             for i in range(file_count)
         ]
         
-        for i, (image_file, chunk) in enumerate(zip(uploaded_files, message_chunks)):
-            status_text = f"Processing {i+1}/{len(uploaded_files)}..."
-            st.write(status_text)
+        total = min(len(uploaded_files), len(message_chunks))
+        statuses = [None] * total
+        times = [None] * total
+        report_progress = _batch_progress(total)
+        
+        with tempfile.TemporaryDirectory() as spool_dir:
+            jobs = (
+                (path, method, chunk)
+                for path, chunk in zip(_spool_uploads(uploaded_files[:total], spool_dir), message_chunks)
+            )
             
-            try:
-                original_image = Image.open(image_file)
-                
-                if method == "LSB":
-                    encoded_image = lsb_encode(original_image, chunk)
-                elif method == "Hybrid DCT":
-                    encoded_image = dct_encode(original_image, chunk)
-                elif method == "Hybrid DWT":
-                    encoded_image = dwt_encode(original_image, chunk)
-                else:
-                    encoded_image = lsb_encode(original_image, chunk)
-                
-                results.append({
-                    "filename": image_file.name,
-                    "status": "✅ Success",
-                    "method": method,
-                    "chunk": i+1
-                })
+            for done, (i, elapsed, error) in enumerate(_run_batch_jobs(encode_image_bytes, jobs, total), start=1):
+                statuses[i] = "✅ Success" if error is None else f"❌ Error: {str(error)[:30]}"
+                if error is None:
+                    times[i] = round(elapsed, 3)
                 
-            except Exception as e:
-                results.append({
-                    "filename": image_file.name,
-                    "status": f"❌ Error: {str(e)[:30]}",
-                    "method": method,
-                    "chunk": i+1
-                })
-            
-            progress.progress((i + 1) / len(uploaded_files))
+                report_progress(done)
+        
+        import pandas as pd
         
-        st.session_state.batch_encode_results = results
-        show_success(f"Advanced batch encoding complete! {len([r for r in results if '✅' in r['status']])}/{len(uploaded_files)} successful")
+        st.session_state.batch_encode_results = pd.DataFrame({
+            "filename": [image_file.name for image_file in uploaded_files[:total]],
+            "status": statuses,
+            "method": method,
+            "chunk": range(1, total + 1),
+            "encoding_time": times
+        })
+        successful = sum(status.startswith("✅") for status in statuses)
+        _log_batch_activity("ENCODE", [
+            f"Batch encoded {image_file.name} (chunk {n}) with {method}"
+            for n, (image_file, status) in enumerate(zip(uploaded_files, statuses), start=1)
+            if status.startswith("✅")
+        ])
+        show_success(f"Advanced batch encoding complete! {successful}/{len(uploaded_files)} successful")
         
     except Exception as e:
         show_error(f"Advanced batch encoding failed: {str(e)}")
@@ -1517,65 +1683,52 @@ def _perform_advanced_batch_encode(uploaded_files, upload_type, message, method,
 def _perform_batch_decode(uploaded_files, upload_type, use_encryption, decryption_password):
     """Perform batch decoding."""
     try:
-        results = []
-        progress = st.progress(0)
-        
-        for i, image_file in enumerate(uploaded_files):
-            st.write(f"Processing {i+1}/{len(uploaded_files)}...")
-            
-            try:
-                image = Image.open(image_file)
-                decoded_message = None
-                method_used = None
-                
-                methods = [
-                    ("LSB", lsb_decode),
-                    ("Hybrid DCT", dct_decode),
-                    ("Hybrid DWT", dwt_decode)
-                ]
-                
-                for method_name, method_func in methods:
-                    try:
-                        extracted = method_func(image)
-                        if extracted and is_valid_message(extracted):
-                            decoded_message = extracted
-                            method_used = method_name
-                            break
-                    except:
-                        continue
-                
-                if decoded_message and method_used:
+        total = len(uploaded_files)
+        statuses = [None] * total
+        methods = [None] * total
+        messages = [None] * total
+        # Basic-mode batches carry one ciphertext in every image, so run
+        # the KDF once per distinct payload rather than once per file
+        decrypted = {}
+        report_progress = _batch_progress(total)
+        
+        with tempfile.TemporaryDirectory() as spool_dir:
+            jobs = ((path,) for path in _spool_uploads(uploaded_files, spool_dir))
+            
+            for done, (i, found, error) in enumerate(_run_batch_jobs(decode_image_bytes, jobs, total), start=1):
+                if error is not None:
+                    statuses[i], methods[i], messages[i] = "❌ Error", "N/A", str(error)[:30]
+                elif found[0]:
+                    method_used, decoded_message = found
+                    
                     if use_encryption and decryption_password:
-                        try:
-                            decoded_message = decrypt_message(decoded_message, decryption_password)
-                        except:
-                            decoded_message = "[Decryption failed]"
+                        if decoded_message not in decrypted:
+                            try:
+                                decrypted[decoded_message] = decrypt_message(decoded_message, decryption_password)
+                            except Exception:
+                                decrypted[decoded_message] = "[Decryption failed]"
+                        decoded_message = decrypted[decoded_message]
                     
-                    results.append({
-                        "filename": image_file.name,
-                        "status": "✅ Found",
-                        "method": method_used,
-                        "message": decoded_message[:50] + ("..." if len(decoded_message) > 50 else "")
-                    })
+                    statuses[i], methods[i] = "✅ Found", method_used
+                    messages[i] = decoded_message[:50] + ("..." if len(decoded_message) > 50 else "")
                 else:
-                    results.append({
-                        "filename": image_file.name,
-                        "status": "❌ No message found",
-                        "method": "N/A",
-                        "message": ""
-                    })
+                    statuses[i], methods[i], messages[i] = "❌ No message found", "N/A", ""
                 
-            except Exception as e:
-                results.append({
-                    "filename": image_file.name,
-                    "status": f"❌ Error",
-                    "method": "N/A",
-                    "message": str(e)[:30]
-                })
-            
-            progress.progress((i + 1) / len(uploaded_files))
+                report_progress(done)
+        
+        import pandas as pd
         
-        st.session_state.batch_decode_results = results
+        st.session_state.batch_decode_results = pd.DataFrame({
+            "filename": [image_file.name for image_file in uploaded_files],
+            "status": statuses,
+            "method": methods,
+            "message": messages
+        })
+        _log_batch_activity("decode", [
+            f"Batch decoded {image_file.name} using {method_used}"
+            for image_file, status, method_used in zip(uploaded_files, statuses, methods)
+            if status.startswith("✅")
+        ])
         show_success(f"Batch decoding complete!")
         
     except Exception as e:
@@ -1599,20 +1752,16 @@ def show_pixel_selector_section():
         col1, col2 = st.columns([1.2, 0.8])
         
         with col1:
-            render_step(1, "Upload Image")
-            
-            st.markdown('<div class="card animate-fade-in">', unsafe_allow_html=True)
+            render_step(1, "Upload Image", card_class="card animate-fade-in")
             image_file = create_file_uploader(file_type="images", key="pixel_img")
             
             if image_file:
-                image = Image.open(image_file)
-                st.image(image, caption="Image to Analyze", use_container_width=True)
+                # Same cached array the analysis uses, so the file is decoded once
+                st.image(load_rgb_array(image_file.getvalue()), caption="Image to Analyze", use_container_width=True)
             st.markdown('</div>', unsafe_allow_html=True)
         
         with col2:
-            render_step(2, "Configure Analysis")
-            
-            st.markdown('<div class="card animate-fade-in stagger-1">', unsafe_allow_html=True)
+            render_step(2, "Configure Analysis", card_class="card animate-fade-in stagger-1")
             
             payload_bits = st.number_input(
                 "Payload size (bits)",
@@ -1662,23 +1811,34 @@ def show_pixel_selector_section():
         """)
 
 
+@st.cache_data(max_entries=16, show_spinner=False)
+def _cached_select_pixels(file_bytes: bytes, payload_bits: int, patch_size: int, lsb_bits: int):
+    """
+    Selected (xs, ys) coordinate arrays for an upload; re-analysing known
+    settings skips the selector. Arrays pickle into the cache far faster
+    than one tuple per pixel.
+    """
+    from stegotool.modules.module3_pixel_selector.selector_baseline import select_pixel_arrays
+    
+    return select_pixel_arrays(
+        load_rgb_array(file_bytes), payload_bits=payload_bits,
+        patch_size=patch_size, lsb_bits=lsb_bits, seed=0
+    )
+
+
 def _run_pixel_analysis(image_file, payload_bits, patch_size, lsb_bits):
     """Run pixel analysis."""
     try:
         with st.spinner("Analyzing image quality..."):
-            from stegotool.modules.module3_pixel_selector.selector_baseline import select_pixels
-            
-            image = Image.open(image_file)
-            arr = np.array(image.convert("RGB"))
+            file_bytes = image_file.getvalue()
+            arr = load_rgb_array(file_bytes)
             h, w, _ = arr.shape
             
-            selected_coords = select_pixels(
-                arr, payload_bits=payload_bits,
-                patch_size=patch_size, lsb_bits=lsb_bits, seed=0
-            )
+            xs, ys = _cached_select_pixels(file_bytes, int(payload_bits), patch_size, lsb_bits)
             
             st.session_state.pixel_analysis_results = {
-                "coords": selected_coords,
+                "xs": xs,
+                "ys": ys,
                 "image": arr,
                 "width": w,
                 "height": h
@@ -1693,7 +1853,7 @@ def _run_pixel_analysis(image_file, payload_bits, patch_size, lsb_bits):
 def _display_pixel_results():
     """Display pixel analysis results."""
     results = st.session_state.pixel_analysis_results
-    coords = results["coords"]
+    xs, ys = results["xs"], results["ys"]
     arr = results["image"]
     w, h = results["width"], results["height"]
     
@@ -1704,29 +1864,33 @@ def _display_pixel_results():
     with cols[1]:
         st.metric("Total Pixels", f"{w*h:,}")
     with cols[2]:
-        st.metric("Best Pixels", len(coords))
+        st.metric("Best Pixels", len(xs))
     with cols[3]:
-        coverage = (len(coords) / (w * h)) * 100
+        coverage = (len(xs) / (w * h)) * 100
         st.metric("Coverage", f"{coverage:.1f}%")
     
     st.divider()
     
-    # Visualization
+    # Visualization - large images are shown at half resolution, which is
+    # still wider than the column and halves the overlay copy
+    step = 2 if max(w, h) > 2048 else 1
+    preview = arr[::step, ::step]
+    
     col1, col2 = st.columns(2)
     
     with col1:
         st.markdown('<div class="card">', unsafe_allow_html=True)
         st.markdown("**Original Image**")
-        st.image(arr, use_container_width=True)
+        st.image(preview, use_container_width=True)
         st.markdown('</div>', unsafe_allow_html=True)
     
     with col2:
         st.markdown('<div class="card card-success">', unsafe_allow_html=True)
         st.markdown("**Best Pixels (Red)**")
-        overlay = arr.copy()
-        for x, y in coords[:200]:
-            if 0 <= x < w and 0 <= y < h:
-                overlay[y, x] = [255, 0, 0]
+        overlay = preview.copy()
+        xs, ys = xs[:200], ys[:200]
+        in_bounds = (xs >= 0) & (xs < w) & (ys >= 0) & (ys < h)
+        overlay[ys[in_bounds] // step, xs[in_bounds] // step] = [255, 0, 0]
         st.image(overlay, use_container_width=True)
         st.markdown('</div>', unsafe_allow_html=True)
 
@@ -1739,8 +1903,7 @@ def show_redundancy_section():
     """Display error correction with professional styling."""
     # Import from the proper module
     try:
-        from stegotool.modules.module6_redundancy.ui_section import show_redundancy_section as show_ecc_ui
-        show_ecc_ui()
+        _ecc_module().show_redundancy_section()
     except ImportError:
         # Fallback if module not available
         st.error("Error Correction module not available. Please install required dependencies.")
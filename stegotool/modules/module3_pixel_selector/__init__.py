@@ -4,6 +4,7 @@ Advanced heuristic-based pixel selection for steganography.
 
 Main API:
     select_pixels() - Select pixels for embedding
+    select_pixel_arrays() - Same selection as coordinate arrays
     
 Analysis tools:
     calculate_capacity() - How many bits fit in image
@@ -13,7 +14,7 @@ Optimization:
     super_fast_select_pixels() - Auto-optimized for 4K
 """
 
-from .selector_baseline import select_pixels
+from .selector_baseline import select_pixels, select_pixel_arrays
 from .selector_analyzer import (
     calculate_capacity,
     calculate_batch_capacity,
@@ -31,6 +32,7 @@ __version__ = "2.0.0"  # Updated version with fixes
 __all__ = [
     # Core API
     "select_pixels",
+    "select_pixel_arrays",
     # Analysis
     "calculate_capacity",
     "calculate_batch_capacity",
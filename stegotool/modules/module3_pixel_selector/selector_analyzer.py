@@ -84,8 +84,9 @@ def calculate_batch_capacity(
     per_image_caps = []
     for img_path in image_paths:
         try:
-            img = Image.open(img_path).convert('RGB')
-            w, h = img.size
+            # Only the size is needed, which Image.open reads from the header
+            with Image.open(img_path) as img:
+                w, h = img.size
             cap = calculate_capacity(h, w, lsb_bits)
             per_image_caps.append({
                 'path': img_path,
@@ -11,14 +11,17 @@ BUGS FIXED:
 
 API:
     select_pixels(image_np, payload_bits, patch_size=3, lsb_bits=1, seed=0)
+    select_pixel_arrays(image_np, payload_bits, patch_size=3, lsb_bits=1, seed=0)
 Returns:
     List[(x,y)] ordered by priority, guaranteed length == payload_bits
+    (select_pixel_arrays: the same coordinates as parallel xs, ys arrays)
 Raises:
     ValueError: If inputs invalid or payload_bits exceeds image capacity
 """
 
 from typing import List, Tuple
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 import cv2
 import logging
 
@@ -61,26 +64,42 @@ def _get_progress_reporter():
         # Not in Streamlit context, use no-op
         return lambda c, t: None
 
-def _compute_score_for_pixel_vectorized(
+def _compute_score_map(
     lap_map: np.ndarray, 
     var_map: np.ndarray, 
-    ent_map: np.ndarray, 
-    x: int, 
-    y: int
-) -> float:
+    ent_map: np.ndarray
+) -> np.ndarray:
     """
-    Compute pixel score using pre-computed feature maps.
+    Compute the score of every pixel from the pre-computed feature maps.
     Weighted combination: Laplacian (1.0) + Entropy (0.8) + Variance (0.2)
+    
+    Accumulates in place into one float64 buffer so a full-image
+    temporary is not allocated for every term.
+    """
+    score = ent_map.astype(np.float64)
+    score *= 0.8
+    score += lap_map
+    weighted_var = var_map.astype(np.float64)
+    weighted_var *= 0.2
+    score += weighted_var
+    return score
+
+def _top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Indices of the k highest scores, best first, ties kept in index order.
+    Same result as np.argsort(-scores, kind="stable")[:k], but only the
+    k winners are sorted after an O(n) partition.
     """
-    h, w = lap_map.shape
-    if 0 <= y < h and 0 <= x < w:
-        lap = float(lap_map[y, x])
-        var = float(var_map[y, x])
-        ent = float(ent_map[y, x])
-    else:
-        lap = var = ent = 0.0
-    
-    return (lap * 1.0) + (ent * 0.8) + (var * 0.2)
+    n = len(scores)
+    if k >= n:
+        return np.argsort(-scores, kind="stable")
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    kth = np.partition(scores, n - k)[n - k]
+    above = np.flatnonzero(scores > kth)
+    ties = np.flatnonzero(scores == kth)[:k - len(above)]
+    idx = np.concatenate((above, ties))
+    return idx[np.lexsort((idx, -scores[idx]))]
 
 def _calculate_capacity(h: int, w: int, lsb_bits: int) -> int:
     """
@@ -99,6 +118,26 @@ def select_pixels(
     """
     Select top pixels for embedding by score using grid-based sampling.
     
+    List-of-tuples form of select_pixel_arrays; see there for arguments
+    and errors. Callers that index an image with the result should use
+    select_pixel_arrays and skip building one tuple per pixel.
+    
+    Returns:
+        List of (x, y) coordinates, length == ceil(payload_bits / (3 * lsb_bits))
+    """
+    xs, ys = select_pixel_arrays(image_np, payload_bits, patch_size, lsb_bits, seed)
+    return list(zip(xs.tolist(), ys.tolist()))
+
+def select_pixel_arrays(
+    image_np: np.ndarray,
+    payload_bits: int,
+    patch_size: int = 3,
+    lsb_bits: int = 1,
+    seed: int = 0
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Select top pixels for embedding by score using grid-based sampling.
+    
     Args:
         image_np: HxWx3 RGB uint8 numpy array
         payload_bits: Total number of bits to embed
@@ -107,7 +146,8 @@ def select_pixels(
         seed: Random seed for deterministic reproducibility (default 0)
     
     Returns:
-        List of (x, y) coordinates, length == ceil(payload_bits / (3 * lsb_bits))
+        (xs, ys) integer arrays in priority order,
+        length == ceil(payload_bits / (3 * lsb_bits))
     
     Raises:
         ValueError: If inputs are invalid or payload_bits exceeds capacity
@@ -117,7 +157,7 @@ def select_pixels(
     - Grid-based sampling: analyzes every Nth pixel to avoid O(h*w) explosion
     - Vectorized feature maps: pre-computes Laplacian, variance, entropy
     - Early-exit: stops scoring after collecting enough candidate pixels
-    - Set-based membership: O(1) duplicate checking during gap-filling
+    - Array output: coordinates stay in numpy, never one tuple per pixel
     - Progress reporting: updates Streamlit UI during computation
     """
     # ===== INPUT VALIDATION =====
@@ -173,82 +213,80 @@ def select_pixels(
     
     report_progress = _get_progress_reporter()
     
-    # FIX: Early-exit optimization - stop scoring once we have enough
-    scores = []
-    sampled_pixels = 0
-    total_pixels_in_grid = ((h + grid_step - 1) // grid_step) * ((w + grid_step - 1) // grid_step)
+    # Weighted combination of the maps for every pixel at once
+    score_map = _compute_score_map(lap_map, var_map, ent_map)
     
-    # Oversample by 50% to have candidates for gap-filling
-    target_candidates = int(pixels_needed * 1.5) + 100
+    # Grid samples in row-major scan order; every pixel when grid_step == 1
+    grid_scores = score_map[::grid_step, ::grid_step]
+    grid_w = grid_scores.shape[1]
+    total_pixels_in_grid = grid_scores.size
     
-    for y in range(0, h, grid_step):
-        for x in range(0, w, grid_step):
-            s = _compute_score_for_pixel_vectorized(lap_map, var_map, ent_map, x, y)
-            scores.append((s, x, y))
-            sampled_pixels += 1
-            
-            # FIX: Early exit - stop once we have enough candidates
-            if len(scores) >= target_candidates:
-                logger.debug(f"Early exit: collected {len(scores)} candidates (target: {target_candidates})")
-                break
-            
-            if sampled_pixels % 10 == 0:
-                report_progress(sampled_pixels, total_pixels_in_grid)
-        
-        if len(scores) >= target_candidates:
-            break
+    # Oversample by 50% to have candidates for gap-filling; like the old
+    # early exit, only the first target_candidates samples of the scan count
+    target_candidates = int(pixels_needed * 1.5) + 100
+    cand_scores = grid_scores.ravel()[:target_candidates]
+    if len(cand_scores) >= target_candidates:
+        logger.debug(f"Early exit: collected {len(cand_scores)} candidates (target: {target_candidates})")
     
     report_progress(total_pixels_in_grid, total_pixels_in_grid)
     
     # ===== SORTING WITH DETERMINISM =====
-    scores.sort(reverse=True, key=lambda t: t[0])
+    # Top pixels_needed only; ties keep scan order
+    order = _top_k_indices(cand_scores, pixels_needed)
     
     # FIX: Use local RandomState instead of global seed (safe for Streamlit)
     rng = np.random.RandomState(seed)
     
     # ===== SELECTION & GAP-FILLING =====
-    # FIX: Use SET for O(1) membership test instead of O(n) list
-    selected_set = set()
-    selected_list = []
-    
-    # Take top candidates
-    for (_, x, y) in scores[:pixels_needed]:
-        x, y = int(x), int(y)
-        if (x, y) not in selected_set:
-            selected_set.add((x, y))
-            selected_list.append((x, y))
+    # Take top candidates (grid samples are distinct, so no duplicates)
+    cand_ys, cand_xs = np.divmod(order, grid_w)
+    sel_xs, sel_ys = cand_xs * grid_step, cand_ys * grid_step
     
     # If we still need more pixels, fill gaps with neighbors (only if grid_step > 1)
-    if len(selected_list) < pixels_needed and grid_step > 1:
-        candidates = []
-        for sx, sy in selected_list:
-            # Add 8-neighborhood around each selected pixel
-            for dy in range(-grid_step, grid_step + 1):
-                for dx in range(-grid_step, grid_step + 1):
-                    nx, ny = sx + dx, sy + dy
-                    if 0 <= nx < w and 0 <= ny < h and (nx, ny) not in selected_set:
-                        s_neighbor = _compute_score_for_pixel_vectorized(lap_map, var_map, ent_map, nx, ny)
-                        candidates.append((s_neighbor, nx, ny))
+    if len(sel_xs) < pixels_needed and grid_step > 1:
+        # Score every neighborhood in one gather: a window view over the
+        # score map, padded so edge windows exist, indexed at the selected
+        # pixels. Out-of-bounds and already selected neighbors are masked out.
+        taken = np.zeros((h, w), dtype=bool)
+        sx, sy = sel_xs, sel_ys
+        taken[sy, sx] = True
+        
+        span = 2 * grid_step + 1
+        windows = sliding_window_view(np.pad(score_map, grid_step), (span, span))
+        taken_windows = sliding_window_view(np.pad(taken, grid_step, constant_values=True), (span, span))
+        offsets = np.arange(-grid_step, grid_step + 1)
+        
+        # (selected, dy, dx) order matches scanning each 8-neighborhood row by row
+        neighbor_scores = windows[sy, sx].ravel()
+        valid = ~taken_windows[sy, sx].ravel()
+        ny = np.broadcast_to(sy[:, None, None] + offsets[None, :, None], (len(sy), span, span)).ravel()
+        nx = np.broadcast_to(sx[:, None, None] + offsets[None, None, :], (len(sx), span, span)).ravel()
+        neighbor_scores, nx, ny = neighbor_scores[valid], nx[valid], ny[valid]
+        
+        # A pixel shared by several neighborhoods has the same score each
+        # time, so keeping its first occurrence in scan order is equivalent
+        # to skipping repeats while walking the sorted list
+        _, first = np.unique(ny * w + nx, return_index=True)
+        first.sort()
+        neighbor_scores, nx, ny = neighbor_scores[first], nx[first], ny[first]
         
-        # Sort and add highest-scoring neighbors
-        candidates.sort(reverse=True, key=lambda t: t[0])
-        for _, x, y in candidates:
-            if len(selected_list) >= pixels_needed:
-                break
-            x, y = int(x), int(y)
-            if (x, y) not in selected_set:
-                selected_set.add((x, y))
-                selected_list.append((x, y))
+        # Add only the highest-scoring neighbors still needed (ties keep scan order)
+        neighbor_order = _top_k_indices(neighbor_scores, pixels_needed - len(sel_xs))
+        sel_xs = np.concatenate((sel_xs, nx[neighbor_order]))
+        sel_ys = np.concatenate((sel_ys, ny[neighbor_order]))
     
     # Ensure we return exactly pixels_needed (should not happen with proper capacity check)
-    result = selected_list[:pixels_needed]
+    sel_xs, sel_ys = sel_xs[:pixels_needed], sel_ys[:pixels_needed]
     
-    if len(result) < pixels_needed:
+    if len(sel_xs) < pixels_needed:
         logger.warning(
-            f"Could not select enough pixels: {len(result)}/{pixels_needed}. "
+            f"Could not select enough pixels: {len(sel_xs)}/{pixels_needed}. "
             f"This should not happen. Try increasing image size or reducing payload_bits."
         )
     
-    logger.debug(f"Selected {len(result)} pixels with score range: {scores[0][0]:.2f}~{scores[-1][0]:.2f}")
+    logger.debug(
+        f"Selected {len(sel_xs)} pixels with score range: "
+        f"{cand_scores.max():.2f}~{cand_scores.min():.2f}"
+    )
     
-    return result
+    return sel_xs, sel_ys
@@ -18,8 +18,8 @@ def compute_laplacian_map(gray: np.ndarray) -> np.ndarray:
     Compute Laplacian map for entire image (vectorized).
     Returns: HxW array of Laplacian variance values (float64).
     """
-    lap = cv2.Laplacian(gray, cv2.CV_64F)
-    return lap.astype(np.float64)
+    # CV_64F output is already float64; no extra cast/copy needed
+    return cv2.Laplacian(gray, cv2.CV_64F)
 
 def compute_variance_map(gray: np.ndarray, patch_size: int = 3) -> np.ndarray:
     """
@@ -33,8 +33,9 @@ def compute_variance_map(gray: np.ndarray, patch_size: int = 3) -> np.ndarray:
     mean = cv2.filter2D(gray_float, -1, kernel)
     sq_mean = cv2.filter2D(gray_float**2, -1, kernel)
     
+    # Float32 throughout, so clamp in place instead of copying twice
     var_map = sq_mean - mean**2
-    return np.maximum(var_map, 0).astype(np.float32)
+    return np.maximum(var_map, 0, out=var_map)
 
 def compute_entropy_map_fast(gray: np.ndarray, patch_size: int = 3) -> np.ndarray:
     """
@@ -42,10 +43,11 @@ def compute_entropy_map_fast(gray: np.ndarray, patch_size: int = 3) -> np.ndarra
     For very fast computation, use Sobel edges as proxy for entropy.
     Returns: HxW array of entropy approximation values.
     """
-    # Use edge detection as fast approximation to entropy
+    # Use edge detection as fast approximation to entropy; cv2.magnitude
+    # computes sqrt(x**2 + y**2) in one pass with no temporaries
     sobelx = cv2.Sobel(gray, cv2.CV_64F, 1, 0, ksize=3)
     sobely = cv2.Sobel(gray, cv2.CV_64F, 0, 1, ksize=3)
-    edges = np.sqrt(sobelx**2 + sobely**2)
+    edges = cv2.magnitude(sobelx, sobely)
     
     # Smooth edges to get entropy-like map
     entropy_map = cv2.GaussianBlur(edges, (patch_size, patch_size), 0)
@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+
+from stegotool.modules.module3_pixel_selector import selector_baseline
+from stegotool.modules.module3_pixel_selector.selector_baseline import select_pixel_arrays, select_pixels
+from stegotool.modules.module3_pixel_selector.selector_utils import (
+    get_gray,
+    compute_laplacian_map, compute_variance_map, compute_entropy_map_fast
+)
+
+def _reference_select(image_np, payload_bits, patch_size, lsb_bits, grid_step):
+    # The original per-pixel scan, sort and gap-filling loops
+    h, w, _ = image_np.shape
+    pixels_needed = int(np.ceil(payload_bits / (3 * lsb_bits)))
+    gray = get_gray(image_np)
+    lap_map = compute_laplacian_map(gray)
+    var_map = compute_variance_map(gray, patch_size)
+    ent_map = compute_entropy_map_fast(gray, patch_size)
+
+    def score(x, y):
+        lap, var, ent = float(lap_map[y, x]), float(var_map[y, x]), float(ent_map[y, x])
+        return (lap * 1.0) + (ent * 0.8) + (var * 0.2)
+
+    target_candidates = int(pixels_needed * 1.5) + 100
+    scores = []
+    for y in range(0, h, grid_step):
+        for x in range(0, w, grid_step):
+            scores.append((score(x, y), x, y))
+            if len(scores) >= target_candidates:
+                break
+        if len(scores) >= target_candidates:
+            break
+    scores.sort(reverse=True, key=lambda t: t[0])
+
+    selected_set = set()
+    selected_list = []
+    for _, x, y in scores[:pixels_needed]:
+        if (x, y) not in selected_set:
+            selected_set.add((x, y))
+            selected_list.append((x, y))
+
+    if len(selected_list) < pixels_needed and grid_step > 1:
+        candidates = []
+        for sx, sy in selected_list:
+            for dy in range(-grid_step, grid_step + 1):
+                for dx in range(-grid_step, grid_step + 1):
+                    nx, ny = sx + dx, sy + dy
+                    if 0 <= nx < w and 0 <= ny < h and (nx, ny) not in selected_set:
+                        candidates.append((score(nx, ny), nx, ny))
+        candidates.sort(reverse=True, key=lambda t: t[0])
+        for _, x, y in candidates:
+            if len(selected_list) >= pixels_needed:
+                break
+            if (x, y) not in selected_set:
+                selected_set.add((x, y))
+                selected_list.append((x, y))
+
+    return selected_list[:pixels_needed]
+
+def _fixed_image(h=40, w=52, seed=5):
+    rng = np.random.default_rng(seed)
+    img = rng.integers(0, 256, (h, w, 3), dtype=np.uint8)
+    # Flat regions give many tied scores, so tie order is exercised too
+    img[:12, :20] = 128
+    img[25:, 30:] = (10, 200, 90)
+    return img
+
+@pytest.mark.parametrize("payload_bits, patch_size", [
+    (30, 3),
+    (600, 3),
+    (1500, 5),
+    (6240, 3),
+])
+def test_select_pixel_arrays_matches_reference_loop(payload_bits, patch_size):
+    img = _fixed_image()
+    xs, ys = select_pixel_arrays(img, payload_bits, patch_size=patch_size)
+    expected = _reference_select(img, payload_bits, patch_size, 1, grid_step=1)
+    assert list(zip(xs.tolist(), ys.tolist())) == expected
+    assert select_pixels(img, payload_bits, patch_size=patch_size) == expected
+
+@pytest.mark.parametrize("grid_step, payload_bits", [
+    (3, 300),
+    (3, 900),
+    (4, 1200),
+])
+def test_gap_filling_matches_reference_loop(monkeypatch, grid_step, payload_bits):
+    # Real images only use a coarse grid above 500k pixels; force it on a small one
+    monkeypatch.setattr(selector_baseline, "_get_grid_step", lambda h, w: grid_step)
+    img = _fixed_image()
+    xs, ys = select_pixel_arrays(img, payload_bits)
+    expected = _reference_select(img, payload_bits, 3, 1, grid_step=grid_step)
+    assert len(expected) == int(np.ceil(payload_bits / 3))
+    assert list(zip(xs.tolist(), ys.tolist())) == expected
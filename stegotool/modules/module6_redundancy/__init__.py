@@ -16,6 +16,7 @@ from .rs_wrapper import (
     recover_redundancy,
     estimate_overhead_rs,
     estimate_overhead_replication,
+    rs_available,
     _HAS_RS
 )
 from .capacity_checker import can_fit_payload, pretty_report
@@ -35,6 +36,7 @@ __all__ = [
     'recover_redundancy',
     'estimate_overhead_rs',
     'estimate_overhead_replication',
+    'rs_available',
     'can_fit_payload',
     'pretty_report',
     'show_ecc_encode_section',
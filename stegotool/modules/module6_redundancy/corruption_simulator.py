@@ -4,12 +4,13 @@ corruption_simulator.py
 Utilities to simulate common corruptions for testing ECC:
 - random_byte_flips: flip N random bytes in a bytes buffer
 - flip_bits_in_bytes: flip bits by absolute bit positions
-- jpg recompression helpers (Pillow)
+- jpg recompression helpers (Pillow, or OpenCV for numpy arrays)
 """
 from typing import Tuple
-import random
 import io
 
+import numpy as np
+
 try:
     from PIL import Image
     _HAS_PIL = True
@@ -17,38 +18,47 @@ except Exception:
     Image = None
     _HAS_PIL = False
 
+try:
+    import cv2
+    _HAS_CV2 = True
+except Exception:
+    cv2 = None
+    _HAS_CV2 = False
+
 def random_byte_flips(data: bytes, n_flips: int, seed: int = 0) -> bytes:
     """
     Randomly flip one random bit in `n_flips` distinct bytes.
+    
+    Uses a local numpy Generator (the global `random` state is left
+    alone) and applies every flip with one vectorized XOR.
     """
     if n_flips <= 0:
         return data
-    random.seed(seed)
-    b = bytearray(data)
-    L = len(b)
+    L = len(data)
     if L == 0:
         return data
-    positions = random.sample(range(L), min(n_flips, L))
-    for pos in positions:
-        bit = 1 << random.randint(0,7)
-        b[pos] ^= bit
-    return bytes(b)
+    rng = np.random.default_rng(seed)
+    positions = rng.choice(L, size=min(n_flips, L), replace=False)
+    bits = np.left_shift(1, rng.integers(0, 8, size=positions.size)).astype(np.uint8)
+    b = np.frombuffer(data, dtype=np.uint8).copy()
+    b[positions] ^= bits
+    return b.tobytes()
 
 def flip_bits_in_bytes(data: bytes, bit_positions: Tuple[int, ...]) -> bytes:
     """
     Flip specific absolute bit positions.
+    
+    Out-of-range positions are ignored. A position listed twice flips
+    back, as with the sequential XORs: bitwise_xor.at applies repeated
+    indices one after another instead of keeping only the last write.
     """
     if not data:
         return data
-    b = bytearray(data)
-    nbits = len(b) * 8
-    for bitpos in bit_positions:
-        if bitpos < 0 or bitpos >= nbits:
-            continue
-        byte_idx = bitpos // 8
-        inner = bitpos % 8
-        b[byte_idx] ^= (1 << inner)
-    return bytes(b)
+    bp = np.asarray(bit_positions, dtype=np.int64).ravel()
+    bp = bp[(bp >= 0) & (bp < len(data) * 8)]
+    b = np.frombuffer(data, dtype=np.uint8).copy()
+    np.bitwise_xor.at(b, bp >> 3, np.left_shift(1, bp & 7).astype(np.uint8))
+    return b.tobytes()
 
 def jpeg_recompress_image_bytes(pil_image, quality: int = 80) -> bytes:
     """
@@ -68,3 +78,19 @@ def recompress_and_reload(pil_image, quality: int = 80):
         raise RuntimeError("Pillow not available")
     jpeg_bytes = jpeg_recompress_image_bytes(pil_image, quality=quality)
     return Image.open(io.BytesIO(jpeg_bytes)).convert("RGB")
+
+def recompress_array(rgb_array, quality: int = 80):
+    """
+    Recompress an HxWx3 RGB uint8 array to JPEG and decode it again.
+    
+    Stays in numpy via cv2.imencode/imdecode, skipping the PIL image
+    objects and BytesIO parsing of recompress_and_reload; both go
+    through libjpeg at the same quality, so the pixels match.
+    """
+    if not _HAS_CV2:
+        raise RuntimeError("OpenCV not available")
+    ok, buf = cv2.imencode(".jpg", cv2.cvtColor(rgb_array, cv2.COLOR_RGB2BGR),
+                           [int(cv2.IMWRITE_JPEG_QUALITY), quality])
+    if not ok:
+        raise RuntimeError("JPEG encoding failed")
+    return cv2.cvtColor(cv2.imdecode(buf, cv2.IMREAD_COLOR), cv2.COLOR_BGR2RGB)
@@ -10,10 +10,14 @@ Public API:
 - recover_redundancy(data: bytes, nsym: int = 32) -> bytes
 - estimate_overhead_rs(payload_len: int, nsym: int) -> int
 - estimate_overhead_replication(payload_len: int, factor: int) -> int
+- rs_available() -> bool
 """
 from typing import Optional
+from functools import lru_cache
 import logging
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 logger.addHandler(logging.NullHandler())
 
@@ -74,6 +78,17 @@ def recover_redundancy(data: bytes, nsym: int = 32) -> bytes:
 # -----------------------
 # Reed-Solomon implementation (using reedsolo)
 # -----------------------
+@lru_cache(maxsize=None)
+def _get_rsc(nsym: int):
+    """
+    Return a shared RSCodec for `nsym` parity bytes.
+    Building one recomputes the GF tables and generator polynomial, which
+    costs about as much as encoding a short message; the codec holds no
+    per-message state, so one instance per nsym is reused.
+    """
+    return RSCodec(nsym)
+
+
 def _rs_encode(payload: bytes, nsym: int) -> bytes:
     """
     Reed-Solomon encode payload -> returns payload_with_parity
@@ -83,7 +98,7 @@ def _rs_encode(payload: bytes, nsym: int) -> bytes:
         raise RuntimeError("reedsolo not available")
     if nsym <= 0:
         raise ValueError("nsym must be > 0 for RS encoding")
-    rsc = RSCodec(nsym)
+    rsc = _get_rsc(nsym)
     # rsc.encode returns bytes(payload + parity)
     return rsc.encode(payload)
 
@@ -94,7 +109,7 @@ def _rs_decode(data: bytes, nsym: int) -> bytes:
     """
     if not _HAS_RS:
         raise RuntimeError("reedsolo not available")
-    rsc = RSCodec(nsym)
+    rsc = _get_rsc(nsym)
     try:
         decoded = rsc.decode(data)
         # reedsolo.decode can return (message, ecc) or bytes depending on version
@@ -119,10 +134,7 @@ def _replication_encode(payload: bytes, factor: int = 3) -> bytes:
         raise ValueError("factor must be >= 1")
     if factor == 1:
         return payload
-    out = bytearray()
-    for b in payload:
-        out.extend(bytes([b]) * factor)
-    return bytes(out)
+    return np.repeat(np.frombuffer(payload, dtype=np.uint8), factor).tobytes()
 
 
 def _replication_decode(data: bytes, factor: int = 3) -> bytes:
@@ -136,15 +148,17 @@ def _replication_decode(data: bytes, factor: int = 3) -> bytes:
         return data
     if len(data) % factor != 0:
         raise ValueError("replication decode: data length not multiple of replication factor")
-    out = bytearray()
-    for i in range(0, len(data), factor):
-        chunk = data[i:i+factor]
-        counts = {}
-        for b in chunk:
-            counts[b] = counts.get(b, 0) + 1
-        b, cnt = max(counts.items(), key=lambda kv: kv[1])
-        out.append(b)
-    return bytes(out)
+    groups = np.frombuffer(data, dtype=np.uint8).reshape(-1, factor)
+    if factor == 3:
+        # b wins only when it matches c; otherwise a is a majority or,
+        # with three different bytes, the first one seen
+        a, b, c = groups.T
+        return np.where(b == c, b, a).tobytes()
+    # Count how often each byte occurs in its group; argmax returns the
+    # earliest position with the top count, so ties go to the byte seen first
+    counts = (groups[:, :, None] == groups[:, None, :]).sum(axis=2)
+    winners = counts.argmax(axis=1)
+    return groups[np.arange(len(groups)), winners].tobytes()
 
 
 # -----------------------
@@ -162,6 +176,11 @@ def estimate_overhead_replication(payload_len: int, factor: int) -> int:
     return payload_len * factor
 
 
+def rs_available() -> bool:
+    """True when reedsolo is installed; False means the replication fallback is used."""
+    return _HAS_RS
+
+
 # -----------------------
 # CLI quick test
 # -----------------------
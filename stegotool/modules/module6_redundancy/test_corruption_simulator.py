@@ -0,0 +1,38 @@
+import random
+
+import numpy as np
+
+from stegotool.modules.module6_redundancy.corruption_simulator import random_byte_flips
+
+def _flipped_bits(original, corrupted):
+    diff = np.frombuffer(original, dtype=np.uint8) ^ np.frombuffer(corrupted, dtype=np.uint8)
+    return diff
+
+def test_random_byte_flips_pinned_output():
+    # Pins the numpy Generator stream; a change here changes every seeded caller
+    assert random_byte_flips(bytes(16), n_flips=4, seed=7).hex() == "00000000000000000100040002000400"
+    assert random_byte_flips(bytes(range(8)), n_flips=3, seed=0).hex() == "0001020305040606"
+
+def test_random_byte_flips_one_bit_in_distinct_bytes():
+    data = bytes(range(256))
+    for seed in range(20):
+        diff = _flipped_bits(data, random_byte_flips(data, n_flips=10, seed=seed))
+        hit = diff[diff != 0]
+        assert hit.size == 10
+        assert all(bin(int(d)).count("1") == 1 for d in hit)
+
+def test_random_byte_flips_is_seeded_and_leaves_global_random_alone():
+    data = b"hello stego world" * 4
+    random.seed(99)
+    expected_next = random.random()
+    random.seed(99)
+    first = random_byte_flips(data, n_flips=5, seed=3)
+    assert random.random() == expected_next
+    assert random_byte_flips(data, n_flips=5, seed=3) == first
+    assert random_byte_flips(data, n_flips=5, seed=4) != first
+
+def test_random_byte_flips_caps_and_noops():
+    data = b"abc"
+    assert random_byte_flips(data, n_flips=0, seed=1) == data
+    assert random_byte_flips(b"", n_flips=3, seed=1) == b""
+    assert np.count_nonzero(_flipped_bits(data, random_byte_flips(data, n_flips=10, seed=1))) == 3
@@ -1,4 +1,5 @@
 ﻿import pytest
+import numpy as np
 from stegotool.modules.module6_redundancy.rs_wrapper import (
     add_redundancy,
     recover_redundancy,
@@ -28,3 +29,24 @@ def test_replication_length_error():
     enc = _replication_encode(payload, factor=3)
     with pytest.raises(ValueError):
         _replication_decode(enc + b"\x00", factor=3)
+
+def _reference_replication_decode(data, factor):
+    # Per-group dict count the numpy vote replaced; ties go to the byte seen first
+    out = bytearray()
+    for i in range(0, len(data), factor):
+        counts = {}
+        for b in data[i:i+factor]:
+            counts[b] = counts.get(b, 0) + 1
+        out.append(max(counts.items(), key=lambda kv: kv[1])[0])
+    return bytes(out)
+
+@pytest.mark.parametrize("factor", [2, 3, 4, 5, 7])
+def test_replication_decode_matches_reference_vote(factor):
+    rng = np.random.default_rng(factor)
+    # A small alphabet makes ties and all-different groups common
+    for high in (4, 256):
+        data = rng.integers(0, high, size=600 * factor, dtype=np.uint8).tobytes()
+        assert _replication_decode(data, factor=factor) == _reference_replication_decode(data, factor)
+
+def test_replication_decode_three_different_bytes_keeps_first():
+    assert _replication_decode(b"\x01\x02\x03", factor=3) == b"\x01"
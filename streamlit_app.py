@@ -20,21 +20,7 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 import streamlit as st
-from src.db.db_utils import (
-    initialize_database,
-    add_user,
-    verify_user,
-    log_operation,
-    log_activity
-)
-from src.analytics.stats import (
-    create_timeline_chart,
-    create_method_pie_chart,
-    create_encode_decode_chart,
-    create_method_comparison_chart,
-    get_activity_dataframe,
-    get_statistics_summary
-)
+from src.db.db_utils import initialize_database
 from src.ui.ui_components import (
     show_encode_section,
     show_decode_section,
@@ -79,9 +65,22 @@ if "current_page" not in st.session_state:
 #                           DATABASE INITIALIZATION
 # ============================================================================
 
-try:
+@st.cache_resource(show_spinner=False)
+def _initialize_database_once():
+    """
+    Create the tables once per server process.
+    
+    The script calls this on every rerun of every session; cached, the
+    CREATE TABLE round trips are only repeated after an attempt raised
+    (exceptions are not cached).
+    """
     initialize_database()
     logger.info("✅ Database initialized successfully")
+    return True
+
+
+try:
+    _initialize_database_once()
 except Exception as e:
     st.error("❌ Database Initialization Failed")
     st.error(f"Error: {str(e)}")
@@ -4,13 +4,19 @@ Database Operations Tests
 Tests for database connectivity, initialization, and user operations.
 """
 
+import threading
+import time
+
 import pytest
+from src.db import db_utils
 from src.db.db_utils import (
     get_db_connection,
     initialize_database,
     add_user,
     verify_user,
     log_operation,
+    log_activity_async,
+    get_activity_version,
 )
 
 
@@ -75,6 +81,12 @@ class TestUserOperations:
         assert not result, \
             f"Expected falsy result for non-existent user, got {repr(result)}"
 
+    def test_verify_user_rejects_malformed_credentials(self, monkeypatch):
+        """Credentials add_user would refuse never reach the database."""
+        monkeypatch.setattr(db_utils, "get_db_connection", lambda: pytest.fail("database queried"))
+        assert verify_user("ab", "long enough password") is None
+        assert verify_user("someone", "short") is None
+
 
 @pytest.mark.integration
 @pytest.mark.requires_db
@@ -92,4 +104,43 @@ class TestOperationLogging:
             )
             assert True
         except Exception as e:
-            pytest.skip(f"Could not log operation: {str(e)}")
\ No newline at end of file
+            pytest.skip(f"Could not log operation: {str(e)}")
+
+@pytest.mark.integration
+class TestActivityLogQueue:
+    """Tests for the background activity log worker."""
+
+    def test_version_bumps_only_after_commit(self, monkeypatch):
+        """Queued rows leave the activity version alone until they commit."""
+        release = threading.Event()
+        committed = threading.Event()
+
+        def fake_bulk(entries):
+            release.wait(5)
+            db_utils._mark_activity_committed(user_id for user_id, _, _ in entries)
+            committed.set()
+
+        monkeypatch.setattr(db_utils, "log_activity_bulk", fake_bulk)
+        before = get_activity_version(4242)
+        log_activity_async(4242, "ENCODE", "queued")
+        time.sleep(db_utils.LOG_FLUSH_DELAY * 2)
+        assert get_activity_version(4242) == before
+
+        release.set()
+        assert committed.wait(5)
+        assert get_activity_version(4242) == before + 1
+
+    def test_exit_flush_waits_for_in_flight_batch(self, monkeypatch):
+        """A batch the worker already dequeued is still written at exit."""
+        written = []
+
+        def slow_bulk(entries):
+            time.sleep(0.3)
+            written.extend(entries)
+
+        monkeypatch.setattr(db_utils, "log_activity_bulk", slow_bulk)
+        log_activity_async(4243, "decode", "in flight")
+        time.sleep(db_utils.LOG_FLUSH_DELAY + 0.05)
+
+        db_utils._flush_log_queue()
+        assert written == [(4243, "decode", "in flight")]
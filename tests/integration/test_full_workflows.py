@@ -498,4 +498,72 @@ class TestErrorHandling:
         for char in ["A", "1", "!", "©", "中"]:
             encoded = encode_image(sample_images['rgb'], char, "None")
             decoded = decode_image(encoded)
-            assert decoded == char
\ No newline at end of file
+            assert decoded == char
+
+# ============================================================================
+#                         BATCH METHOD NAME TESTS
+# ============================================================================
+
+@pytest.mark.integration
+class TestBatchMethodNames:
+    """UI labels and short method names route to the same coders."""
+
+    def test_ui_labels_normalize_to_table_keys(self):
+        from src.batch_processing.batch_encoder import ENCODERS, DECODERS, normalize_method
+
+        for label in ["LSB", "Hybrid DCT", "Hybrid DWT", "DCT", "DWT"]:
+            assert normalize_method(label) in ENCODERS
+            assert normalize_method(label) in DECODERS
+
+    def test_decoded_method_is_an_encoder_key(self, sample_images):
+        from io import BytesIO
+        from src.batch_processing.batch_encoder import ENCODERS, decode_image_bytes
+
+        buf = BytesIO()
+        encode_dct(sample_images['rgb'], "Batch DCT").save(buf, format="PNG")
+        method, message = decode_image_bytes(buf.getvalue())
+
+        assert message == "Batch DCT"
+        assert method in ENCODERS
+
+
+@pytest.mark.integration
+class TestBatchOutputCache:
+    """Content-addressed reuse of earlier batch outputs."""
+
+    def test_key_covers_output_settings(self):
+        from src.batch_processing.batch_encoder import _output_cache_key
+
+        base = _output_cache_key(b"img", "LSB", "msg", "PNG", 1)
+        assert base == _output_cache_key(b"img", "LSB", "msg", "PNG", 1)
+        assert base != _output_cache_key(b"img", "LSB", "msg", "PNG", 9)
+        assert base != _output_cache_key(b"img", "LSB", "msg", "BMP", 1)
+
+    def test_prune_evicts_least_recently_used(self, temp_image_dir, monkeypatch):
+        import os
+        from src.batch_processing import batch_encoder
+
+        monkeypatch.setattr(batch_encoder, "OUTPUT_CACHE_PATH", temp_image_dir)
+        for age, name in enumerate(["new.png", "mid.png", "old.png"]):
+            path = temp_image_dir / name
+            path.write_bytes(b"x" * 100)
+            os.utime(path, (1000 - age, 1000 - age))
+
+        batch_encoder._prune_output_cache(max_bytes=200)
+        assert sorted(p.name for p in temp_image_dir.iterdir()) == ["mid.png", "new.png"]
+
+    def test_entry_being_written_is_not_reused(self, temp_image_dir):
+        from src.batch_processing import batch_encoder
+
+        cache_path = temp_image_dir / "entry.png"
+        output_path = temp_image_dir / "out.png"
+        output_path.write_bytes(b"encoded")
+
+        assert batch_encoder._claim_cache_entry(cache_path) == 'write'
+        # A duplicate job must neither read nor write the entry meanwhile
+        assert batch_encoder._claim_cache_entry(cache_path) is None
+
+        batch_encoder._store_cached_output(output_path, cache_path)
+        assert cache_path.read_bytes() == b"encoded"
+        assert not list(temp_image_dir.glob("*.tmp"))
+        assert batch_encoder._claim_cache_entry(cache_path) == 'reuse'
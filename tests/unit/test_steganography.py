@@ -11,6 +11,7 @@ from PIL import Image
 from src.stego.lsb_steganography import encode_image, decode_image, apply_filter
 from src.stego.dct_steganography import encode_dct, decode_dct
 from src.stego.dwt_steganography import encode_dwt, decode_dwt
+from src.stego.method_detection import sniff_method, read_framed_lsb_message, detect_encoding_method
 
 
 # ============================================================================
@@ -199,6 +200,21 @@ class TestLSBSteganography:
         enc2 = encode_image(test_image_800x600.copy(), msg2, "None")
         assert not np.array_equal(np.array(enc1), np.array(enc2))
 
+    def test_lsb_sniff_method(self, test_image_800x600):
+        """LSB framing is recognised on encoded images only."""
+        encoded = encode_image(test_image_800x600, "Sniff me", "None")
+        assert sniff_method(encoded) == 'LSB'
+        assert sniff_method(Image.new('RGB', (64, 64), (100, 100, 100))) is None
+
+    def test_chance_lsb_framing_is_not_trusted(self):
+        """DCT output whose pixel LSBs happen to match the framing is not LSB."""
+        rng = np.random.default_rng(109)
+        cover = Image.fromarray(rng.integers(50, 200, (240, 320, 3), dtype=np.uint8))
+        encoded = encode_dct(cover, "Batch test")
+        assert sniff_method(encoded) == 'LSB'
+        assert read_framed_lsb_message(encoded) is None
+        assert detect_encoding_method(encoded) == 'DCT'
+
 
 # ============================================================================
 #                    DCT STEGANOGRAPHY TESTS
@@ -236,6 +252,47 @@ class TestDCTSteganography:
         decoded = decode_dct(encoded)
         assert decoded == msg
 
+    def test_dct_batched_encode_matches_per_block_loop(self):
+        """The batched encode is pixel-identical to the original per-block loop."""
+        from scipy.fftpack import dct, idct
+        from src.stego.dct_steganography import QUANT_STEP
+
+        def reference_encode(image, message_bytes):
+            img_array = np.array(image.convert('L'), dtype=np.float64)
+            h, w = img_array.shape
+            bit_string = format(len(message_bytes), '016b')
+            for byte in message_bytes:
+                bit_string += format(byte, '08b')
+            bit_index = 0
+            for i in range(h // 8):
+                for j in range(w // 8):
+                    if bit_index >= len(bit_string):
+                        break
+                    block = img_array[i*8:(i+1)*8, j*8:(j+1)*8].copy()
+                    dct_block = dct(dct(block.T, norm='ortho').T, norm='ortho')
+                    coeff = dct_block[4, 4]
+                    bit = int(bit_string[bit_index])
+                    quantized = round(coeff / QUANT_STEP) * QUANT_STEP
+                    if round(coeff / QUANT_STEP) % 2 != bit:
+                        quantized += QUANT_STEP if coeff > quantized else -QUANT_STEP
+                    dct_block[4, 4] = float(quantized)
+                    img_array[i*8:(i+1)*8, j*8:(j+1)*8] = idct(idct(dct_block.T, norm='ortho').T, norm='ortho')
+                    bit_index += 1
+                if bit_index >= len(bit_string):
+                    break
+            return np.clip(img_array, 0, 255).astype(np.uint8)
+
+        rng = np.random.default_rng(14)
+        noisy = Image.fromarray(rng.integers(0, 256, (100, 132, 3), dtype=np.uint8))
+        flat = Image.new('RGB', (132, 100), (128, 128, 128))
+        gradient = Image.fromarray(np.tile(np.arange(132, dtype=np.uint8), (100, 1))).convert('RGB')
+        # 12x16 blocks: a partial first row, wrapped rows, and full capacity
+        for cover in (noisy, flat, gradient):
+            for message in ("Hi", "Wraps rows", b"\x00\xff" * 9, "x" * 22):
+                payload = message if isinstance(message, bytes) else message.encode('utf-8')
+                encoded = np.array(encode_dct(cover, message).convert('L'))
+                assert np.array_equal(encoded, reference_encode(cover, payload))
+
     def test_dct_preserves_image_format(self, test_image_800x600):
         """Test that DCT preserves image format."""
         msg = "Format test"
@@ -574,6 +631,36 @@ class TestSteganographyComparison:
         assert dct_enc.size == img.size
         assert dwt_enc.size == img.size
 
+    def test_array_inputs_match_image_inputs(self, test_image_800x600):
+        """Pre-converted pixel arrays encode exactly like the image itself."""
+        msg = "Shared arrays"
+        img = self._ensure_even_dimensions(test_image_800x600)
+        rgb = np.asarray(img.convert('RGB'))
+        gray = np.asarray(img.convert('RGB').convert('L'))
+        before = rgb.copy()
+
+        assert np.array_equal(np.array(encode_image(rgb, msg)), np.array(encode_image(img, msg)))
+        assert np.array_equal(np.array(encode_dct(gray, msg)), np.array(encode_dct(img, msg)))
+        assert np.array_equal(np.array(encode_dwt(gray, msg)), np.array(encode_dwt(img, msg)))
+        assert np.array_equal(rgb, before)
+
+    def test_rgb_array_means_the_same_to_every_encoder(self, test_image_800x600):
+        """An H×W×3 array is RGB for all methods; other shapes are rejected."""
+        msg = "Same pixels"
+        img = self._ensure_even_dimensions(test_image_800x600)
+        rgb = np.asarray(img.convert('RGB'))
+
+        assert np.array_equal(np.array(encode_dct(rgb, msg)), np.array(encode_dct(img, msg)))
+        assert np.array_equal(np.array(encode_dwt(rgb, msg)), np.array(encode_dwt(img, msg)))
+
+        gray = np.asarray(img.convert('L'))
+        with pytest.raises(ValueError):
+            encode_image(gray, msg)
+        with pytest.raises(ValueError):
+            encode_dct(rgb[..., :2], msg)
+        with pytest.raises(ValueError):
+            encode_dwt(rgb[..., :2], msg)
+
 
 # ============================================================================
 #                    ROBUSTNESS & EDGE CASES